@@ -0,0 +1,72 @@
+"""
+Check that the number of events sent for a trait change doesn't depend on how
+many times the object has been fetched by the client(s).
+
+Each fetch marshals the object again (as for every `get_attribute` request of
+the sync client). The time taken per fetch and the number of events sent when
+a trait then changes are printed for an increasing number of fetches.
+
+Usage::
+
+    $ python benchmarks/bench_listeners.py
+
+"""
+
+#### Imports ####
+from __future__ import print_function
+
+import time
+
+from traits.api import HasTraits, Int, Str
+
+from jigna.server import Bridge, Server
+
+#### Domain model ####
+
+class Person(HasTraits):
+    name = Str
+    age = Int
+
+#### Bridge ####
+
+class CountingBridge(Bridge):
+    """ A bridge that just counts the events sent to the client. """
+
+    count = Int
+
+    def send_events(self, events):
+        self.count += len(events)
+
+    def _call_later(self, delay, callable):
+        callable()
+
+    def _send_event(self, event):
+        self.count += 1
+
+#### Entry point ####
+
+def main():
+    print('%10s %12s %10s' % ('fetches', 'us/fetch', 'events'))
+    for fetches in [1, 10, 100, 1000, 10000]:
+        person = Person(name='Fred')
+        bridge = CountingBridge()
+        server = Server(
+            _bridge=bridge, trait_change_dispatch='same',
+            context={'person': person}
+        )
+
+        start = time.time()
+        for i in range(fetches):
+            server._marshal(person)
+        elapsed = time.time() - start
+
+        person.age += 1
+        print(
+            '%10d %12.2f %10d'
+            % (fetches, 1e6 * elapsed / fetches, bridge.count)
+        )
+
+if __name__ == '__main__':
+    main()
+
+#### EOF ######################################################################
@@ -0,0 +1,70 @@
+"""
+Benchmark a large transfer through the `ProxyAccessManager` used by the Qt
+server to serve files to the embedded web view.
+
+A WSGI app produces 100 MB in 64 KB chunks and the reply is read as the data
+arrives (as QtWebKit does). Requires PySide or PyQt4.
+
+Usage::
+
+    $ python benchmarks/bench_proxy_reply.py [size in MB]
+
+"""
+
+#### Imports ####
+from __future__ import print_function
+
+import sys
+import time
+
+from jigna.qt import QtCore, QtGui, QtNetwork
+from jigna.core.network_access import ProxyAccessManager
+
+#### WSGI app ####
+
+CHUNK = b'x' * (64 * 1024)
+
+def create_app(size):
+    def app(env, start_response):
+        start_response(
+            '200 OK', [('Content-Type', 'application/octet-stream')]
+        )
+        for i in range(size // len(CHUNK)):
+            yield CHUNK
+
+    return app
+
+#### Entry point ####
+
+def main(megabytes=100):
+    app = QtGui.QApplication.instance() or QtGui.QApplication(sys.argv)
+
+    size = megabytes * 1024 * 1024
+    manager = ProxyAccessManager(hosts={'bench.jigna': create_app(size)})
+    loop = QtCore.QEventLoop()
+
+    start = time.time()
+    reply = manager.get(
+        QtNetwork.QNetworkRequest(QtCore.QUrl('http://bench.jigna/data'))
+    )
+
+    received = [0]
+    def _on_ready_read():
+        received[0] += len(reply.readAll())
+
+    reply.readyRead.connect(_on_ready_read)
+    reply.finished.connect(loop.quit)
+    loop.exec_()
+    _on_ready_read()
+    elapsed = time.time() - start
+
+    print(
+        '%d MB in %.2f s (%.1f MB/s)'
+        % (received[0] // (1024 * 1024), elapsed, megabytes / elapsed)
+    )
+    print(manager.pool.get_stats())
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
+
+#### EOF ######################################################################
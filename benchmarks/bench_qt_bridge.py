@@ -0,0 +1,65 @@
+"""
+Benchmark pushing events from the Qt server to the embedded web view.
+
+Events are pushed either by emitting the `message` signal that the client
+connects to or by evaluating a JS snippet for each message (which must be
+compiled every time). Requires PySide or PyQt4.
+
+Usage::
+
+    $ python benchmarks/bench_qt_bridge.py [number of events]
+
+"""
+
+#### Imports ####
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+from traits.api import HasTraits, Int
+
+from jigna.api import Template
+from jigna.qt import QtGui
+from jigna.qt_server import QtServer
+
+#### Domain model ####
+
+class Counter(HasTraits):
+    value = Int
+
+#### Entry point ####
+
+def main(number=10000):
+    app = QtGui.QApplication.instance() or QtGui.QApplication(sys.argv)
+
+    counter = Counter()
+    template = Template(body_html='<div>{{counter.value}}</div>')
+    # Send each event as soon as the trait changes.
+    server = QtServer(
+        base_url=os.getcwd(), html=template.html,
+        context={'counter': counter}, trait_change_dispatch='same'
+    )
+    bridge = server._bridge
+
+    print('%-8s %12s' % ('path', 'events/s'))
+    for label, use_signal in [('execute', False), ('signal', True)]:
+        bridge.use_signal = use_signal
+
+        start = time.time()
+        for i in range(number):
+            counter.value += 1
+        app.processEvents()
+        elapsed = time.time() - start
+
+        received = server.webview.execute_js('jigna.models.counter.value')
+        assert int(received) == counter.value, received
+        print('%-8s %12.0f' % (label, number / elapsed))
+
+    server.shutdown()
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
+
+#### EOF ######################################################################
@@ -0,0 +1,92 @@
+"""
+Benchmark the installed serializers on realistic marshalled values.
+
+The payloads are created by the server's own `_marshal` so they have the same
+shape as the messages sent to clients: a batch of attribute change events and
+the (async) description of a list of 1000 instances.
+
+Usage::
+
+    $ python benchmarks/bench_serializers.py
+
+"""
+
+#### Imports ####
+from __future__ import print_function
+
+import timeit
+
+from traits.api import Float, HasTraits, Int, List, Str
+
+from jigna.core.serializers import get_available_serializers, get_serializer
+from jigna.server import serialize_message
+from jigna.web_server import AsyncWebServer
+
+#### Domain model ####
+
+class Person(HasTraits):
+    name = Str
+    age = Int
+    weight = Float
+    fruits = List(Str)
+
+
+class AddressBook(HasTraits):
+    contacts = List(Person)
+
+#### Payloads ####
+
+def create_payloads():
+    contacts = [
+        Person(
+            name='Person %d' % i, age=i % 90, weight=50 + i * 0.1,
+            fruits=['apple', 'pear']
+        )
+        for i in range(1000)
+    ]
+    addressbook = AddressBook(contacts=contacts)
+    # The server has no client sockets, so nothing is actually sent.
+    server = AsyncWebServer(context={'addressbook': addressbook})
+
+    events = [
+        dict(
+            obj=str(id(person)), name='age',
+            data=server._marshal(person.age), items_event=False
+        )
+        for person in contacts[:200]
+    ]
+
+    return {
+        'events (200)': ('events', events),
+        'list (1000)': ('response', dict(
+            exception=None, result=server._marshal(addressbook.contacts)
+        ))
+    }
+
+#### Entry point ####
+
+def main(number=20):
+    payloads = create_payloads()
+
+    print(
+        '%-10s %-14s %10s %10s' % ('serializer', 'payload', 'ms/msg', 'bytes')
+    )
+    for name in get_available_serializers():
+        serializer = get_serializer(name)
+        for label, (kind, payload) in sorted(payloads.items()):
+            def dumps():
+                return serialize_message(
+                    kind, payload, buffers=[], serializer=serializer
+                )
+
+            size = len(dumps())
+            seconds = min(timeit.repeat(dumps, number=number, repeat=3))
+            print(
+                '%-10s %-14s %10.3f %10d'
+                % (name, label, 1000.0 * seconds / number, size)
+            )
+
+if __name__ == '__main__':
+    main()
+
+#### EOF ######################################################################
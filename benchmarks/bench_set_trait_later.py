@@ -0,0 +1,62 @@
+"""
+Benchmark setting traits in the GUI thread from a worker thread.
+
+A worker thread makes 100k `set_trait_later` calls (as happens for trait
+changes made in a thread when `trait_change_dispatch` is 'ui') and the time
+taken until they have all been applied in the GUI thread is printed. Requires
+PySide or PyQt4.
+
+Usage::
+
+    $ python benchmarks/bench_set_trait_later.py [number of calls]
+
+"""
+
+#### Imports ####
+from __future__ import print_function
+
+import sys
+import threading
+import time
+
+from traits.api import HasTraits, Int
+
+from jigna.qt import QtCore, QtGui
+from jigna.utils.gui import invoke_later, set_trait_later
+
+#### Domain model ####
+
+class Counter(HasTraits):
+    value = Int
+
+#### Entry point ####
+
+def main(number=100000):
+    app = QtGui.QApplication.instance() or QtGui.QApplication(sys.argv)
+
+    counter = Counter()
+    loop = QtCore.QEventLoop()
+
+    def _worker():
+        for i in range(1, number + 1):
+            set_trait_later(counter, 'value', i)
+
+        invoke_later(loop.quit)
+
+    start = time.time()
+    thread = threading.Thread(target=_worker)
+    thread.start()
+    loop.exec_()
+    elapsed = time.time() - start
+    thread.join()
+
+    assert counter.value == number, counter.value
+    print(
+        '%d calls in %.2f s (%.0f calls/s)'
+        % (number, elapsed, number / elapsed)
+    )
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
+
+#### EOF ######################################################################
@@ -1,6 +1,6 @@
 from .template import Template
 from .vue_template import VueTemplate
-from .core.concurrent import Future
+from .core.concurrent import Future, takes_future
 from .html_widget import HTMLWidget
 
 # Wrapping the WebApp import so that you can use jigna even if you don't have
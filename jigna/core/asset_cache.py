@@ -0,0 +1,177 @@
+#
+# Jigna product code
+#
+# (C) Copyright 2013-2016 Enthought, Inc., Austin, TX
+# All right reserved.
+#
+
+""" An in-memory cache of the (static) files served to the clients. """
+
+# Standard library imports.
+from collections import OrderedDict
+import gzip
+import hashlib
+from io import BytesIO
+import os
+from threading import Lock
+
+# Enthought library imports.
+from traits.api import Any, Bool, HasTraits, Int, Property, Str
+
+# Jigna library imports.
+from jigna.core.wsgi import guess_type
+
+
+#: The mime types (other than 'text/*') that are worth compressing.
+COMPRESSIBLE_MIME_TYPES = set([
+    'application/javascript', 'application/json', 'application/x-javascript',
+    'application/xml', 'image/svg+xml'
+])
+
+
+class Asset(HasTraits):
+    """ The contents of a file and the information needed to serve it. """
+
+    #: The (absolute) path of the file.
+    path = Str
+
+    #: The modification time of the file when it was read.
+    mtime = Any
+
+    #: The contents of the file.
+    data = Any
+
+    #: The mime type of the file.
+    mime_type = Str
+
+    #: The (strong) entity tag of the file.
+    etag = Property(Str)
+    def _get_etag(self):
+        if self._etag is None:
+            self._etag = '"%s"' % hashlib.sha1(self.data).hexdigest()
+
+        return self._etag
+
+    #: Is it worth sending the file compressed?
+    compressible = Property(Bool)
+    def _get_compressible(self):
+        return (
+            self.mime_type.startswith('text/')
+            or self.mime_type in COMPRESSIBLE_MIME_TYPES
+        )
+
+    #: The gzip compressed contents of the file.
+    gzipped = Property
+    def _get_gzipped(self):
+        if self._gzipped is None:
+            buffer = BytesIO()
+            with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as f:
+                f.write(self.data)
+            self._gzipped = buffer.getvalue()
+
+        return self._gzipped
+
+    #### Private protocol #####################################################
+
+    #: Shadow values for the (lazily computed) properties.
+    _etag = Any
+    _gzipped = Any
+
+
+class AssetCache(HasTraits):
+    """ A bounded LRU cache of files keyed by their path and mtime.
+
+    A cached file is only read again when its modification time (or size)
+    changes.
+
+    """
+
+    #### 'AssetCache' protocol ################################################
+
+    #: The maximum total size (in bytes) of the cached files.
+    max_size = Int(32 * 1024 * 1024)
+
+    #: The maximum size (in bytes) of a file that is cached.
+    max_file_size = Int(1024 * 1024)
+
+    #: The number of files served from the cache.
+    hits = Int
+
+    #: The number of files read from disk.
+    misses = Int
+
+    #: The total size (in bytes) of the cached files.
+    size = Int
+
+    def __init__(self, **traits):
+        super(AssetCache, self).__init__(**traits)
+
+        self._lock = Lock()
+
+        # { path : Asset }, least recently used first.
+        self._assets = OrderedDict()
+
+    def get(self, path):
+        """ Return the asset for the file at the given path.
+
+        Raise an `IOError` (or `OSError`) if the file can't be read.
+
+        """
+
+        stat = os.stat(path)
+        with self._lock:
+            asset = self._assets.pop(path, None)
+            if asset is not None:
+                if self._is_current(asset, stat):
+                    self._assets[path] = asset
+                    self.hits += 1
+                    return asset
+
+                self.size -= len(asset.data)
+
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        mime_type, _ = guess_type(path)
+        asset = Asset(
+            path=path, mtime=stat.st_mtime, data=data, mime_type=mime_type
+        )
+
+        with self._lock:
+            self.misses += 1
+            if len(data) <= self.max_file_size and path not in self._assets:
+                self._assets[path] = asset
+                self.size += len(data)
+                self._trim()
+
+        return asset
+
+    def clear(self):
+        """ Remove all files from the cache. """
+
+        with self._lock:
+            self._assets.clear()
+            self.size = 0
+
+        return
+
+    #### Private protocol #####################################################
+
+    def _is_current(self, asset, stat):
+        """ Is the asset the current contents of the file? """
+
+        return asset.mtime == stat.st_mtime and len(asset.data) == stat.st_size
+
+    def _trim(self):
+        """ Remove the least recently used files until the cache is no longer
+        full.
+
+        """
+
+        while self.size > self.max_size:
+            path, asset = self._assets.popitem(last=False)
+            self.size -= len(asset.data)
+
+        return
+
+#### EOF ######################################################################
@@ -6,19 +6,24 @@
 
 """Module to support asynchronous execution of code."""
 
+from __future__ import absolute_import
+
 # System library imports.
 try:
     from __builtin__ import unicode as utext
 except ImportError:
     from builtins import str as utext
 
+from collections import deque
+from concurrent import futures
 import sys
-from threading import Thread, RLock
-from functools import wraps
+from threading import Condition, RLock, Thread, current_thread
+from threading import Event as ThreadEvent
+from functools import partial, wraps
 
 # Enthought library imports.
-from traits.api import (HasTraits, Any, Range, Undefined, Instance, Str,
-    Property, Enum, ReadOnly, DelegatesTo, Event)
+from traits.api import (HasTraits, Any, Undefined, Instance, Str,
+    Property, Enum, Event, Int, Dict, Bool)
 
 
 def set_trait_later(obj, trait, value):
@@ -61,6 +66,23 @@ class Signal(HasTraits):
     def emit(self, value):
         self._event = value
 
+def run_future(future, func):
+    """ Run a callable (taking no arguments) and set its result (or
+    exception) on the given `concurrent.futures.Future`.
+
+    Nothing is run if the future has been cancelled.
+
+    """
+    if not future.set_running_or_notify_cancel():
+        return
+
+    try:
+        result = func()
+    except BaseException as exception:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
 def do_callback(dispatch, callback, *args):
     """Invoke the callback with a suitable dispatch.
     """
@@ -71,26 +93,231 @@ def do_callback(dispatch, callback, *args):
         callback(*args)
 
 
+################################################################################
+# `BoundedExecutor` class.
+################################################################################
+
+class FutureCancelled(Exception):
+    """ Raised (and stored as the error of a `Future`) when a `Future` is
+    cancelled.
+
+    """
+
+
+class ExecutorFull(RuntimeError):
+    """ Raised when work is submitted to a `BoundedExecutor` whose queue is
+    full.
+
+    """
+
+
+class BoundedExecutor(HasTraits):
+    """ Run callables in a bounded pool of (daemon) worker threads.
+
+    At most ``max_workers`` callables run at once and at most ``max_queued``
+    wait for a worker; submitting more work raises `ExecutorFull`. Work can be
+    submitted with a ``key`` (such as a method name) and at most
+    ``key_limits[key]`` callables with that key run at once, the others wait
+    in the queue (without holding up work with other keys).
+
+    Usage:
+    ------
+
+        >>> executor = BoundedExecutor(max_workers=4, key_limits={'save': 1})
+        >>> executor.submit(lambda: time.sleep(1), key='save')
+
+    """
+
+    # The maximum number of worker threads.
+    max_workers = Int(8)
+
+    # The maximum number of callables waiting for a worker (0 means that
+    # there is no limit).
+    max_queued = Int(100)
+
+    # The maximum number of callables with a given key that run at once.
+    #
+    # { key : int limit }
+    key_limits = Dict
+
+    # The number of callables currently running.
+    active = Property(Int)
+
+    def _get_active(self):
+        return self._active
+
+    # The number of callables waiting for a worker.
+    queued = Property(Int)
+
+    def _get_queued(self):
+        return len(self._queue)
+
+    # The number of callables that have finished.
+    completed = Int
+
+    # The number of callables rejected because the queue was full.
+    rejected = Int
+
+    def __init__(self, **traits):
+        HasTraits.__init__(self, **traits)
+
+        self._condition = Condition()
+        self._shutdown = False
+
+        # The waiting work, oldest first.
+        #
+        # [(key, callable, concurrent.futures.Future)]
+        self._queue = deque()
+
+        # The number of running callables for each key.
+        #
+        # { key : int count }
+        self._running = {}
+
+        self._active = 0
+        self._idle = 0
+        self._threads = []
+
+    # `BoundedExecutor` Interface #############################################
+    def submit(self, func, key=None):
+        """ Queue a callable (taking no arguments) to be run by a worker.
+
+        Return a `concurrent.futures.Future` for its result. Cancelling the
+        future removes the callable from the queue.
+
+        Raise an `ExecutorFull` exception if the queue is full.
+
+        """
+        future = futures.Future()
+        future.add_done_callback(self._on_future_done)
+
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError('Executor has been shut down')
+
+            # Work that a free worker is about to pick up isn't waiting.
+            free = self.max_workers - self._active
+            waiting = len(self._queue) - free
+            if self.max_queued > 0 and waiting >= self.max_queued:
+                self.rejected += 1
+                raise ExecutorFull(
+                    'Too many queued calls (%d)' % self.max_queued
+                )
+
+            self._queue.append((key, func, future))
+            if (len(self._queue) > self._idle
+                    and len(self._threads) < self.max_workers):
+                thread = Thread(target=self._work)
+                thread.daemon = True
+                self._threads.append(thread)
+                thread.start()
+
+            self._condition.notify()
+
+        return future
+
+    def shutdown(self):
+        """ Stop the workers once the queued work has been run. """
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+
+    # Private protocol ########################################################
+    def _on_future_done(self, future):
+        """ Remove the work for a cancelled future from the queue. """
+        if not future.cancelled():
+            return
+
+        with self._condition:
+            for index, work in enumerate(self._queue):
+                if work[2] is future:
+                    del self._queue[index]
+                    break
+
+    def _pop_runnable(self):
+        """ Remove and return the oldest queued work whose key is below its
+        limit (or None if there is no such work).
+
+        """
+        for index, work in enumerate(self._queue):
+            key = work[0]
+            limit = self.key_limits.get(key)
+            if limit is None or self._running.get(key, 0) < limit:
+                del self._queue[index]
+                self._running[key] = self._running.get(key, 0) + 1
+                self._active += 1
+                return work
+
+        return None
+
+    def _work(self):
+        """ The loop run by each worker thread. """
+        while True:
+            with self._condition:
+                work = self._pop_runnable()
+                while work is None:
+                    if self._shutdown and len(self._queue) == 0:
+                        self._threads.remove(current_thread())
+                        return
+
+                    self._idle += 1
+                    self._condition.wait()
+                    self._idle -= 1
+                    work = self._pop_runnable()
+
+            key, func, future = work
+            try:
+                run_future(future, func)
+            finally:
+                with self._condition:
+                    self._running[key] -= 1
+                    if self._running[key] == 0:
+                        del self._running[key]
+                    self._active -= 1
+                    self.completed += 1
+                    # A key may have dropped below its limit.
+                    self._condition.notify_all()
+
+
 ################################################################################
 # `Promise` class.
 ################################################################################
 
-class Promise(HasTraits):
+class Promise(object):
     """ The promise of a deferred operation, which can be used
     to add success, failure and progress callbacks for the operation.
 
-    The Promise instance has a ``dispatch`` trait which can be set to "same" or
-    "ui" and if it is set to "ui" all changes and callbacks are made in the GUI
+    The Promise instance has a ``dispatch`` attribute which can be "same" or
+    "ui" and if it is "ui" all changes and callbacks are made in the GUI
     thread.
 
+    The callbacks are kept in a plain list for each outcome and each list is
+    called (at most) once, when the operation has that outcome.
+
     """
 
-    def __init__(self, **traits):
-        HasTraits.__init__(self, **traits)
+    __slots__ = (
+        'dispatch', '_lock', '_status', '_result', '_error', '_progress',
+        '_done_callbacks', '_error_callbacks', '_progress_callbacks',
+        '__weakref__'
+    )
+
+    def __init__(self, dispatch='same'):
+        # Dispatch all callbacks either in the same thread or in the UI thread.
+        self.dispatch = dispatch
+
         # This should really be a reader-writer lock for performance, but this
         # will do for the time being.
         self._lock = RLock()
 
+        self._status = 'pending'
+        self._result = Undefined
+        self._error = Undefined
+        self._progress = 0.0
+
+        self._done_callbacks = []
+        self._error_callbacks = []
+        self._progress_callbacks = []
 
     # `Promise` Interface #####################################################
     def on_done(self, callback):
@@ -99,9 +326,7 @@ class Promise(HasTraits):
         with self._lock:
             status = self._status
             if status == "pending":
-                self.on_trait_change(lambda value: (self._status == 'done')
-                                                    and callback(self._result),
-                                    '_status', dispatch=self.dispatch)
+                self._done_callbacks.append(callback)
 
         # Release the lock before calling the callback. Status is done so nothing
         # will mutate further - we are safe.
@@ -114,9 +339,7 @@ class Promise(HasTraits):
         with self._lock:
             status = self._status
             if status == "pending":
-                self.on_trait_change(lambda value: (self._status == 'error')
-                                                    and callback(self._error),
-                                    '_status', dispatch=self.dispatch)
+                self._error_callbacks.append(callback)
 
         # Release the lock before calling the callback. Status is done so nothing
         # will mutate further - we are safe.
@@ -129,34 +352,23 @@ class Promise(HasTraits):
         with self._lock:
             status = self._status
             if status == "pending":
-                self.on_trait_change(lambda value: callback(value),
-                                     '_progress', dispatch=self.dispatch)
+                self._progress_callbacks.append(callback)
 
         # Release the lock before calling the callback. Status is done so nothing
         # will mutate further - we are safe.
-        if self._status == 'done':
+        if status == 'done':
             # If operation is already completed, call with 1.0
             do_callback(self.dispatch, callback, self._progress)
 
-    #################################
-    # Traits.
-
-    # Dispatch all callbacks either in the same thread or in the UI thread.
-    dispatch = Enum('same', 'ui')
-
-    # Status of the Promise.
-    status = Property
-    _status = Enum('pending', 'done', 'error')
-
-    def _get_status(self):
+    # Status of the Promise ('pending', 'done' or 'error').
+    @property
+    def status(self):
         with self._lock:
             return self._status
 
     # The result, if any.
-    result = Property
-    _result = Any(Undefined)
-
-    def _get_result(self):
+    @property
+    def result(self):
         with self._lock:
             if self._status == 'pending':
                 raise ValueError('Promise not completed yet')
@@ -164,10 +376,8 @@ class Promise(HasTraits):
                 return self._result
 
     # The error, if any.
-    error = Property
-    _error = Any(Undefined)
-
-    def _get_error(self):
+    @property
+    def error(self):
         with self._lock:
             if self._status == 'pending':
                 raise ValueError('Promise not completed yet')
@@ -175,19 +385,67 @@ class Promise(HasTraits):
                 return self._error
 
     # The progress.
-    progress = Property
-    _progress = Range(0.0, 1.0, 0.0)
-
-    def _get_progress(self):
+    @property
+    def progress(self):
         with self._lock:
             return self._progress
 
+    # Private protocol ########################################################
+    def _complete(self, status, value):
+        """ Complete the operation with the given status ('done' or 'error')
+        and result (or error) and call the relevant callbacks.
+
+        """
+        with self._lock:
+            if self._status != 'pending':
+                return
+
+            self._status = status
+            if status == 'done':
+                self._result = value
+                progress_callbacks = []
+                if self._progress != 1.0:
+                    self._progress = 1.0
+                    progress_callbacks = self._progress_callbacks
+                callbacks = self._done_callbacks
+
+            else:
+                self._error = value
+                progress_callbacks = []
+                callbacks = self._error_callbacks
+
+            # Nothing can be called twice and there is no need to keep the
+            # callbacks for the other outcome alive.
+            self._done_callbacks = []
+            self._error_callbacks = []
+            self._progress_callbacks = []
+
+        for callback in progress_callbacks:
+            callback(1.0)
+
+        for callback in callbacks:
+            callback(value)
+
+    def _set_progress(self, value):
+        """ Set the progress and call the progress callbacks. """
+        if not 0.0 <= value <= 1.0:
+            raise ValueError('Progress must be between 0 and 1: %r' % value)
+
+        with self._lock:
+            if self._status != 'pending' or value == self._progress:
+                return
+
+            self._progress = value
+            callbacks = list(self._progress_callbacks)
+
+        for callback in callbacks:
+            callback(value)
 
 
 ################################################################################
 # `Deferred` class.
 ################################################################################
-class Deferred(HasTraits):
+class Deferred(object):
     """ A Deferred operations which will complete in the future.
 
     Usage:
@@ -221,7 +479,7 @@ class Deferred(HasTraits):
           an extra progress_callback argument.
 
     The Deferred supports two dispatch mechanisms, "same" and "ui" if the
-    ``dispatch`` trait is set to "ui" all attributes are set on the GUI thread
+    ``dispatch`` is "ui" all attributes are set on the GUI thread
     and all callbacks are also called from the UI thread.
 
     Notes:
@@ -230,56 +488,47 @@ class Deferred(HasTraits):
     Deferred so that so that they can only add callbacks and not set result.
 
     """
+    __slots__ = ('dispatch', 'promise')
+
+    def __init__(self, dispatch='same'):
+        # Dispatch all callbacks either in the same thread or in the UI thread.
+        self.dispatch = dispatch
+
+        # The promise for the operation (to give to the callers).
+        self.promise = Promise(dispatch=dispatch)
+
     # `Deferred` Interface ####################################################
     def done(self, value):
         """ Complete the deferred with success and specified result.
             and set the progress to 1.0
         """
-        if self.dispatch == 'ui':
-            promise = self.promise
-            set_trait_later(promise, '_result', value)
-            set_trait_later(promise, '_progress', 1.0)
-            set_trait_later(promise, '_status', 'done')
-        else:
-            with self.promise._lock:
-                self.promise._result = value
-                self.promise._progress = 1.0
-                self.promise._status = 'done'
+        self._call(self.promise._complete, 'done', value)
 
     def error(self, value):
         """ Complete the deferred with failure and specified result. """
-        if self.dispatch == 'ui':
-            promise = self.promise
-            set_trait_later(promise, '_error', value)
-            set_trait_later(promise, '_status', 'error')
-        else:
-            with self.promise._lock:
-                self.promise._error = value
-                self.promise._status = 'error'
+        self._call(self.promise._complete, 'error', value)
 
     def progress(self, value):
         """ Set the progress of the operation (0 <= value <= 1). """
-        if self.dispatch == 'ui':
-            set_trait_later(self.promise, '_progress', value)
-        else:
-            with self.promise._lock:
-                self.promise._progress = value
-
-    # Traits ##################################################################
+        self._call(self.promise._set_progress, value)
 
-    # Dispatch all callbacks either in the same thread or in the UI thread.
-    dispatch = Enum('same', 'ui')
-
-    promise = ReadOnly(Instance(Promise))
+    # Private protocol ########################################################
+    def _call(self, method, *args):
+        """ Call a method of the promise (in the GUI thread if the dispatch is
+        "ui").
 
-    def _promise_default(self):
-        return Promise(dispatch=self.dispatch)
+        """
+        if self.dispatch == 'ui':
+            from ..utils.gui import invoke_later
+            invoke_later(method, *args)
+        else:
+            method(*args)
 
 
 ################################################################################
 # `Future` class.
 ################################################################################
-class Future(Promise):
+class Future(HasTraits):
 
     """
     This could be used for any long-running call that needs to run on
@@ -292,6 +541,10 @@ class Future(Promise):
     One can also set the ``dispatch`` mode to "ui" in which case all
     changes to attributes and callbacks are made on the GUI thread.
 
+    A Future wraps a standard `concurrent.futures.Future` (see
+    ``concurrent_future``) and can be awaited in asyncio or tornado
+    coroutines, so several calls can be run in parallel and gathered.
+
     The following example illustrates the simplest use of a Future::
 
         >>> import time
@@ -327,39 +580,71 @@ class Future(Promise):
         ...
         >>> print x.result
 
+    Futures can also be run by an executor and awaited::
+
+        >>> executor = ThreadPoolExecutor(max_workers=4)
+        >>> async def compute_all(values):
+        ...     futures = [Future(compute, args=(value,), executor=executor)
+        ...                for value in values]
+        ...     return await asyncio.gather(*futures)
+
     """
 
+    # Dispatch all callbacks either in the same thread or in the UI thread.
+    dispatch = Enum('same', 'ui')
+
     # Status of the Future.
-    status = DelegatesTo('promise', 'status')
+    status = Property
 
     # The result of the call. When accessed this will block unless the
     # thread has finished execution.
-    result = Property(Any, depends_on='status')
+    result = Property(Any)
 
     # The exception if any.  ``sys.exc_info`` is stored here.
-    error = DelegatesTo('promise', 'error')
+    error = Property
 
     # Progress information.
-    progress = Property(depends_on='promise._progress')
+    progress = Property
+
+    # The promise of the call.
+    promise = Property
 
     # Optional information.
     info = Str('')
 
+    # Has the future been asked to cancel? A long running callable can poll
+    # this (see ``future_kw``) and stop early, typically by raising a
+    # `FutureCancelled` exception.
+    cancelled = Property(Bool)
+
+    # The `concurrent.futures.Future` for the result of the call.
+    concurrent_future = Property
+
     #################################
     # Private Traits.
 
-    # The thread in which the function is running.
+    # The thread in which the function is running (None if it is run by an
+    # executor).
     _thread = Instance(Thread)
 
-    # The Deferred object for the operation and its promise.
+    # The `concurrent.futures.Future` for the result of the call.
+    _future = Any
+
+    # Set when the deferred has been completed.
+    _finished = Any
+
+    # Set when the future has been asked to cancel.
+    _cancelled = Any
+
+    # The Deferred object for the operation.
     _deferred = Instance(Deferred)
-    promise = DelegatesTo('_deferred', 'promise')
 
     ############################################################################
     # `object` interface.
     ############################################################################
     def __init__(self, func, f_on_status=None, f_on_progress=None,
-                 future_kw=None, dispatch='same', args=None, kw=None):
+                 future_kw=None, dispatch='same', args=None, kw=None,
+                 executor=None, key=None):
         """Constructor for a Future.
 
         If an exception is raised when the future runs, ``sys.exc_info()``
@@ -368,8 +653,10 @@ class Future(Promise):
         Parameters
         ----------
 
-        func : callable
-            The callable to execute in another thread.
+        func : callable or concurrent.futures.Future
+            The callable to execute in another thread. Alternatively a
+            `concurrent.futures.Future` for a call that is run elsewhere (e.g.
+            in another process), the Future then completes with it.
 
         f_on_status : callable
             The callable to callback when the status is changed.  This function
@@ -389,11 +676,25 @@ class Future(Promise):
         kw : additional keyword args
             Passed to the callable, ``func``.
 
+        executor : BoundedExecutor or concurrent.futures.Executor
+            The executor to run the callable on. If None, the callable is run
+            in a new thread.
+
+        key : object
+            The key that the callable is submitted to a `BoundedExecutor`
+            with (see `BoundedExecutor.submit`).
+
         """
         # Set this first.
         self.dispatch = dispatch
         super(Future, self).__init__()
 
+        # Let any listeners know when the status changes.
+        def _status_changed(value):
+            self.trait_property_changed('status', 'pending', self.status)
+        self.on_done(_status_changed)
+        self.on_error(_status_changed)
+
         if f_on_progress is not None:
             self.on_progress(lambda value:f_on_progress(self))
 
@@ -401,23 +702,42 @@ class Future(Promise):
             self.on_done(lambda value:f_on_status(self))
             self.on_error(lambda value:f_on_status(self))
 
+        self._cancelled = ThreadEvent()
+        self._finished = ThreadEvent()
+
         # The wrapper function to call in a thread.
         def _f(self, *args, **kw):
-            """This function is called by the `Thread` instance."""
-            try:
-                self._deferred.done(func(*args, **kw))
-            except:
-                self._deferred.error(sys.exc_info())
+            """This function is called in the executor (or thread)."""
+            if self.cancelled:
+                raise FutureCancelled()
+            return func(*args, **kw)
 
+        args = args or ()
+        kw = dict(kw or {})
         # Pass self to the function if it needs it.
         if future_kw is not None and type(future_kw) in (str, utext):
             kw[future_kw] = self
-        args = args or ()
-        kw = kw or {}
-        t = Thread(target=_f, args=(self,) + args, kwargs=kw)
-        self._thread = t
-        t.daemon = True
-        t.start()
+
+        work = partial(_f, self, *args, **kw)
+        if isinstance(func, futures.Future):
+            self._future = func
+        elif isinstance(executor, BoundedExecutor):
+            self._future = executor.submit(work, key=key)
+        elif executor is not None:
+            self._future = executor.submit(work)
+        else:
+            self._future = futures.Future()
+            t = Thread(target=run_future, args=(self._future, work))
+            self._thread = t
+            t.daemon = True
+            t.start()
+
+        self._future.add_done_callback(self._on_future_done)
+
+    def __await__(self):
+        """Wait for the result in an asyncio (or tornado) coroutine."""
+        import asyncio
+        return asyncio.wrap_future(self._future).__await__()
 
     ############################################################################
     # `Future` interface.
@@ -426,6 +746,18 @@ class Future(Promise):
         """Return True if the future has completed execution."""
         return self.promise.status != 'pending'
 
+    def cancel(self):
+        """Ask the future to cancel.
+
+        If the callable is still waiting for an executor it is not run at all,
+        otherwise it is up to the callable to poll ``cancelled``.
+
+        Return True if the callable was cancelled before it started.
+
+        """
+        self._cancelled.set()
+        return self._future.cancel()
+
     ############################################################################
     # `Promise` interface.
     ############################################################################
@@ -442,21 +774,52 @@ class Future(Promise):
     # Trait handlers.
     ############################################################################
     def _get_result(self):
-        # _status is synchronized, so copy local to avoid constant lock acquisitions
-        status = self.promise._status
-        if status == 'pending':
-            self._thread.join()
-            # Status will have switched to "done" or "error"
-            status = self.promise._status
-
-        if status == 'done':
-            return self.promise.result
-        else:
+        # Wait for the status to be set too.
+        self._finished.wait()
+        try:
+            return self._future.result()
+        except (Exception, futures.CancelledError):
             return Undefined
 
+    def _get_status(self):
+        return self.promise.status
+
+    def _get_error(self):
+        return self.promise.error
+
     def _get_progress(self):
         return self.promise.progress
 
+    def _get_promise(self):
+        return self._deferred.promise
+
+    def _get_cancelled(self):
+        return self._cancelled.is_set()
+
+    def _get_concurrent_future(self):
+        return self._future
+
+    def _on_future_done(self, future):
+        """ Complete the deferred when the concurrent future is done. """
+        try:
+            if future.cancelled():
+                try:
+                    raise FutureCancelled()
+                except FutureCancelled:
+                    self._deferred.error(sys.exc_info())
+
+            elif future.exception() is None:
+                self._deferred.done(future.result())
+
+            else:
+                exception = future.exception()
+                self._deferred.error(
+                    (type(exception), exception,
+                     getattr(exception, '__traceback__', None))
+                )
+        finally:
+            self._finished.set()
+
     def _set_progress(self, val):
         self._deferred.progress(val)
 
@@ -467,7 +830,7 @@ class Future(Promise):
 # `threaded` decorator.
 ################################################################################
 def threaded(func=None, f_on_status=None, f_on_progress=None, future_kw=None,
-             dispatch='same'):
+             dispatch='same', executor=None):
     """ A decorator to run a function in a separate thread and return a
     `Future` object which will store the results when the function completes.
 
@@ -489,6 +852,9 @@ def threaded(func=None, f_on_status=None, f_on_progress=None, future_kw=None,
     dispatch : str
         The dispatch mechanism to use.  One of either 'same' or 'ui'.
 
+    executor : BoundedExecutor or concurrent.futures.Executor
+        The executor to run the function on (see `Future`).
+
     Examples
     ---------
 
@@ -517,11 +883,12 @@ def threaded(func=None, f_on_status=None, f_on_progress=None, future_kw=None,
 
     def future_decorator(func, f_on_status=f_on_status,
                          f_on_progress=f_on_progress,
-                         future_kw=future_kw, dispatch=dispatch):
+                         future_kw=future_kw, dispatch=dispatch,
+                         executor=executor):
         def _wrapper(*args, **kw):
             """The wrapper function."""
             return Future(func, f_on_status, f_on_progress, future_kw,
-                          dispatch, *args, **kw)
+                          dispatch, args=args, kw=kw, executor=executor)
         return wraps(func)(_wrapper)
 
     if func is None:
@@ -529,3 +896,39 @@ def threaded(func=None, f_on_status=None, f_on_progress=None, future_kw=None,
     else:
         return future_decorator(func, f_on_status, f_on_progress,
                                 future_kw=future_kw, dispatch=dispatch)
+
+
+################################################################################
+# `takes_future` decorator.
+################################################################################
+def takes_future(func=None, future_kw='future'):
+    """ A decorator to mark a method that takes the `Future` it is called in.
+
+    When a client calls a marked method in a worker thread (or a process),
+    the server passes it the `Future` as the ``future_kw`` keyword argument so
+    that it can report its progress and poll whether it has been cancelled.
+    Methods that are not marked never get a `Future`, even if they have an
+    argument with the same name.
+
+    Examples
+    ---------
+
+    ::
+
+        >>> class Model(HasTraits):
+        ...     @takes_future
+        ...     def compute(self, n, future):
+        ...         for i in range(n):
+        ...             if future.cancelled:
+        ...                 raise FutureCancelled()
+        ...             future.progress = float(i) / n
+    """
+
+    def mark(func):
+        func._future_kw = future_kw
+        return func
+
+    if func is None:
+        return mark
+    else:
+        return mark(func)
@@ -15,9 +15,14 @@ from jigna.qt import QtCore
 # Logger.
 logger = logging.getLogger(__name__)
 
-def create_js_object_wrapper(callbacks=[], parent=None):
+def create_js_object_wrapper(callbacks=[], parent=None, signals=[]):
     """ Create a JS object wrapper containing the given callbacks as its
-    methods.
+    methods and the given signals.
+
+    Each signal carries a single string and JS can connect to it, e.g.
+    `wrapper.message.connect(function(text) {...})`. Emitting a signal
+    passes the string straight to the connected JS functions (unlike
+    evaluating JS, nothing needs to be compiled).
 
     Note: Set the parent (setParent()) of the returned QObject to make sure
     it is destroyed when the parent is destroyed, or manually destroy the
@@ -42,6 +47,10 @@ def create_js_object_wrapper(callbacks=[], parent=None):
         else:
             logger.error('Callback %r is not translatable to JavaScript', name)
 
+    # Signals must also be defined on the class.
+    for name in signals:
+        class_dict[name] = QtCore.Signal(str)
+
     # Create the container class.
     container_class = type(
         'CustomPythonContainer', (_PythonContainer, QtCore.QObject,), class_dict
@@ -14,11 +14,15 @@ except ImportError:
 import logging
 import sys
 import threading
+import time
 from io import StringIO
 
 # System library imports.
 from jigna.qt import QtCore, QtNetwork
 
+# Local imports.
+from jigna.core.receive_buffer import ReceiveBuffer
+
 # Logger.
 logger = logging.getLogger(__name__)
 
@@ -27,13 +31,16 @@ class ProxyAccessManager(QtNetwork.QNetworkAccessManager):
     """ A QNetworkAccessManager subclass which proxies requests for a set of
     hosts and schemes.
     """
-    def __init__(self, root_paths={}, hosts={}):
+    def __init__(self, root_paths={}, hosts={}, max_workers=None):
         """ root_paths: Mapping of root paths to WSGI callables.
             hosts: Mapping of hosts to WSGI callables.
+            max_workers: The maximum number of threads used to handle
+                requests (by default, the number of CPU cores).
         """
         super(ProxyAccessManager, self).__init__()
         self.root_paths = root_paths
         self.hosts = hosts
+        self.pool = ProxyReplyPool(max_workers)
 
     def get_url_handler(self, url):
         """ Returns the WSGI callable to be used for specified url.
@@ -94,21 +101,24 @@ class ProxyReply(QtNetwork.QNetworkReply):
         self.req_data = data
         self.handler = handler
 
-        self.buffer = b''
-        self._buflock = threading.Lock()
+        self.buffer = ReceiveBuffer()
         self.aborted = False
 
         self.open(self.ReadOnly)
 
         self._worker = ProxyReplyWorker(self)
-        self._worker.start()
 
         # Handle synchronous requests (webkit sync ajax requests)
         # req.Attribute.QSynchronousHttpNetworkReply may not be defined for
         # pyside compiled with qt 4.7 but still works with qt 4.8
         # QSynchronousHttpNetworkReply = DownloadBufferAttribute + 1 = 16
+        # They block the GUI thread until they are handled, so rather than
+        # wait for a pool thread to be free they are handled right away.
         if req.attribute(req.Attribute(16)):
-            self._worker.wait()
+            parent.pool.run(self._worker)
+
+        else:
+            parent.pool.submit(self._worker)
 
     ###########################################################################
     # QNetworkReply interface
@@ -127,34 +137,188 @@ class ProxyReply(QtNetwork.QNetworkReply):
         return True
 
     def readData(self, maxSize):
-        with self._buflock:
-            data, self.buffer = self.buffer[:maxSize], self.buffer[maxSize:]
-        return data
+        return self.buffer.read(maxSize)
+
+
+class ProxyReplyPool(object):
+    """ A bounded pool of threads that handle the requests of ProxyReplies.
+
+    Requests are queued while all of the threads are busy. The pool keeps
+    count of the queued and active requests and of how long requests wait
+    in the queue and take to run.
+
+    """
+
+    def __init__(self, max_workers=None):
+        self._thread_pool = QtCore.QThreadPool()
+        if max_workers is not None:
+            self._thread_pool.setMaxThreadCount(max_workers)
+
+        self._lock = threading.Lock()
+
+        #: The number of requests waiting for a thread.
+        self.queued = 0
+
+        #: The number of requests being handled.
+        self.active = 0
+
+        #: The number of requests that have been handled.
+        self.completed = 0
+
+        #: The total and maximum time (in seconds) that requests have waited
+        #: for a thread.
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+        #: The total time (in seconds) taken to handle the requests.
+        self.total_run_time = 0.0
+
+    @property
+    def max_workers(self):
+        """ The maximum number of threads in the pool. """
+
+        return self._thread_pool.maxThreadCount()
+
+    def get_stats(self):
+        """ Return a dict of the pool's counters (and mean latencies). """
+
+        with self._lock:
+            completed = max(self.completed, 1)
+            return dict(
+                max_workers     = self.max_workers,
+                queued          = self.queued,
+                active          = self.active,
+                completed       = self.completed,
+                mean_wait_time  = self.total_wait_time / completed,
+                max_wait_time   = self.max_wait_time,
+                mean_run_time   = self.total_run_time / completed
+            )
+
+    def run(self, worker):
+        """ Run a worker in the calling thread (counting it as one of the
+        pool's requests).
+
+        This is used for synchronous requests: the calling (GUI) thread is
+        blocked until they are handled anyway, so they don't wait behind the
+        queued requests for a thread to be free.
+
+        """
+
+        with self._lock:
+            self.queued += 1
+
+        worker.pool = self
+        worker.submitted = time.time()
+        worker.run()
+
+        return
+
+    def submit(self, worker):
+        """ Queue a worker to be run by the pool. """
+
+        with self._lock:
+            self.queued += 1
+
+        worker.pool = self
+        worker.submitted = time.time()
+        self._thread_pool.start(worker)
+
+        return
+
+    def wait_for_done(self):
+        """ Wait for all queued and active requests to be handled. """
+
+        self._thread_pool.waitForDone()
 
+        return
 
-class ProxyReplyWorker(QtCore.QThread):
-    """ Worker thread to fetch urls for QNetworkProxy. """
+    #### Private protocol #####################################################
+
+    def _on_started(self, worker):
+        """ Called (in its thread) when a worker starts running. """
+
+        wait_time = time.time() - worker.submitted
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+
+        return
+
+    def _on_finished(self, worker, run_time):
+        """ Called (in its thread) when a worker has finished. """
+
+        with self._lock:
+            self.active -= 1
+            self.completed += 1
+            self.total_run_time += run_time
+
+        return
+
+
+class ProxyReplySignals(QtCore.QObject):
+    """ The signals that a ProxyReplyWorker forwards to its ProxyReply.
+
+    They are always queued to the reply in the GUI thread, even when the
+    worker runs in the GUI thread itself (see `ProxyReplyPool.run`): the
+    reply is still being created then, so nothing is connected to its
+    signals yet.
+
+    """
 
-    # Signals to forward to ProxyReply
     metaDataChanged = QtCore.Signal()
     readyRead = QtCore.Signal()
     finished = QtCore.Signal()
 
+
+class ProxyReplyWorker(QtCore.QRunnable):
+    """ Handles the request of a ProxyReply in a ProxyReplyPool thread. """
+
     OPERATIONS = {QtNetwork.QNetworkAccessManager.GetOperation: 'GET',
                   QtNetwork.QNetworkAccessManager.PostOperation: 'POST',}
 
-    def __init__(self, reply, parent=None):
-        super(ProxyReplyWorker, self).__init__(parent)
+    def __init__(self, reply):
+        super(ProxyReplyWorker, self).__init__()
+
+        # The reply keeps a reference to the worker, so Qt mustn't delete it.
+        self.setAutoDelete(False)
+
         self.reply = reply
-        self.metaDataChanged.connect(self.reply.metaDataChanged)
-        self.readyRead.connect(self.reply.readyRead)
-        self.finished.connect(self.reply.finished)
+
+        # Set when the worker is submitted to (or run by) a pool.
+        self.pool = None
+        self.submitted = None
+
+        queued = QtCore.Qt.QueuedConnection
+        self._signals = ProxyReplySignals()
+        self.metaDataChanged = self._signals.metaDataChanged
+        self.readyRead = self._signals.readyRead
+        self.finished = self._signals.finished
+        self.metaDataChanged.connect(self.reply.metaDataChanged, queued)
+        self.readyRead.connect(self.reply.readyRead, queued)
+        self.finished.connect(self.reply.finished, queued)
 
     ###########################################################################
-    # QThread interface.
+    # QRunnable interface.
     ###########################################################################
 
     def run(self):
+        """ Runs the request, keeping the pool's counters up to date. """
+
+        self.pool._on_started(self)
+        start = time.time()
+        try:
+            self._handle_request()
+
+        finally:
+            self.pool._on_finished(self, time.time() - start)
+
+    ###########################################################################
+    # Private interface.
+    ###########################################################################
+
+    def _handle_request(self):
         """ handles the request by acting as a WSGI forwarding server. """
         reply = self.reply
         url = reply.url()
@@ -197,13 +361,11 @@ class ProxyReplyWorker(QtCore.QThread):
                 if local_buf_len >= 8192:
                     # Do not write to buffer on every read, app is slowed down
                     # due to lock contention
-                    with reply._buflock:
-                        reply.buffer += b''.join(local_buf)
+                    reply.buffer.append(b''.join(local_buf))
                     local_buf = []
                     local_buf_len = 0
                     self.readyRead.emit()
-            with reply._buflock:
-                reply.buffer += b''.join(local_buf)
+            reply.buffer.append(b''.join(local_buf))
 
         except Exception as e:
             if reply.aborted:
@@ -215,16 +377,13 @@ class ProxyReplyWorker(QtCore.QThread):
                 QtNetwork.QNetworkRequest.HttpReasonPhraseAttribute,
                 'Internal Error'
             )
-            with reply._buflock:
-                reply.buffer += b'WSGI Proxy "Server" Error.\n' + str(e)
+            reply.buffer.append(
+                b'WSGI Proxy "Server" Error.\n' + str(e).encode('utf8')
+            )
         finally:
             self.readyRead.emit()
             self.finished.emit()
 
-    ###########################################################################
-    # Private interface.
-    ###########################################################################
-
     def _start_response(self, status, response_headers):
         """ WSGI start_response callable. """
         code, reason = status.split(' ', 1)
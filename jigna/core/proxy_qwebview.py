@@ -31,7 +31,7 @@ class ProxyQWebView(QtWebKit.QWebView):
 
     def __init__(
         self, parent=None, python_namespace=None, callbacks=[],
-        debug=True, hosts={}
+        debug=True, hosts={}, max_workers=None, signals=[]
     ):
         super(ProxyQWebView, self).__init__(parent)
 
@@ -39,11 +39,13 @@ class ProxyQWebView(QtWebKit.QWebView):
         self.setPage(self._page)
 
         # Connect JS with python.
-        self.expose_python_namespace(python_namespace, callbacks)
+        self.expose_python_namespace(python_namespace, callbacks, signals)
 
         # Install custom access manager to delegate requests to custom WSGI
-        # hosts.
-        self._access_manager = ProxyAccessManager(hosts=hosts)
+        # hosts (handled by a pool of at most 'max_workers' threads).
+        self._access_manager = ProxyAccessManager(
+            hosts=hosts, max_workers=max_workers
+        )
         self._page.setNetworkAccessManager(self._access_manager)
 
         # Disable some actions
@@ -73,7 +75,7 @@ class ProxyQWebView(QtWebKit.QWebView):
 
         return result
 
-    def expose_python_namespace(self, python_namespace, callbacks):
+    def expose_python_namespace(self, python_namespace, callbacks, signals=[]):
         """ Exposes the given python namespace to Javascript.
 
         Javascript can access the given list of callbacks as if they were
@@ -87,6 +89,10 @@ class ProxyQWebView(QtWebKit.QWebView):
             This list of callbacks is what is exposed to the JS world via the
             given python namespace.
 
+        signals: [str]:
+            The names of the (string) signals that the JS world can connect
+            to. They are emitted via the `js_wrapper` attribute.
+
         Usage:
         ------
 
@@ -101,7 +107,10 @@ class ProxyQWebView(QtWebKit.QWebView):
 
         """
         frame = self._page.mainFrame()
-        js_wrapper = create_js_object_wrapper(callbacks=callbacks,parent=frame)
+        js_wrapper = create_js_object_wrapper(
+            callbacks=callbacks, parent=frame, signals=signals
+        )
+        self.js_wrapper = js_wrapper
         frame.javaScriptWindowObjectCleared.connect(
             lambda: self._on_js_window_cleared(python_namespace, js_wrapper)
         )
@@ -0,0 +1,70 @@
+#
+# Jigna product code
+#
+# (C) Copyright 2013-2016 Enthought, Inc., Austin, TX
+# All right reserved.
+#
+
+""" The buffer that the replies of the Qt network access manager are read
+from (see `jigna.core.network_access`).
+
+It doesn't depend on Qt.
+
+"""
+
+# Standard library imports.
+from collections import deque
+import threading
+
+
+class ReceiveBuffer(object):
+    """ A thread-safe FIFO buffer of bytes.
+
+    The data is kept as a queue of chunks (plus the offset into the first one)
+    so that appending and reading only ever copy the bytes appended/read,
+    rather than all the bytes in the buffer.
+
+    """
+
+    def __init__(self):
+        self._chunks = deque()
+        self._lock = threading.Lock()
+        self._offset = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, data):
+        """ Append some bytes to the buffer. """
+
+        if len(data) > 0:
+            with self._lock:
+                self._chunks.append(data)
+                self._size += len(data)
+
+    def read(self, max_size):
+        """ Remove and return up to 'max_size' bytes from the buffer. """
+
+        parts = []
+        with self._lock:
+            remaining = min(max_size, self._size)
+            self._size -= remaining
+            while remaining > 0:
+                chunk = self._chunks[0]
+                available = len(chunk) - self._offset
+                if available <= remaining:
+                    parts.append(chunk[self._offset:])
+                    self._chunks.popleft()
+                    self._offset = 0
+                    remaining -= available
+
+                else:
+                    end = self._offset + remaining
+                    parts.append(chunk[self._offset:end])
+                    self._offset = end
+                    remaining = 0
+
+        return b''.join(parts)
+
+#### EOF ######################################################################
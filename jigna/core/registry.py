@@ -0,0 +1,291 @@
+#
+# Jigna product code
+#
+# (C) Copyright 2013-2016 Enthought, Inc., Austin, TX
+# All right reserved.
+#
+
+""" A registry of the objects that the clients have proxies for.
+
+Objects are held by weak reference whenever possible so that the registry
+doesn't keep alive objects that are no longer used by the application. While
+a client holds a proxy for an object, the object is also *pinned* (held by a
+strong reference) so that e.g. the value returned by a method call survives
+until the client has finished with it. Each time an object is sent to a client
+its pin count is incremented and the client releases the pins when it drops
+the proxy.
+
+The number of strong references to unpinned objects is bounded: once
+`max_size` is reached, the least recently used ones are dropped. Only objects
+that can't be weakly referenced (such as a plain list or dict) are held by a
+strong reference without being pinned, and they are forgotten when it is
+dropped. Pinned objects are never dropped.
+
+Pins are counted per registry, not per client: each client releases the pins
+of the objects that it received, so the count is the total over all the
+clients. An object sent to every client at once (as in an event) must
+therefore not be pinned, as each client would release it.
+
+Ids are never reused, so a client can't end up with a proxy for the wrong
+object after the original one has been garbage collected.
+
+"""
+
+# Standard library imports.
+from collections import OrderedDict
+from itertools import count
+from threading import RLock
+import weakref
+
+# Enthought library imports.
+from traits.api import Event, HasTraits, Int, Property
+
+
+class ObjectRegistry(HasTraits):
+    """ A registry of the objects that the clients have proxies for. """
+
+    #### 'ObjectRegistry' protocol ############################################
+
+    #: The maximum number of objects held by a strong reference (0 means that
+    #: there is no limit). Pinned objects are never evicted, so there may be
+    #: more strong references than this while the clients hold them.
+    max_size = Int(10000)
+
+    #: The number of registered objects that have been garbage collected.
+    collected = Int
+
+    #: The number of strong references that have been dropped because the
+    #: registry was full.
+    evictions = Int
+
+    #: Fired when an object is removed from the registry (because it has been
+    #: garbage collected or evicted) with a tuple '(str id, obj)'. 'obj' is
+    #: None if the object has been garbage collected.
+    removed = Event
+
+    #: The number of pinned objects.
+    pinned = Property(Int)
+    def _get_pinned(self):
+        return len(self._pins)
+
+    #: The number of registered objects.
+    size = Property(Int)
+    def _get_size(self):
+        return len(self._entries)
+
+    def __init__(self, **traits):
+        super(ObjectRegistry, self).__init__(**traits)
+
+        self._lock = RLock()
+
+        # Used to create the (never reused) Ids.
+        self._counter = count(1)
+
+        # { str id : weakref.ref or obj }
+        self._entries = {}
+
+        # { id(obj) : str id }
+        self._ids = {}
+
+        # { str id : id(obj) }
+        self._addresses = {}
+
+        # { str id : int pin count }
+        self._pins = {}
+
+        # The objects held by a strong reference.
+        #
+        # { str id : obj }
+        self._strong = {}
+
+        # The Ids of the unpinned objects held by a strong reference (i.e. the
+        # ones that can be evicted), least recently used first.
+        #
+        # { str id : None }
+        self._evictable = OrderedDict()
+
+    def get(self, obj_id):
+        """ Return the object with the given Id.
+
+        Raise a `KeyError` if there is no such object (or if it has been
+        garbage collected).
+
+        """
+
+        with self._lock:
+            entry = self._entries[obj_id]
+            if obj_id in self._evictable:
+                self._evictable[obj_id] = self._evictable.pop(obj_id)
+
+        if isinstance(entry, weakref.ref):
+            obj = entry()
+            if obj is None:
+                raise KeyError(obj_id)
+
+        else:
+            obj = entry
+
+        return obj
+
+    def get_id(self, obj):
+        """ Return the Id of a registered object (or None if it isn't). """
+
+        with self._lock:
+            return self._ids.get(id(obj))
+
+    def objects(self):
+        """ Return a list of all registered objects that are still alive. """
+
+        with self._lock:
+            entries = list(self._entries.values())
+
+        objs = []
+        for entry in entries:
+            if isinstance(entry, weakref.ref):
+                entry = entry()
+                if entry is None:
+                    continue
+
+            objs.append(entry)
+
+        return objs
+
+    def register(self, obj, pin=False):
+        """ Register an object (if it isn't already) and return its Id.
+
+        If `pin` is True then the object's pin count is incremented.
+
+        """
+
+        with self._lock:
+            obj_id = self._ids.get(id(obj))
+            if obj_id is None:
+                obj_id = str(next(self._counter))
+                try:
+                    entry = weakref.ref(obj, self._get_callback(obj_id))
+
+                except TypeError:
+                    entry = obj
+
+                self._entries[obj_id] = entry
+                self._ids[id(obj)] = obj_id
+                self._addresses[obj_id] = id(obj)
+
+            entry = self._entries[obj_id]
+            if pin:
+                self._pins[obj_id] = self._pins.get(obj_id, 0) + 1
+                self._evictable.pop(obj_id, None)
+                self._strong[obj_id] = obj
+
+            elif not isinstance(entry, weakref.ref):
+                if obj_id not in self._pins:
+                    self._evictable.pop(obj_id, None)
+                    self._evictable[obj_id] = None
+                self._strong[obj_id] = obj
+                self._trim()
+
+        return obj_id
+
+    def release(self, obj_id, count=1):
+        """ Decrement the pin count of the object with the given Id.
+
+        When the count reaches zero the object is no longer held by a strong
+        reference (unless it can't be weakly referenced, in which case it is
+        kept until it is evicted).
+
+        """
+
+        with self._lock:
+            if obj_id not in self._pins:
+                return
+
+            pins = self._pins[obj_id] - count
+            if pins > 0:
+                self._pins[obj_id] = pins
+                return
+
+            del self._pins[obj_id]
+            self._unpin(obj_id)
+            self._trim()
+
+        return
+
+    def release_all(self):
+        """ Release all the pinned objects (e.g. when the client has gone
+        away).
+
+        """
+
+        with self._lock:
+            for obj_id in list(self._pins):
+                del self._pins[obj_id]
+                self._unpin(obj_id)
+
+            self._trim()
+
+        return
+
+    #### Private protocol #####################################################
+
+    def _get_callback(self, obj_id):
+        """ Return the weakref callback that removes the given Id. """
+
+        # Don't keep the registry alive from the weak references.
+        registry = weakref.ref(self)
+
+        def _on_collected(ref):
+            self = registry()
+            if self is not None:
+                self.collected += 1
+                self._remove(obj_id)
+
+        return _on_collected
+
+    def _remove(self, obj_id):
+        """ Remove the object with the given Id from the registry. """
+
+        with self._lock:
+            entry = self._entries.pop(obj_id, None)
+            self._pins.pop(obj_id, None)
+            self._strong.pop(obj_id, None)
+            self._evictable.pop(obj_id, None)
+            address = self._addresses.pop(obj_id, None)
+            if self._ids.get(address) == obj_id:
+                del self._ids[address]
+
+        if isinstance(entry, weakref.ref):
+            entry = entry()
+
+        self.removed = (obj_id, entry)
+
+        return
+
+    def _trim(self):
+        """ Drop the least recently used unpinned strong references until the
+        registry is no longer full (or only pinned objects are left).
+
+        """
+
+        while (self.max_size > 0 and len(self._strong) > self.max_size
+               and len(self._evictable) > 0):
+            obj_id, _ = self._evictable.popitem(last=False)
+            self.evictions += 1
+            self._remove(obj_id)
+
+        return
+
+    def _unpin(self, obj_id):
+        """ Stop holding an object that is no longer pinned by a strong
+        reference (unless it can't be weakly referenced).
+
+        """
+
+        if isinstance(self._entries.get(obj_id), weakref.ref):
+            self._strong.pop(obj_id, None)
+
+        elif obj_id in self._strong:
+            self._evictable[obj_id] = None
+
+        return
+
+#### EOF ######################################################################
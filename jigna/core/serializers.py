@@ -0,0 +1,268 @@
+#
+# Jigna product code
+#
+# (C) Copyright 2013-2016 Enthought, Inc., Austin, TX
+# All right reserved.
+#
+
+""" Serializers for the messages exchanged between the server and clients.
+
+The stdlib `json` module is always available. If installed, `orjson` or
+`ujson` are used as faster JSON codecs, and `msgpack` can be used to send
+binary MessagePack messages to web clients.
+
+All the JSON serializers produce the same messages: NumPy scalars are sent as
+the equivalent Python numbers and `orjson` falls back to the stdlib `json`
+module for the messages it can't encode (such as integers that don't fit in 64
+bits).
+
+"""
+
+# Standard library imports.
+import json
+
+# 3rd party imports.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Enthought library imports.
+from traits.api import Bool, HasTraits, Instance, Str
+
+
+class Serializer(HasTraits):
+    """ Base class for all serializers. """
+
+    #### 'Serializer' protocol ################################################
+
+    #: Does the serializer produce binary (bytes) rather than text messages?
+    binary = Bool(False)
+
+    #: The name of the wire format that the clients know about.
+    format = Str('json')
+
+    #: The name of the serializer (see `get_serializer`).
+    name = Str
+
+    def dumps(self, obj, buffers=None, default=None):
+        """ Serialize an object.
+
+        If `buffers` is a list then the raw data of any NumPy array is
+        appended to it (and the array is replaced by its index in the list) so
+        that it can be sent as a binary message. Otherwise arrays are
+        serialized as flat lists.
+
+        NumPy scalars are serialized as the equivalent Python numbers.
+
+        `default` is called for any other object that can't be serialized (as
+        for `json.dumps`), if it is not given a `TypeError` is raised.
+
+        """
+
+        return self._dumps(obj, self._get_default(buffers, default))
+
+    def loads(self, data):
+        """ Deserialize an object. """
+
+        raise NotImplementedError
+
+    #### Private protocol #####################################################
+
+    def _dumps(self, obj, default):
+        """ Serialize an object using the given 'default' hook. """
+
+        raise NotImplementedError
+
+    def _get_default(self, buffers, default):
+        """ Return the hook called for objects that can't be serialized. """
+
+        def _default(value):
+            if numpy is not None and isinstance(value, numpy.ndarray):
+                if buffers is None:
+                    return value.ravel().tolist()
+
+                buffers.append(value.tobytes())
+                return len(buffers) - 1
+
+            if numpy is not None and isinstance(value, numpy.generic):
+                return value.item()
+
+            if default is None:
+                raise TypeError('%r is not serializable' % value)
+
+            return default(value)
+
+        return _default
+
+
+class JSONSerializer(Serializer):
+    """ Serializer using the stdlib `json` module. """
+
+    name = Str('json')
+
+    def loads(self, data):
+        """ Deserialize an object. """
+
+        return json.loads(data)
+
+    def _dumps(self, obj, default):
+        """ Serialize an object using the given 'default' hook. """
+
+        return json.dumps(obj, default=default, separators=(',', ':'))
+
+
+class ORJSONSerializer(Serializer):
+    """ Serializer using `orjson`.
+
+    `orjson` rejects some messages that the stdlib `json` module accepts (such
+    as integers that don't fit in 64 bits), these are serialized with `json`.
+
+    """
+
+    name = Str('orjson')
+
+    def dumps(self, obj, buffers=None, default=None):
+        """ Serialize an object. """
+
+        count = 0 if buffers is None else len(buffers)
+        try:
+            return super(ORJSONSerializer, self).dumps(obj, buffers, default)
+
+        except TypeError:
+            # Drop any buffers added by the failed attempt.
+            if buffers is not None:
+                del buffers[count:]
+
+            return self._json_serializer.dumps(obj, buffers, default)
+
+    def loads(self, data):
+        """ Deserialize an object. """
+
+        return orjson.loads(data)
+
+    #### Private protocol #####################################################
+
+    #: The serializer used for the messages that `orjson` can't encode.
+    _json_serializer = Instance(JSONSerializer, ())
+
+    def _dumps(self, obj, default):
+        """ Serialize an object using the given 'default' hook. """
+
+        return orjson.dumps(
+            obj, default=default, option=orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+
+
+class UJSONSerializer(Serializer):
+    """ Serializer using `ujson`. """
+
+    name = Str('ujson')
+
+    def loads(self, data):
+        """ Deserialize an object. """
+
+        return ujson.loads(data)
+
+    def _dumps(self, obj, default):
+        """ Serialize an object using the given 'default' hook. """
+
+        return ujson.dumps(obj, default=default, escape_forward_slashes=False)
+
+
+class MessagePackSerializer(Serializer):
+    """ Serializer producing binary MessagePack messages using `msgpack`.
+
+    The raw data of NumPy arrays is always sent inline (as MessagePack 'bin'
+    values).
+
+    """
+
+    binary = Bool(True)
+
+    format = Str('msgpack')
+
+    name = Str('msgpack')
+
+    def loads(self, data):
+        """ Deserialize an object. """
+
+        return msgpack.unpackb(data, raw=False)
+
+    def _dumps(self, obj, default):
+        """ Serialize an object using the given 'default' hook. """
+
+        return msgpack.packb(obj, default=default, use_bin_type=True)
+
+    def _get_default(self, buffers, default):
+        """ Return the hook called for objects that can't be serialized. """
+
+        _default = super(MessagePackSerializer, self)._get_default(
+            None, default
+        )
+
+        def _msgpack_default(value):
+            if numpy is not None and isinstance(value, numpy.ndarray):
+                return value.tobytes()
+
+            return _default(value)
+
+        return _msgpack_default
+
+
+#: All serializers keyed by name along with the module they depend on.
+SERIALIZERS = {
+    'json'    : (JSONSerializer, json),
+    'msgpack' : (MessagePackSerializer, msgpack),
+    'orjson'  : (ORJSONSerializer, orjson),
+    'ujson'   : (UJSONSerializer, ujson)
+}
+
+
+def get_available_serializers():
+    """ Return the names of the serializers whose codec is installed. """
+
+    return sorted(
+        name for name, (klass, module) in SERIALIZERS.items()
+        if module is not None
+    )
+
+
+def get_serializer(name='auto'):
+    """ Return a serializer given its name.
+
+    'auto' returns the fastest installed JSON serializer.
+
+    """
+
+    if name == 'auto':
+        available = get_available_serializers()
+        for name in ['orjson', 'ujson', 'json']:
+            if name in available:
+                break
+
+    if name not in SERIALIZERS:
+        raise ValueError('Unknown serializer: %r' % name)
+
+    klass, module = SERIALIZERS[name]
+    if module is None:
+        raise ValueError('Serializer %r is not installed' % name)
+
+    return klass()
+
+#### EOF ######################################################################
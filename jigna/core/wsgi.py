@@ -1,11 +1,15 @@
 # Standard library imports
 import threading
 import mimetypes
+import mmap
 import logging
+import os
 from os.path import exists, join, sep
 
 # Enthought library imports
-from traits.api import HasTraits, Str, Dict, Directory, on_trait_change
+from traits.api import (
+    HasTraits, Str, Dict, Directory, Instance, Int, on_trait_change
+)
 
 mimeLock = threading.Lock()
 mimeInitialized = False
@@ -39,15 +43,70 @@ def guess_type(path):
     return (guessed[0] or "", guessed[1] or "")
 
 
+def get_range(range_header, size):
+    """ Parse the value of an HTTP 'Range' header for a file of the given size.
+
+    Only a single range of bytes is supported. Return None if there is no
+    (supported) range, otherwise the (start, end) of the range. If the range
+    can't be satisfied then 'start' is not less than 'size'.
+
+    """
+
+    if isinstance(range_header, bytes):
+        range_header = range_header.decode('latin-1')
+
+    if not range_header or not range_header.startswith('bytes='):
+        return None
+
+    spec = range_header[len('bytes='):].strip()
+    if ',' in spec:
+        return None
+
+    first, _, last = spec.partition('-')
+    try:
+        # A suffix range (the last 'n' bytes).
+        if len(first) == 0:
+            suffix = int(last)
+            start = max(size - suffix, 0) if suffix > 0 else size
+            end = size
+
+        else:
+            start = int(first)
+            end = min(int(last) + 1, size) if len(last) > 0 else size
+
+    except ValueError:
+        return None
+
+    if end <= start < size:
+        return None
+
+    return start, end
+
+
 class FileLoader(HasTraits):
 
     #: Root directory where it looks
     root = Directory
 
     #: A dictionary of overrides which holds canned responses for some special
-    #: paths
+    #: paths. A response can also be a callable that returns the response (it
+    #: is called for each request of the path).
     overrides = Dict
 
+    #: The cache of small (and frequently used) files.
+    #:
+    #: Files that are too big to be cached are streamed in chunks.
+    asset_cache = Instance('jigna.core.asset_cache.AssetCache')
+    def _asset_cache_default(self):
+        from jigna.core.asset_cache import AssetCache
+        return AssetCache()
+
+    #: The size (in bytes) of the chunks that big files are streamed in.
+    chunk_size = Int(64 * 1024)
+
+    #: Files bigger than this (in bytes) are memory mapped rather than read.
+    mmap_threshold = Int(16 * 1024 * 1024)
+
     #### WSGI protocol ########################################################
 
     def __call__(self, env, start_response):
@@ -57,10 +116,14 @@ class FileLoader(HasTraits):
 
         # Check if it is handled by one of the overrides
         if self.overrides.get(path) is not None:
+            response = self.overrides[path]
+            if callable(response):
+                response = response()
+
             start_response(
                 '200 OK', [('Content-Type', '; '.join(guess_type(path)))]
             )
-            return [self.overrides[path]]
+            return [response]
 
         # Continue, if the path wasn't handled by canned responses for special
         # paths
@@ -69,10 +132,75 @@ class FileLoader(HasTraits):
             start_response('404 File not found', [])
             return [""]
 
+        size = os.stat(path).st_size
+        file_range = get_range(env.get('HTTP_RANGE'), size)
+        if file_range is None:
+            status, start, end = '200 OK', 0, size
+
         else:
-            start_response(
-                '200 OK', [('Content-Type', '; '.join(guess_type(path)))]
+            start, end = file_range
+            if start >= size:
+                start_response(
+                    '416 Requested Range Not Satisfiable',
+                    [('Content-Range', 'bytes */%d' % size)]
+                )
+                return [b'']
+
+            status = '206 Partial Content'
+
+        if size <= self.asset_cache.max_file_size:
+            asset = self.asset_cache.get(path)
+            content_type = asset.mime_type
+            response = [asset.data[start:end]]
+
+        else:
+            content_type = '; '.join(guess_type(path))
+            file_wrapper = env.get('wsgi.file_wrapper')
+            if file_wrapper is not None and file_range is None:
+                response = file_wrapper(open(path, 'rb'), self.chunk_size)
+
+            else:
+                response = self._iter_file(path, start, end)
+
+        headers = [
+            ('Content-Type', content_type),
+            ('Content-Length', str(end - start)),
+            ('Accept-Ranges', 'bytes')
+        ]
+        if file_range is not None:
+            headers.append(
+                ('Content-Range', 'bytes %d-%d/%d' % (start, end - 1, size))
             )
-            with open(path, 'rb') as f:
-                response = f.read()
-            return [response]
+
+        start_response(status, headers)
+
+        return response
+
+    #### Private protocol #####################################################
+
+    def _iter_file(self, path, start, end):
+        """ Generate the contents of a (big) file from 'start' to 'end' in
+        chunks.
+
+        """
+
+        with open(path, 'rb') as f:
+            if end - start > self.mmap_threshold:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    for offset in range(start, end, self.chunk_size):
+                        yield data[offset:min(offset + self.chunk_size, end)]
+
+                finally:
+                    data.close()
+
+            else:
+                f.seek(start)
+                remaining = end - start
+                while remaining > 0:
+                    chunk = f.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+
+                    remaining -= len(chunk)
+                    yield chunk
@@ -25,7 +25,7 @@ class HTMLWidget(QtGui.QWidget):
     
     def __init__(
         self, parent=None, window_flags=QtCore.Qt.Widget, context=None,
-        template=None, debug=False
+        template=None, debug=False, event_batch_interval=None
     ):
         """ Constructor. """
         
@@ -35,6 +35,7 @@ class HTMLWidget(QtGui.QWidget):
         self._context  = context
         self._template = template
         self._debug    = debug
+        self._event_batch_interval = event_batch_interval
         self._server   = self._create_server()
 
         # fixme: This has to be a public attribute for testing *only*.
@@ -68,7 +69,8 @@ class HTMLWidget(QtGui.QWidget):
             base_url = join(os.getcwd(), self._template.base_url),
             html     = self._template.html,
             context  = self._context,
-            debug    = self._debug
+            debug    = self._debug,
+            event_batch_interval = self._event_batch_interval
         )
 
         return server
@@ -49,6 +49,7 @@ concatenate({
 
         // Namespace definition
         'app/jigna.js',
+        'app/msgpack.js',
 
         // App files
         'app/client.js',
@@ -84,6 +85,7 @@ concatenate({
 
         // Namespace definition
         'app/jigna.js',
+        'app/msgpack.js',
 
         // App files
         'app/client.js',
@@ -9800,6 +9800,16 @@ jigna.initialize = function(options) {
 
 jigna.models = {};
 
+// The version of the message envelope used between the server and clients.
+jigna.PROTOCOL_VERSION = 1;
+
+jigna.jsonize_message = function(payload, id) {
+    /* Serialize a request in the message envelope expected by the server. */
+    return JSON.stringify(
+        {version: jigna.PROTOCOL_VERSION, id: id, payload: payload}
+    );
+};
+
 jigna.add_listener('jigna', 'model_added', function(event){
     var models = event.data;
     for (var model_name in models) {
@@ -9814,6 +9824,181 @@ jigna.threaded = function(obj, method_name, args) {
     return this.client.call_instance_method_thread(obj.__id__, method_name, args);
 };
 
+jigna.in_process = function(obj, method_name, args) {
+    args = Array.prototype.slice.call(arguments, 2);
+    return this.client.call_instance_method_process(obj.__id__, method_name, args);
+};
+
+
+///////////////////////////////////////////////////////////////////////////////
+// MessagePack
+///////////////////////////////////////////////////////////////////////////////
+
+// A minimal MessagePack decoder for the messages sent by a server using the
+// 'msgpack' serializer. 'bin' values (the raw data of NumPy arrays) are
+// decoded as ArrayBuffers so that typed arrays can be created from them.
+
+jigna.msgpack = {};
+
+jigna.msgpack.decode = function(buffer) {
+    /* Decode the MessagePack encoded ArrayBuffer. */
+
+    var decoder = new jigna.msgpack.Decoder(buffer);
+    return decoder.decode();
+};
+
+jigna.msgpack.Decoder = function(buffer) {
+    this._bytes  = new Uint8Array(buffer);
+    this._view   = new DataView(buffer);
+    this._offset = 0;
+};
+
+jigna.msgpack.Decoder.prototype.decode = function() {
+    var type = this._bytes[this._offset++];
+
+    // positive fixint
+    if (type < 0x80) {
+        return type;
+    }
+    // fixmap
+    if (type < 0x90) {
+        return this._map(type & 0x0f);
+    }
+    // fixarray
+    if (type < 0xa0) {
+        return this._array(type & 0x0f);
+    }
+    // fixstr
+    if (type < 0xc0) {
+        return this._str(type & 0x1f);
+    }
+    // negative fixint
+    if (type > 0xdf) {
+        return type - 0x100;
+    }
+
+    var view = this._view;
+    var value;
+    switch (type) {
+        case 0xc0: return null;
+        case 0xc2: return false;
+        case 0xc3: return true;
+
+        case 0xc4: return this._bin(this._uint(1));
+        case 0xc5: return this._bin(this._uint(2));
+        case 0xc6: return this._bin(this._uint(4));
+
+        case 0xca:
+            value = view.getFloat32(this._offset);
+            this._offset += 4;
+            return value;
+        case 0xcb:
+            value = view.getFloat64(this._offset);
+            this._offset += 8;
+            return value;
+
+        case 0xcc: return this._uint(1);
+        case 0xcd: return this._uint(2);
+        case 0xce: return this._uint(4);
+        case 0xcf: return this._uint(4) * 0x100000000 + this._uint(4);
+
+        case 0xd0:
+            value = view.getInt8(this._offset);
+            this._offset += 1;
+            return value;
+        case 0xd1:
+            value = view.getInt16(this._offset);
+            this._offset += 2;
+            return value;
+        case 0xd2:
+            value = view.getInt32(this._offset);
+            this._offset += 4;
+            return value;
+        case 0xd3:
+            value = view.getInt32(this._offset) * 0x100000000
+                    + view.getUint32(this._offset + 4);
+            this._offset += 8;
+            return value;
+
+        case 0xd9: return this._str(this._uint(1));
+        case 0xda: return this._str(this._uint(2));
+        case 0xdb: return this._str(this._uint(4));
+
+        case 0xdc: return this._array(this._uint(2));
+        case 0xdd: return this._array(this._uint(4));
+
+        case 0xde: return this._map(this._uint(2));
+        case 0xdf: return this._map(this._uint(4));
+    }
+
+    throw 'cannot decode MessagePack type: 0x' + type.toString(16);
+};
+
+// Private protocol ////////////////////////////////////////////////////////////
+
+jigna.msgpack.Decoder.prototype._array = function(length) {
+    var array = new Array(length);
+    for (var index=0; index < length; index++) {
+        array[index] = this.decode();
+    }
+
+    return array;
+};
+
+jigna.msgpack.Decoder.prototype._bin = function(length) {
+    // Copy the data so that the ArrayBuffer is correctly aligned for any
+    // typed array.
+    var start = this._bytes.byteOffset + this._offset;
+    this._offset += length;
+
+    return this._bytes.buffer.slice(start, start + length);
+};
+
+jigna.msgpack.Decoder.prototype._map = function(length) {
+    var map = {};
+    for (var index=0; index < length; index++) {
+        var key = this.decode();
+        map[key] = this.decode();
+    }
+
+    return map;
+};
+
+jigna.msgpack.Decoder.prototype._str = function(length) {
+    var bytes = this._bytes.subarray(this._offset, this._offset + length);
+    this._offset += length;
+
+    if (window.TextDecoder !== undefined) {
+        return new TextDecoder('utf-8').decode(bytes);
+    }
+
+    // Fallback for browsers (and QtWebKit) without a TextDecoder.
+    var chars = [];
+    for (var index=0; index < bytes.length; index++) {
+        chars.push(String.fromCharCode(bytes[index]));
+    }
+
+    return decodeURIComponent(escape(chars.join('')));
+};
+
+jigna.msgpack.Decoder.prototype._uint = function(size) {
+    var view = this._view;
+    var value;
+
+    if (size === 1) {
+        value = view.getUint8(this._offset);
+    }
+    else if (size === 2) {
+        value = view.getUint16(this._offset);
+    }
+    else {
+        value = view.getUint32(this._offset);
+    }
+    this._offset += size;
+
+    return value;
+};
+
 
 ///////////////////////////////////////////////////////////////////////////////
 // Client
@@ -9827,6 +10012,8 @@ jigna.Client.prototype.initialize = function() {
 
     // Private protocol.
     this._id_to_proxy_map = {};
+    this._id_to_count     = {};
+    this._released        = undefined;
     this._proxy_factory   = this._create_proxy_factory();
 
     // Add all of the models being edited
@@ -9845,12 +10032,49 @@ jigna.Client.prototype.initialize = function() {
     });
 };
 
-jigna.Client.prototype.handle_event = function(jsonized_event) {
+jigna.Client.prototype.handle_event = function(event) {
     /* Handle an event from the server. */
-    var event = JSON.parse(jsonized_event);
     jigna.fire_event(event.obj, event);
 };
 
+jigna.Client.prototype.handle_events = function(events) {
+    /* Handle a batch of events from the server.
+     *
+     * Listeners of the 'object_changed' event are notified only once for the
+     * whole batch (with all the changed objects) instead of once per event.
+     */
+    var changed_objects = [];
+
+    this._changed_objects = changed_objects;
+    try {
+        for (var index=0; index < events.length; index++) {
+            jigna.fire_event(events[index].obj, events[index]);
+        }
+    }
+    finally {
+        this._changed_objects = undefined;
+    }
+
+    if (changed_objects.length > 0) {
+        jigna.fire_event('jigna', {
+            name    : 'object_changed',
+            object  : changed_objects[changed_objects.length - 1],
+            objects : changed_objects
+        });
+    }
+};
+
+jigna.Client.prototype.handle_message = function(message) {
+    /* Handle an 'event' or 'events' (a batch of events) message. */
+
+    if (message.kind === 'events') {
+        this.handle_events(message.payload);
+    }
+    else {
+        this.handle_event(message.payload);
+    }
+};
+
 jigna.Client.prototype.on_object_changed = function(event){
     if (jigna.debug) {
         this.print_JS_message('------------on_object_changed--------------');
@@ -9890,29 +10114,48 @@ jigna.Client.prototype.on_object_changed = function(event){
             proxy.__cache__[event.name] = this._create_proxy(
                 event.data.type, event.data.value, event.data.info
             );
+            this._retain_data(event.data);
 
         } else {
+            this._retain_data(event.data);
             this._proxy_factory.update_proxy(
                 collection_proxy, event.data.type, event.data.info
             );
         }
 
     } else {
-        proxy.__cache__[event.name] = this._unmarshal(event.data);
+        this._replace_cached_value(proxy, event.name, event.data);
     }
 
     // Angular listens to this event and forces a digest cycle which is how it
     // detects changes in its watchers.
-    jigna.fire_event('jigna', {name: 'object_changed', object: proxy});
+    this._fire_object_changed(proxy);
+};
+
+jigna.Client.prototype.parse_message = function(jsonized_message, buffers) {
+    /* Parse a message from the server.
+     *
+     * 'buffers' are the binary buffers (if any) received with the message.
+     * The values of any NumPy arrays in the message are the indices of the
+     * buffers that hold their data, so we replace them with the buffers.
+     */
+
+    if (buffers === undefined || buffers.length === 0) {
+        return JSON.parse(jsonized_message);
+    }
+
+    return JSON.parse(jsonized_message, function(key, value) {
+        if (value !== null && value.type === 'ndarray') {
+            value.value = buffers[value.value];
+        }
+        return value;
+    });
 };
 
 jigna.Client.prototype.send_request = function(request) {
     /* Send a request to the server and wait for (and return) the response. */
 
-    var jsonized_request  = JSON.stringify(request);
-    var jsonized_response = this.bridge.send_request(jsonized_request);
-
-    return JSON.parse(jsonized_response).result;
+    return this.bridge.send_request(request).result;
 };
 
 // Convenience methods for each kind of request //////////////////////////////
@@ -9933,34 +10176,45 @@ jigna.Client.prototype.call_instance_method = function(id, method_name, args) {
     return result;
 };
 
-jigna.Client.prototype.call_instance_method_thread = function(id, method_name, args) {
+jigna.Client.prototype.call_instance_method_thread = function(id, method_name, args, kind) {
     /* Call an instance method in a thread. Useful if the method takes long to
-    execute and you don't want to block the UI during that time.*/
+    execute and you don't want to block the UI during that time.
+
+    The progress callbacks of the returned promise are called with the
+    progress and info of the method's future (see 'Future.progress').*/
 
     var request = {
-        kind        : 'call_instance_method_thread',
+        kind        : kind || 'call_instance_method_thread',
         id          : id,
         method_name : method_name,
         args        : this._marshal_all(args),
     };
 
     // the response of a threaded request is a marshalled version of a python
-    // future object. We attach 'done' and 'error' handlers on that object to
-    // resolve/reject our own deferred.
+    // future object.
     var response = this.send_request(request);
-    var future_obj = this._unmarshal(response);
 
-    var deferred = new $.Deferred();
+    return this._create_future_promise(this._unmarshal(response));
+};
 
-    jigna.add_listener(future_obj, 'done', function(event){
-        deferred.resolve(event.data);
-    });
+jigna.Client.prototype.call_instance_method_process = function(id, method_name, args) {
+    /* Call an instance method in a worker process on the server. This is
+    the same as 'call_instance_method_thread' but for CPU bound methods. */
 
-    jigna.add_listener(future_obj, 'error', function(event){
-        deferred.reject(event.data);
-    });
+    return this.call_instance_method_thread(
+        id, method_name, args, 'call_instance_method_process'
+    );
+};
 
-    return deferred.promise();
+jigna.Client.prototype.cancel_future = function(future_id) {
+    /* Cancel a method called in a thread. */
+
+    var request = {
+        kind      : 'cancel_future',
+        future_id : future_id
+    };
+
+    return this._unmarshal(this.send_request(request));
 };
 
 jigna.Client.prototype.get_attribute = function(proxy, attribute) {
@@ -9974,6 +10228,31 @@ jigna.Client.prototype.get_attribute = function(proxy, attribute) {
     return result;
 };
 
+jigna.Client.prototype.get_items = function(proxy, items) {
+    /* Get several items of a list/dict proxy from the server.
+     *
+     * 'items' is either {keys: [...]} or (for a list) {start: n, stop: m},
+     * which is fetched as a slice.
+     */
+
+    var request;
+    if (items.keys !== undefined) {
+        request = {kind : 'get_items', id : proxy.__id__, keys : items.keys};
+    } else {
+        request = {
+            kind  : 'get_slice',
+            id    : proxy.__id__,
+            start : items.start,
+            stop  : items.stop
+        };
+    }
+
+    var response = this.send_request(request);
+
+    var client = this;
+    return response.map(function(value) {return client._unmarshal(value);});
+};
+
 jigna.Client.prototype.print_JS_message = function(message) {
     var request = {
         kind: 'print_JS_message',
@@ -10035,6 +10314,7 @@ jigna.Client.prototype._add_models = function(context) {
     $.each(context, function(model_name, model) {
         if (jigna.models[model_name] === undefined) {
             proxy = client._add_model(model_name, model.value, model.info);
+            client._retain_data(model);
             models[model_name] = proxy;
         }
     });
@@ -10047,6 +10327,45 @@ jigna.Client.prototype._add_models = function(context) {
     return models;
 };
 
+jigna.Client.prototype._create_future_promise = function(future_id, marshalled) {
+    /* Return a promise for the outcome of a future on the server.
+     *
+     * The server sends 'done', 'error', 'progress' and 'cancelled' events for
+     * the future, which resolve/reject/notify the promise. The promise can be
+     * cancelled (the deferred is rejected with 'cancelled' once the server has
+     * cancelled the call). If 'marshalled' is true then the result in the
+     * 'done' event is unmarshalled.
+     */
+
+    var client = this;
+    var deferred = new $.Deferred();
+
+    jigna.add_listener(future_id, 'done', function(event){
+        deferred.resolve(
+            marshalled ? client._unmarshal(event.data) : event.data
+        );
+    });
+
+    jigna.add_listener(future_id, 'error', function(event){
+        deferred.reject(event.data);
+    });
+
+    jigna.add_listener(future_id, 'progress', function(event){
+        deferred.notify(event.data.progress, event.data.info);
+    });
+
+    jigna.add_listener(future_id, 'cancelled', function(event){
+        deferred.reject('cancelled');
+    });
+
+    var promise = deferred.promise();
+    promise.cancel = function() {
+        return client.cancel_future(future_id);
+    };
+
+    return promise;
+};
+
 jigna.Client.prototype._create_proxy_factory = function() {
     return new jigna.ProxyFactory(this);
 };
@@ -10083,6 +10402,25 @@ jigna.Client.prototype._create_request = function(proxy, attribute) {
     return request;
 };
 
+jigna.Client.prototype._fire_object_changed = function(proxy) {
+    /* Fire the 'object_changed' event for the given proxy.
+     *
+     * While a batch of events is being handled, the proxy is just collected
+     * and the event is fired once the whole batch has been handled.
+     */
+
+    if (this._changed_objects !== undefined) {
+        if (this._changed_objects.indexOf(proxy) === -1) {
+            this._changed_objects.push(proxy);
+        }
+        return;
+    }
+
+    jigna.fire_event('jigna', {
+        name: 'object_changed', object: proxy, objects: [proxy]
+    });
+};
+
 jigna.Client.prototype._get_bridge = function() {
     var bridge, qt_bridge;
 
@@ -10098,6 +10436,19 @@ jigna.Client.prototype._get_bridge = function() {
     return bridge;
 };
 
+jigna.Client.prototype._create_ndarray = function(data, info) {
+    /* Create a typed array from the data (an ArrayBuffer or a flat Array)
+    of a NumPy array. */
+
+    var constructor = this._typed_array_constructors[info.dtype];
+    var array = new constructor(data);
+
+    // Typed arrays are always flat, so we keep the shape around.
+    Object.defineProperty(array, 'shape', {value : info.shape});
+
+    return array;
+};
+
 jigna.Client.prototype._marshal = function(obj) {
     var type, value;
 
@@ -10105,6 +10456,10 @@ jigna.Client.prototype._marshal = function(obj) {
         type  = obj.__type__;
         value = obj.__id__;
 
+    } else if (ArrayBuffer.isView(obj)) {
+        type  = 'primitive';
+        value = Array.prototype.slice.call(obj);
+
     } else {
         type  = 'primitive';
         value = obj;
@@ -10124,6 +10479,104 @@ jigna.Client.prototype._marshal_all = function(objs) {
     return objs;
 };
 
+jigna.Client.prototype._release = function(value) {
+    /* Release the server side object of a proxy that has been dropped.
+     *
+     * The server keeps (pins) an object alive for as long as a client may
+     * have a proxy for it. Each time the server sends an object it increments
+     * the object's pin count, so we tell it how many times we received the
+     * object. The releases are sent in a single request once the current
+     * event(s) have been handled.
+     */
+
+    if (value === null || typeof value !== 'object' || value.__id__ === undefined) {
+        return;
+    }
+
+    var id = value.__id__;
+    var count = this._id_to_count[id];
+    if (count === undefined) {
+        return;
+    }
+    delete this._id_to_count[id];
+
+    this._queue_release(id, count);
+};
+
+jigna.Client.prototype._release_data = function(data) {
+    /* Release the server side object of marshalled data that was received
+    but is dropped without ever being unmarshalled. */
+
+    if (data.pinned === false) {
+        return;
+    }
+
+    if (data.type === 'list' || data.type === 'dict' || data.type === 'instance') {
+        this._queue_release(data.value, 1);
+    }
+};
+
+jigna.Client.prototype._queue_release = function(id, count) {
+    /* Queue the release of an object received 'count' times. */
+
+    if (this._released === undefined) {
+        this._released = {};
+
+        var client = this;
+        setTimeout(function() {
+            var request = {
+                kind : 'release_objects', ids : client._released
+            };
+            client._released = undefined;
+            client.bridge.send_request_async(request);
+        }, 0);
+    }
+    this._released[id] = (this._released[id] || 0) + count;
+};
+
+jigna.Client.prototype._replace_cached_value = function(proxy, name, data) {
+    /* Replace the cached value of an attribute with the marshalled data from
+    the server, releasing the old value if it was a proxy. */
+
+    var old_value = proxy.__cache__[name];
+    var value = this._unmarshal(data);
+
+    proxy.__cache__[name] = value;
+    if (old_value !== value) {
+        this._release(old_value);
+    }
+};
+
+jigna.Client.prototype._retain = function(id) {
+    /* Count a proxy's object being received from the server. */
+
+    this._id_to_count[id] = (this._id_to_count[id] || 0) + 1;
+};
+
+jigna.Client.prototype._retain_data = function(data) {
+    /* Count the object of marshalled data being received from the server.
+     *
+     * The objects in events are sent to every client so the server doesn't
+     * pin them (they are marked with 'pinned: false'), and we must not
+     * release them.
+     */
+
+    if (data.pinned !== false) {
+        this._retain(data.value);
+    }
+};
+
+jigna.Client.prototype._typed_array_constructors = {
+    'float32' : Float32Array,
+    'float64' : Float64Array,
+    'int8'    : Int8Array,
+    'int16'   : Int16Array,
+    'int32'   : Int32Array,
+    'uint8'   : Uint8Array,
+    'uint16'  : Uint16Array,
+    'uint32'  : Uint32Array
+};
+
 jigna.Client.prototype._unmarshal = function(obj) {
 
     if (obj === null) {
@@ -10133,14 +10586,21 @@ jigna.Client.prototype._unmarshal = function(obj) {
     if (obj.type === 'primitive') {
         return obj.value;
 
+    } else if (obj.type === 'ndarray') {
+        return this._create_ndarray(obj.value, obj.info);
+
+    } else if (obj.type === 'future') {
+        // A coroutine method that is run as a future on the server, its
+        // result is marshalled.
+        return this._create_future_promise(obj.value, true);
+
     } else {
         value = this._id_to_proxy_map[obj.value];
         if (value === undefined) {
-            return this._create_proxy(obj.type, obj.value, obj.info);
-        }
-        else {
-            return value;
+            value = this._create_proxy(obj.type, obj.value, obj.info);
         }
+        this._retain_data(obj);
+        return value;
     }
 };
 
@@ -10156,14 +10616,22 @@ jigna.AsyncClient.prototype = Object.create(jigna.Client.prototype);
 jigna.AsyncClient.prototype.constructor = jigna.AsyncClient;
 
 jigna.AsyncClient.prototype.send_request = function(request) {
-    /* Send a request to the server and wait for (and return) the response. */
-
-    var jsonized_request  = JSON.stringify(request);
+    /* Send a request to the server and return a promise of the response.
+     *
+     * The requests made while handling the same event (e.g. all the
+     * attributes fetched during an Angular digest cycle) are sent together
+     * as a single 'batch' request.
+     */
 
     var deferred = new $.Deferred();
-    this.bridge.send_request_async(jsonized_request).done(function(jsonized_response){
-        deferred.resolve(JSON.parse(jsonized_response).result);
-    });
+
+    if (this._queued_requests === undefined) {
+        this._queued_requests = [];
+
+        var client = this;
+        setTimeout(function() {client._send_queued_requests();}, 0);
+    }
+    this._queued_requests.push({request : request, deferred : deferred});
 
     return deferred.promise();
 };
@@ -10192,13 +10660,16 @@ jigna.AsyncClient.prototype.call_instance_method = function(id, method_name, arg
     return deferred.promise();
 };
 
-jigna.AsyncClient.prototype.call_instance_method_thread = function(id, method_name, args) {
+jigna.AsyncClient.prototype.call_instance_method_thread = function(id, method_name, args, kind) {
     /* Calls an instance method in a thread on the server. Use this to call
     any long running method on the server otherwise you won't get any UI
     updates on the client.
+
+    The progress callbacks of the returned promise are called with the
+    progress and info of the method's future (see 'Future.progress').
     */
     var request = {
-        kind        : 'call_instance_method_thread',
+        kind        : kind || 'call_instance_method_thread',
         id          : id,
         method_name : method_name,
         args        : this._marshal_all(args),
@@ -10210,10 +10681,11 @@ jigna.AsyncClient.prototype.call_instance_method_thread = function(id, method_na
     // This is done to make this similar to the sync client so that the users
     // can attach their handlers when the method is done.
     var deferred = new $.Deferred();
+    var future_obj, cancel_requested = false;
 
     this.send_request(request).done(function(response){
 
-        var future_obj = client._unmarshal(response);
+        future_obj = client._unmarshal(response);
         // the response of a threaded request is a marshalled version of a python
         // future object. We attach 'done' and 'error' handlers on that object to
         // resolve/reject our own deferred.
@@ -10226,6 +10698,57 @@ jigna.AsyncClient.prototype.call_instance_method_thread = function(id, method_na
             deferred.reject(event.data);
         });
 
+        jigna.add_listener(future_obj, 'progress', function(event){
+            deferred.notify(event.data.progress, event.data.info);
+        });
+
+        jigna.add_listener(future_obj, 'cancelled', function(event){
+            deferred.reject('cancelled');
+        });
+
+        if (cancel_requested) {
+            client.cancel_future(future_obj);
+        }
+
+    });
+
+    // The deferred is rejected with 'cancelled' once the server has
+    // cancelled the call. If the call hasn't been started yet, it is
+    // cancelled as soon as it is.
+    var promise = deferred.promise();
+    promise.cancel = function() {
+        if (future_obj === undefined) {
+            cancel_requested = true;
+            return;
+        }
+
+        return client.cancel_future(future_obj);
+    };
+
+    return promise;
+};
+
+jigna.AsyncClient.prototype.call_instance_method_process = function(id, method_name, args) {
+    /* Call an instance method in a worker process on the server. This is
+    the same as 'call_instance_method_thread' but for CPU bound methods. */
+
+    return this.call_instance_method_thread(
+        id, method_name, args, 'call_instance_method_process'
+    );
+};
+
+jigna.AsyncClient.prototype.cancel_future = function(future_id) {
+    /* Cancel a method called in a thread on the server. */
+
+    var request = {
+        kind      : 'cancel_future',
+        future_id : future_id
+    };
+    var client = this;
+
+    var deferred = new $.Deferred();
+    this.send_request(request).done(function(response){
+        deferred.resolve(client._unmarshal(response));
     });
 
     return deferred.promise();
@@ -10259,6 +10782,22 @@ jigna.AsyncClient.prototype.get_attribute = function(proxy, attribute) {
     return proxy.__cache__[attribute];
 };
 
+jigna.AsyncClient.prototype.get_slice = function(proxy, start, stop) {
+    /* Get a slice of the items of a list proxy from the server.
+     *
+     * The promise is resolved with the marshalled items.
+     */
+
+    var request = {
+        kind  : 'get_slice',
+        id    : proxy.__id__,
+        start : start,
+        stop  : stop
+    };
+
+    return this.send_request(request);
+};
+
 jigna.AsyncClient.prototype.on_object_changed = function(event){
     if (jigna.debug) {
         this.print_JS_message('------------on_object_changed--------------');
@@ -10301,17 +10840,18 @@ jigna.AsyncClient.prototype.on_object_changed = function(event){
             collection_proxy = proxy.__cache__[event.name];
             this._id_to_proxy_map[event.data.value] = collection_proxy;
         }
+        this._retain_data(event.data);
         this._proxy_factory.update_proxy(
             collection_proxy, event.data.type, event.data.info
         );
 
     } else {
-        proxy.__cache__[event.name] = this._unmarshal(event.data);
+        this._replace_cached_value(proxy, event.name, event.data);
     }
 
     // Angular listens to this event and forces a digest cycle which is how it
     // detects changes in its watchers.
-    jigna.fire_event('jigna', {name: 'object_changed', object: proxy});
+    this._fire_object_changed(proxy);
 };
 
 // Private protocol //////////////////////////////////////////////////////////
@@ -10320,12 +10860,64 @@ jigna.AsyncClient.prototype._create_proxy_factory = function() {
     return new jigna.AsyncProxyFactory(this);
 };
 
+jigna.AsyncClient.prototype._send_queued_requests = function() {
+    /* Send the queued requests (as a batch if there is more than one). */
+
+    var queued = this._queued_requests;
+    this._queued_requests = undefined;
+
+    var settle = function(deferred, response) {
+        if (response.exception) {
+            deferred.reject(response.exception);
+        } else {
+            deferred.resolve(response.result);
+        }
+    };
+
+    var reject_all = function(error) {
+        for (var index=0; index < queued.length; index++) {
+            queued[index].deferred.reject(error);
+        }
+    };
+
+    if (queued.length === 1) {
+        this.bridge.send_request_async(queued[0].request).done(
+            function(response) {settle(queued[0].deferred, response);}
+        ).fail(reject_all);
+        return;
+    }
+
+    var request = {
+        kind     : 'batch',
+        requests : queued.map(function(item) {return item.request;})
+    };
+    this.bridge.send_request_async(request).done(function(response) {
+        // If the batch itself failed then so did every request in it,
+        // otherwise each request succeeds or fails on its own.
+        if (response.exception) {
+            reject_all(response.exception);
+            return;
+        }
+
+        var responses = response.result || [];
+        for (var index=0; index < queued.length; index++) {
+            settle(queued[index].deferred, responses[index] || {});
+        }
+    }).fail(reject_all);
+};
+
 
 ///////////////////////////////////////////////////////////////////////////////
 // ProxyFactory
 ///////////////////////////////////////////////////////////////////////////////
 
 jigna.ProxyFactory = function(client) {
+    // jigna.ProxyFactory protocol.
+
+    // The number of list items fetched in a single request when an item that
+    // isn't cached is accessed.
+    this.prefetch_size = 1000;
+
     // Private protocol.
     this._client = client;
 
@@ -10545,6 +11137,11 @@ jigna.ProxyFactory.prototype._populate_dict_proxy = function(proxy, info) {
     for (index in info.keys) {
         this._add_item_attribute(proxy, info.keys[index]);
     }
+
+    // Keep the keys (with their original types) to prefetch the items.
+    Object.defineProperty(
+        proxy, '__keys__', {value : info.keys, configurable : true}
+    );
 };
 
 jigna.ProxyFactory.prototype._update_dict_proxy = function(proxy, info) {
@@ -10598,13 +11195,14 @@ jigna.ProxyFactory.prototype._update_list_proxy = function(proxy, info) {
 
 jigna.ProxyFactory.prototype._add_item_attribute = function(proxy, index){
     var descriptor, get, set;
+    var factory = this;
 
     get = function() {
         // In here, 'this' refers to the proxy!
         var value = this.__cache__[index];
         if (value === undefined) {
-            value = this.__client__.get_attribute(this, index);
-            this.__cache__[index] = value;
+            factory._prefetch_items(this, index);
+            value = this.__cache__[index];
         }
 
         return value;
@@ -10620,6 +11218,40 @@ jigna.ProxyFactory.prototype._add_item_attribute = function(proxy, index){
     Object.defineProperty(proxy, index, descriptor);
 };
 
+jigna.ProxyFactory.prototype._prefetch_items = function(proxy, index) {
+    /* Fetch the item at the given index/key of a list/dict proxy along with
+     * the following items of a list (or all other items of a dict) that
+     * aren't cached yet in a single request.
+     */
+
+    var cache = proxy.__cache__;
+    var items, keys, values;
+
+    if (proxy.__type__ === 'list') {
+        items = {
+            start : index,
+            stop  : Math.min(index + this.prefetch_size, proxy.length)
+        };
+        keys = [];
+        for (var key=items.start; key < items.stop; key++) {
+            keys.push(key);
+        }
+    }
+    else {
+        keys = proxy.__keys__.filter(function(key) {
+            return (key == index) || (cache[key] === undefined);
+        });
+        items = {keys : keys};
+    }
+
+    values = this._client.get_items(proxy, items);
+    for (var i=0; i < values.length; i++) {
+        if (cache[keys[i]] === undefined) {
+            cache[keys[i]] = values[i];
+        }
+    }
+};
+
 
 /////////////////////////////////////////////////////////////////////////////
 // AsyncProxyFactory
@@ -10632,6 +11264,16 @@ jigna._SavedData = function(data) {
 
 jigna.AsyncProxyFactory = function(client) {
     jigna.ProxyFactory.call(this, client);
+
+    // jigna.AsyncProxyFactory protocol.
+
+    // The maximum number of pages of (windowed) list proxies that are cached.
+    this.max_cached_pages = 100;
+
+    // Private protocol.
+
+    // The cached pages, least recently used first.
+    this._pages = [];
 };
 
 jigna.AsyncProxyFactory.prototype = Object.create(
@@ -10709,12 +11351,28 @@ jigna.AsyncProxyFactory.prototype._update_dict_proxy = function(proxy, info) {
 };
 
 jigna.AsyncProxyFactory.prototype._populate_list_proxy = function(proxy, info) {
-    /* Populate the items in a list proxy. */
+    /* Populate the items in a list proxy.
+     *
+     * For a long list the server only sends the first page of items and the
+     * other pages are fetched when they are first accessed.
+     */
 
     var data = info.data;
     for (var index=0; index < info.length; index++) {
         this._add_item_attribute(proxy, index);
-        proxy.__cache__[index] = new jigna._SavedData(data[index]);
+        proxy.__cache__[index] = this._saved_data(data, index);
+    }
+
+    if (info.page_size !== undefined) {
+        Object.defineProperty(
+            proxy, '__page_size__', {value : info.page_size}
+        );
+        // Bumped whenever the list is spliced, so that pages requested
+        // before the splice are not stored at the wrong indices.
+        Object.defineProperty(
+            proxy, '__generation__', {value : 0, writable : true}
+        );
+        this._touch_page(proxy, 0);
     }
 
     return proxy;
@@ -10749,14 +11407,15 @@ jigna.AsyncProxyFactory.prototype._update_list_proxy = function(proxy, info) {
             // When nothing is removed, just update the cache entries.
             for (var i=0; i < added.length; i++) {
                 index = info.start + i*info.step;
-                cache[index] = new jigna._SavedData(added.data[i]);
+                cache[index] = this._saved_data(added.data, i);
             }
         }
     } else {
         // This is not an extended slice.
-        var splice_args = [info.index, info.removed].concat(
-            info.added.data.map(function(x) {return new jigna._SavedData(x);})
-        );
+        var splice_args = [info.index, info.removed];
+        for (var i=0; i < info.added.length; i++) {
+            splice_args.push(this._saved_data(info.added.data, i));
+        }
 
         var extra = splice_args.length - 2 - splice_args[1];
         var cache = proxy.__cache__;
@@ -10772,6 +11431,10 @@ jigna.AsyncProxyFactory.prototype._update_list_proxy = function(proxy, info) {
         }
         cache.splice.apply(cache, splice_args);
     }
+
+    if (proxy.__page_size__ !== undefined) {
+        this._on_list_spliced(proxy);
+    }
 };
 
 
@@ -10779,13 +11442,18 @@ jigna.AsyncProxyFactory.prototype._update_list_proxy = function(proxy, info) {
 
 jigna.AsyncProxyFactory.prototype._add_item_attribute = function(proxy, index){
     var descriptor, get, set;
+    var factory = this;
 
     get = function() {
         // In here, 'this' refers to the proxy!
         var value = this.__cache__[index];
         if (value === undefined) {
-            value = this.__client__.get_attribute(this, index);
-            this.__cache__[index] = value;
+            if (this.__page_size__ !== undefined) {
+                factory._load_page(this, Math.floor(index/this.__page_size__));
+            } else {
+                value = this.__client__.get_attribute(this, index);
+                this.__cache__[index] = value;
+            }
         } else if (value instanceof jigna._SavedData) {
             value = this.__client__._unmarshal(value.data);
             this.__cache__[index] = value;
@@ -10804,6 +11472,133 @@ jigna.AsyncProxyFactory.prototype._add_item_attribute = function(proxy, index){
     Object.defineProperty(proxy, index, descriptor);
 };
 
+jigna.AsyncProxyFactory.prototype._saved_data = function(data, index) {
+    /* Return the saved data for an item (undefined if it wasn't sent). */
+
+    if (index < data.length) {
+        return new jigna._SavedData(data[index]);
+    }
+};
+
+// Windowed list proxies ///////////////////////////////////////////////////////
+
+jigna.AsyncProxyFactory.prototype._evict_page = function(proxy, page) {
+    /* Remove the items of a page from the cache of a list proxy. */
+
+    var cache = proxy.__cache__;
+    var start = page * proxy.__page_size__;
+    var stop = Math.min(start + proxy.__page_size__, cache.length);
+
+    for (var index=start; index < stop; index++) {
+        if (cache[index] instanceof jigna._SavedData) {
+            this._client._release_data(cache[index].data);
+        } else {
+            this._client._release(cache[index]);
+        }
+        cache[index] = undefined;
+    }
+};
+
+jigna.AsyncProxyFactory.prototype._load_page = function(proxy, page) {
+    /* Fetch a page of items of a list proxy from the server. */
+
+    // While the page is being fetched its state is the generation of the
+    // list that it was requested for.
+    var state = 'page ' + page;
+    var generation = proxy.__generation__;
+    if (proxy.__state__[state] === generation) {
+        return;
+    }
+    proxy.__state__[state] = generation;
+
+    var factory = this;
+    var client = this._client;
+    var start = page * proxy.__page_size__;
+    var stop = start + proxy.__page_size__;
+    var clear_state = function() {
+        if (proxy.__state__[state] === generation) {
+            proxy.__state__[state] = undefined;
+        }
+    };
+
+    client.get_slice(proxy, start, stop).done(function(data) {
+        clear_state();
+
+        // The request failed.
+        if (!data) {
+            return;
+        }
+
+        // The list was spliced while the page was being fetched so the items
+        // may no longer be at these indices (the page is fetched again when
+        // it is next accessed).
+        if (proxy.__generation__ !== generation) {
+            for (var index=0; index < data.length; index++) {
+                client._release_data(data[index]);
+            }
+            return;
+        }
+
+        var cache = proxy.__cache__;
+        for (var index=0; index < data.length; index++) {
+            if (start + index < cache.length) {
+                cache[start + index] = new jigna._SavedData(data[index]);
+            } else {
+                client._release_data(data[index]);
+            }
+        }
+        factory._touch_page(proxy, page);
+
+        jigna.fire_event('jigna', {name: 'object_changed', object: proxy});
+    }).fail(clear_state);
+};
+
+jigna.AsyncProxyFactory.prototype._on_list_spliced = function(proxy) {
+    /* Called when the items of a windowed list proxy have been spliced.
+     *
+     * The items have moved, so pages that are being fetched are dropped when
+     * they arrive and the cached pages are recorded again from the items that
+     * are now in the cache.
+     */
+
+    proxy.__generation__ += 1;
+
+    this._pages = this._pages.filter(function(item) {
+        return item.proxy !== proxy;
+    });
+
+    var cache = proxy.__cache__;
+    var page_size = proxy.__page_size__;
+    for (var page=0; page * page_size < cache.length; page++) {
+        var stop = Math.min((page + 1) * page_size, cache.length);
+        for (var index=page * page_size; index < stop; index++) {
+            if (cache[index] !== undefined) {
+                this._touch_page(proxy, page);
+                break;
+            }
+        }
+    }
+};
+
+jigna.AsyncProxyFactory.prototype._touch_page = function(proxy, page) {
+    /* Mark a page of a list proxy as the most recently used one, evicting
+    the least recently used pages if there are too many. */
+
+    var pages = this._pages;
+    for (var index=0; index < pages.length; index++) {
+        if (pages[index].proxy === proxy && pages[index].page === page) {
+            pages.splice(index, 1);
+            break;
+        }
+    }
+    pages.push({proxy : proxy, page : page});
+
+    while (pages.length > this.max_cached_pages) {
+        var oldest = pages.shift();
+        this._evict_page(oldest.proxy, oldest.page);
+    }
+};
+
 
 ///////////////////////////////////////////////////////////////////////////////
 // Proxy
@@ -10941,23 +11736,34 @@ jigna.QtBridge = function(client, qt_bridge) {
     this._client    = client;
     this._qt_bridge = qt_bridge;
 
+    // The server pushes messages by emitting the 'message' signal (if it
+    // can), which avoids compiling a script for each message.
+    if (qt_bridge.message !== undefined) {
+        var bridge = this;
+        qt_bridge.message.connect(function(jsonized_message) {
+            bridge.handle_message(jsonized_message);
+        });
+    }
+
     this.ready.resolve();
 };
 
-jigna.QtBridge.prototype.handle_event = function(jsonized_event) {
-    /* Handle an event from the server. */
-    this._client.handle_event(jsonized_event);
+jigna.QtBridge.prototype.handle_message = function(jsonized_message) {
+    /* Handle a message from the server. */
+    this._client.handle_message(this._client.parse_message(jsonized_message));
 };
 
-jigna.QtBridge.prototype.send_request = function(jsonized_request) {
+jigna.QtBridge.prototype.send_request = function(request) {
     /* Send a request to the server and wait for the reply. */
 
-    result = this._qt_bridge.handle_request(jsonized_request);
+    var jsonized_response = this._qt_bridge.handle_request(
+        jigna.jsonize_message(request, null)
+    );
 
-    return result;
+    return this._client.parse_message(jsonized_response).payload;
 };
 
-jigna.QtBridge.prototype.send_request_async = function(jsonized_request) {
+jigna.QtBridge.prototype.send_request_async = function(request) {
     /* A dummy async version of the send_request method. Since QtBridge is
     single process, this method indeed waits for the reply but presents
     a deferred API so that the AsyncClient can use it. Mainly for testing
@@ -10965,7 +11771,7 @@ jigna.QtBridge.prototype.send_request_async = function(jsonized_request) {
 
     var deferred = new $.Deferred();
 
-    deferred.resolve(this._qt_bridge.handle_request(jsonized_request));
+    deferred.resolve(this.send_request(request));
 
     return deferred.promise();
 };
@@ -10994,53 +11800,67 @@ jigna.WebBridge = function(client) {
         this._request_ids.push(index);
     }
 
+    // Binary messages hold the data of NumPy arrays and are always sent just
+    // before the (text) message that uses them...
+    this._buffers = [];
+
+    // ... unless the server uses a binary wire format (it tells us which one
+    // as soon as we connect).
+    this._format = 'json';
+
     this._web_socket = new WebSocket(url);
+    this._web_socket.binaryType = 'arraybuffer';
     this.ready = new $.Deferred();
     var bridge = this;
     this._web_socket.onopen = function() {
         bridge.ready.resolve();
     };
     this._web_socket.onmessage = function(event) {
-        bridge.handle_event(event.data);
+        if (!(event.data instanceof ArrayBuffer)) {
+            bridge.handle_message(event.data);
+        }
+        else if (bridge._format === 'msgpack') {
+            bridge._dispatch_message(jigna.msgpack.decode(event.data));
+        }
+        else {
+            bridge._buffers.push(event.data);
+        }
     };
 };
 
-jigna.WebBridge.prototype.handle_event = function(jsonized_event) {
-    /* Handle an event from the server. */
-    var response = JSON.parse(jsonized_event);
-    var request_id = response[0];
-    var jsonized_response = response[1];
-    if (request_id === -1) {
-        this._client.handle_event(jsonized_response);
-    }
-    else {
-        var deferred = this._pop_deferred_request(request_id);
-        deferred.resolve(jsonized_response);
-    }
+jigna.WebBridge.prototype.handle_message = function(jsonized_message) {
+    /* Handle a message from the server. */
+    var buffers = this._buffers;
+    this._buffers = [];
+
+    this._dispatch_message(
+        this._client.parse_message(jsonized_message, buffers)
+    );
 };
 
-jigna.WebBridge.prototype.send_request = function(jsonized_request) {
+jigna.WebBridge.prototype.send_request = function(request) {
     /* Send a request to the server and wait for the reply. */
 
     var jsonized_response;
 
     $.ajax(
         {
-            url     : '/_jigna',
-            type    : 'GET',
-            data    : {'data': jsonized_request},
-            success : function(result) {jsonized_response = result;},
-            error   : function(status, error) {
-                          console.warning("Error: " + error);
-                      },
-            async   : false
+            url      : '/_jigna',
+            type     : 'GET',
+            data     : {'data': jigna.jsonize_message(request, null)},
+            dataType : 'text',
+            success  : function(result) {jsonized_response = result;},
+            error    : function(status, error) {
+                           console.warning("Error: " + error);
+                       },
+            async    : false
         }
     );
 
-    return jsonized_response;
+    return this._client.parse_message(jsonized_response).payload;
 };
 
-jigna.WebBridge.prototype.send_request_async = function(jsonized_request) {
+jigna.WebBridge.prototype.send_request_async = function(request) {
     /* Send a request to the server and do not wait and return a Promise
        which is resolved upon completion of the request.
     */
@@ -11049,13 +11869,29 @@ jigna.WebBridge.prototype.send_request_async = function(jsonized_request) {
     var request_id = this._push_deferred_request(deferred);
     var bridge = this;
     this.ready.done(function() {
-        bridge._web_socket.send(JSON.stringify([request_id, jsonized_request]));
+        bridge._web_socket.send(jigna.jsonize_message(request, request_id));
     });
     return deferred.promise();
 };
 
 //// Private protocol /////////////////////////////////////////////////////
 
+jigna.WebBridge.prototype._dispatch_message = function(message) {
+    /* Dispatch a (decoded) message from the server. */
+
+    if (message.kind === 'serializer') {
+        this._format = message.payload;
+    }
+    else if (message.kind === 'response') {
+        if (message.id in this._deferred_requests) {
+            this._pop_deferred_request(message.id).resolve(message.payload);
+        }
+    }
+    else {
+        this._client.handle_message(message);
+    }
+};
+
 jigna.WebBridge.prototype._pop_deferred_request = function(request_id) {
     var deferred = this._deferred_requests[request_id];
     delete this._deferred_requests[request_id];
@@ -11080,9 +11916,12 @@ jigna.WebBridge.prototype._push_deferred_request = function(deferred) {
 // to get the observer and call its `dep.notify()`, this makes
 // everything work really well.
 jigna.add_listener('jigna', 'object_changed', function (event) {
-    var obj = event.object;
-    if (obj && obj.__ob__) {
-        obj.__ob__.dep.notify();
+    var objects = event.objects || [event.object];
+    for (var index=0; index < objects.length; index++) {
+        var obj = objects[index];
+        if (obj && obj.__ob__) {
+            obj.__ob__.dep.notify();
+        }
     }
 });
 
@@ -9,14 +9,22 @@ jigna.AsyncClient.prototype = Object.create(jigna.Client.prototype);
 jigna.AsyncClient.prototype.constructor = jigna.AsyncClient;
 
 jigna.AsyncClient.prototype.send_request = function(request) {
-    /* Send a request to the server and wait for (and return) the response. */
-
-    var jsonized_request  = JSON.stringify(request);
+    /* Send a request to the server and return a promise of the response.
+     *
+     * The requests made while handling the same event (e.g. all the
+     * attributes fetched during an Angular digest cycle) are sent together
+     * as a single 'batch' request.
+     */
 
     var deferred = new $.Deferred();
-    this.bridge.send_request_async(jsonized_request).done(function(jsonized_response){
-        deferred.resolve(JSON.parse(jsonized_response).result);
-    });
+
+    if (this._queued_requests === undefined) {
+        this._queued_requests = [];
+
+        var client = this;
+        setTimeout(function() {client._send_queued_requests();}, 0);
+    }
+    this._queued_requests.push({request : request, deferred : deferred});
 
     return deferred.promise();
 };
@@ -45,13 +53,16 @@ jigna.AsyncClient.prototype.call_instance_method = function(id, method_name, arg
     return deferred.promise();
 };
 
-jigna.AsyncClient.prototype.call_instance_method_thread = function(id, method_name, args) {
+jigna.AsyncClient.prototype.call_instance_method_thread = function(id, method_name, args, kind) {
     /* Calls an instance method in a thread on the server. Use this to call
     any long running method on the server otherwise you won't get any UI
     updates on the client.
+
+    The progress callbacks of the returned promise are called with the
+    progress and info of the method's future (see 'Future.progress').
     */
     var request = {
-        kind        : 'call_instance_method_thread',
+        kind        : kind || 'call_instance_method_thread',
         id          : id,
         method_name : method_name,
         args        : this._marshal_all(args),
@@ -63,10 +74,11 @@ jigna.AsyncClient.prototype.call_instance_method_thread = function(id, method_na
     // This is done to make this similar to the sync client so that the users
     // can attach their handlers when the method is done.
     var deferred = new $.Deferred();
+    var future_obj, cancel_requested = false;
 
     this.send_request(request).done(function(response){
 
-        var future_obj = client._unmarshal(response);
+        future_obj = client._unmarshal(response);
         // the response of a threaded request is a marshalled version of a python
         // future object. We attach 'done' and 'error' handlers on that object to
         // resolve/reject our own deferred.
@@ -79,6 +91,57 @@ jigna.AsyncClient.prototype.call_instance_method_thread = function(id, method_na
             deferred.reject(event.data);
         });
 
+        jigna.add_listener(future_obj, 'progress', function(event){
+            deferred.notify(event.data.progress, event.data.info);
+        });
+
+        jigna.add_listener(future_obj, 'cancelled', function(event){
+            deferred.reject('cancelled');
+        });
+
+        if (cancel_requested) {
+            client.cancel_future(future_obj);
+        }
+
+    });
+
+    // The deferred is rejected with 'cancelled' once the server has
+    // cancelled the call. If the call hasn't been started yet, it is
+    // cancelled as soon as it is.
+    var promise = deferred.promise();
+    promise.cancel = function() {
+        if (future_obj === undefined) {
+            cancel_requested = true;
+            return;
+        }
+
+        return client.cancel_future(future_obj);
+    };
+
+    return promise;
+};
+
+jigna.AsyncClient.prototype.call_instance_method_process = function(id, method_name, args) {
+    /* Call an instance method in a worker process on the server. This is
+    the same as 'call_instance_method_thread' but for CPU bound methods. */
+
+    return this.call_instance_method_thread(
+        id, method_name, args, 'call_instance_method_process'
+    );
+};
+
+jigna.AsyncClient.prototype.cancel_future = function(future_id) {
+    /* Cancel a method called in a thread on the server. */
+
+    var request = {
+        kind      : 'cancel_future',
+        future_id : future_id
+    };
+    var client = this;
+
+    var deferred = new $.Deferred();
+    this.send_request(request).done(function(response){
+        deferred.resolve(client._unmarshal(response));
     });
 
     return deferred.promise();
@@ -112,6 +175,22 @@ jigna.AsyncClient.prototype.get_attribute = function(proxy, attribute) {
     return proxy.__cache__[attribute];
 };
 
+jigna.AsyncClient.prototype.get_slice = function(proxy, start, stop) {
+    /* Get a slice of the items of a list proxy from the server.
+     *
+     * The promise is resolved with the marshalled items.
+     */
+
+    var request = {
+        kind  : 'get_slice',
+        id    : proxy.__id__,
+        start : start,
+        stop  : stop
+    };
+
+    return this.send_request(request);
+};
+
 jigna.AsyncClient.prototype.on_object_changed = function(event){
     if (jigna.debug) {
         this.print_JS_message('------------on_object_changed--------------');
@@ -154,17 +233,18 @@ jigna.AsyncClient.prototype.on_object_changed = function(event){
             collection_proxy = proxy.__cache__[event.name];
             this._id_to_proxy_map[event.data.value] = collection_proxy;
         }
+        this._retain_data(event.data);
         this._proxy_factory.update_proxy(
             collection_proxy, event.data.type, event.data.info
         );
 
     } else {
-        proxy.__cache__[event.name] = this._unmarshal(event.data);
+        this._replace_cached_value(proxy, event.name, event.data);
     }
 
     // Angular listens to this event and forces a digest cycle which is how it
     // detects changes in its watchers.
-    jigna.fire_event('jigna', {name: 'object_changed', object: proxy});
+    this._fire_object_changed(proxy);
 };
 
 // Private protocol //////////////////////////////////////////////////////////
@@ -172,3 +252,49 @@ jigna.AsyncClient.prototype.on_object_changed = function(event){
 jigna.AsyncClient.prototype._create_proxy_factory = function() {
     return new jigna.AsyncProxyFactory(this);
 };
+
+jigna.AsyncClient.prototype._send_queued_requests = function() {
+    /* Send the queued requests (as a batch if there is more than one). */
+
+    var queued = this._queued_requests;
+    this._queued_requests = undefined;
+
+    var settle = function(deferred, response) {
+        if (response.exception) {
+            deferred.reject(response.exception);
+        } else {
+            deferred.resolve(response.result);
+        }
+    };
+
+    var reject_all = function(error) {
+        for (var index=0; index < queued.length; index++) {
+            queued[index].deferred.reject(error);
+        }
+    };
+
+    if (queued.length === 1) {
+        this.bridge.send_request_async(queued[0].request).done(
+            function(response) {settle(queued[0].deferred, response);}
+        ).fail(reject_all);
+        return;
+    }
+
+    var request = {
+        kind     : 'batch',
+        requests : queued.map(function(item) {return item.request;})
+    };
+    this.bridge.send_request_async(request).done(function(response) {
+        // If the batch itself failed then so did every request in it,
+        // otherwise each request succeeds or fails on its own.
+        if (response.exception) {
+            reject_all(response.exception);
+            return;
+        }
+
+        var responses = response.result || [];
+        for (var index=0; index < queued.length; index++) {
+            settle(queued[index].deferred, responses[index] || {});
+        }
+    }).fail(reject_all);
+};
@@ -9,6 +9,16 @@ jigna._SavedData = function(data) {
 
 jigna.AsyncProxyFactory = function(client) {
     jigna.ProxyFactory.call(this, client);
+
+    // jigna.AsyncProxyFactory protocol.
+
+    // The maximum number of pages of (windowed) list proxies that are cached.
+    this.max_cached_pages = 100;
+
+    // Private protocol.
+
+    // The cached pages, least recently used first.
+    this._pages = [];
 };
 
 jigna.AsyncProxyFactory.prototype = Object.create(
@@ -86,12 +96,28 @@ jigna.AsyncProxyFactory.prototype._update_dict_proxy = function(proxy, info) {
 };
 
 jigna.AsyncProxyFactory.prototype._populate_list_proxy = function(proxy, info) {
-    /* Populate the items in a list proxy. */
+    /* Populate the items in a list proxy.
+     *
+     * For a long list the server only sends the first page of items and the
+     * other pages are fetched when they are first accessed.
+     */
 
     var data = info.data;
     for (var index=0; index < info.length; index++) {
         this._add_item_attribute(proxy, index);
-        proxy.__cache__[index] = new jigna._SavedData(data[index]);
+        proxy.__cache__[index] = this._saved_data(data, index);
+    }
+
+    if (info.page_size !== undefined) {
+        Object.defineProperty(
+            proxy, '__page_size__', {value : info.page_size}
+        );
+        // Bumped whenever the list is spliced, so that pages requested
+        // before the splice are not stored at the wrong indices.
+        Object.defineProperty(
+            proxy, '__generation__', {value : 0, writable : true}
+        );
+        this._touch_page(proxy, 0);
     }
 
     return proxy;
@@ -126,14 +152,15 @@ jigna.AsyncProxyFactory.prototype._update_list_proxy = function(proxy, info) {
             // When nothing is removed, just update the cache entries.
             for (var i=0; i < added.length; i++) {
                 index = info.start + i*info.step;
-                cache[index] = new jigna._SavedData(added.data[i]);
+                cache[index] = this._saved_data(added.data, i);
             }
         }
     } else {
         // This is not an extended slice.
-        var splice_args = [info.index, info.removed].concat(
-            info.added.data.map(function(x) {return new jigna._SavedData(x);})
-        );
+        var splice_args = [info.index, info.removed];
+        for (var i=0; i < info.added.length; i++) {
+            splice_args.push(this._saved_data(info.added.data, i));
+        }
 
         var extra = splice_args.length - 2 - splice_args[1];
         var cache = proxy.__cache__;
@@ -149,6 +176,10 @@ jigna.AsyncProxyFactory.prototype._update_list_proxy = function(proxy, info) {
         }
         cache.splice.apply(cache, splice_args);
     }
+
+    if (proxy.__page_size__ !== undefined) {
+        this._on_list_spliced(proxy);
+    }
 };
 
 
@@ -156,13 +187,18 @@ jigna.AsyncProxyFactory.prototype._update_list_proxy = function(proxy, info) {
 
 jigna.AsyncProxyFactory.prototype._add_item_attribute = function(proxy, index){
     var descriptor, get, set;
+    var factory = this;
 
     get = function() {
         // In here, 'this' refers to the proxy!
         var value = this.__cache__[index];
         if (value === undefined) {
-            value = this.__client__.get_attribute(this, index);
-            this.__cache__[index] = value;
+            if (this.__page_size__ !== undefined) {
+                factory._load_page(this, Math.floor(index/this.__page_size__));
+            } else {
+                value = this.__client__.get_attribute(this, index);
+                this.__cache__[index] = value;
+            }
         } else if (value instanceof jigna._SavedData) {
             value = this.__client__._unmarshal(value.data);
             this.__cache__[index] = value;
@@ -180,3 +216,130 @@ jigna.AsyncProxyFactory.prototype._add_item_attribute = function(proxy, index){
     descriptor = {enumerable:true, get:get, set:set, configurable:true};
     Object.defineProperty(proxy, index, descriptor);
 };
+
+jigna.AsyncProxyFactory.prototype._saved_data = function(data, index) {
+    /* Return the saved data for an item (undefined if it wasn't sent). */
+
+    if (index < data.length) {
+        return new jigna._SavedData(data[index]);
+    }
+};
+
+// Windowed list proxies ///////////////////////////////////////////////////////
+
+jigna.AsyncProxyFactory.prototype._evict_page = function(proxy, page) {
+    /* Remove the items of a page from the cache of a list proxy. */
+
+    var cache = proxy.__cache__;
+    var start = page * proxy.__page_size__;
+    var stop = Math.min(start + proxy.__page_size__, cache.length);
+
+    for (var index=start; index < stop; index++) {
+        if (cache[index] instanceof jigna._SavedData) {
+            this._client._release_data(cache[index].data);
+        } else {
+            this._client._release(cache[index]);
+        }
+        cache[index] = undefined;
+    }
+};
+
+jigna.AsyncProxyFactory.prototype._load_page = function(proxy, page) {
+    /* Fetch a page of items of a list proxy from the server. */
+
+    // While the page is being fetched its state is the generation of the
+    // list that it was requested for.
+    var state = 'page ' + page;
+    var generation = proxy.__generation__;
+    if (proxy.__state__[state] === generation) {
+        return;
+    }
+    proxy.__state__[state] = generation;
+
+    var factory = this;
+    var client = this._client;
+    var start = page * proxy.__page_size__;
+    var stop = start + proxy.__page_size__;
+    var clear_state = function() {
+        if (proxy.__state__[state] === generation) {
+            proxy.__state__[state] = undefined;
+        }
+    };
+
+    client.get_slice(proxy, start, stop).done(function(data) {
+        clear_state();
+
+        // The request failed.
+        if (!data) {
+            return;
+        }
+
+        // The list was spliced while the page was being fetched so the items
+        // may no longer be at these indices (the page is fetched again when
+        // it is next accessed).
+        if (proxy.__generation__ !== generation) {
+            for (var index=0; index < data.length; index++) {
+                client._release_data(data[index]);
+            }
+            return;
+        }
+
+        var cache = proxy.__cache__;
+        for (var index=0; index < data.length; index++) {
+            if (start + index < cache.length) {
+                cache[start + index] = new jigna._SavedData(data[index]);
+            } else {
+                client._release_data(data[index]);
+            }
+        }
+        factory._touch_page(proxy, page);
+
+        jigna.fire_event('jigna', {name: 'object_changed', object: proxy});
+    }).fail(clear_state);
+};
+
+jigna.AsyncProxyFactory.prototype._on_list_spliced = function(proxy) {
+    /* Called when the items of a windowed list proxy have been spliced.
+     *
+     * The items have moved, so pages that are being fetched are dropped when
+     * they arrive and the cached pages are recorded again from the items that
+     * are now in the cache.
+     */
+
+    proxy.__generation__ += 1;
+
+    this._pages = this._pages.filter(function(item) {
+        return item.proxy !== proxy;
+    });
+
+    var cache = proxy.__cache__;
+    var page_size = proxy.__page_size__;
+    for (var page=0; page * page_size < cache.length; page++) {
+        var stop = Math.min((page + 1) * page_size, cache.length);
+        for (var index=page * page_size; index < stop; index++) {
+            if (cache[index] !== undefined) {
+                this._touch_page(proxy, page);
+                break;
+            }
+        }
+    }
+};
+
+jigna.AsyncProxyFactory.prototype._touch_page = function(proxy, page) {
+    /* Mark a page of a list proxy as the most recently used one, evicting
+    the least recently used pages if there are too many. */
+
+    var pages = this._pages;
+    for (var index=0; index < pages.length; index++) {
+        if (pages[index].proxy === proxy && pages[index].page === page) {
+            pages.splice(index, 1);
+            break;
+        }
+    }
+    pages.push({proxy : proxy, page : page});
+
+    while (pages.length > this.max_cached_pages) {
+        var oldest = pages.shift();
+        this._evict_page(oldest.proxy, oldest.page);
+    }
+};
@@ -10,6 +10,8 @@ jigna.Client.prototype.initialize = function() {
 
     // Private protocol.
     this._id_to_proxy_map = {};
+    this._id_to_count     = {};
+    this._released        = undefined;
     this._proxy_factory   = this._create_proxy_factory();
 
     // Add all of the models being edited
@@ -28,12 +30,49 @@ jigna.Client.prototype.initialize = function() {
     });
 };
 
-jigna.Client.prototype.handle_event = function(jsonized_event) {
+jigna.Client.prototype.handle_event = function(event) {
     /* Handle an event from the server. */
-    var event = JSON.parse(jsonized_event);
     jigna.fire_event(event.obj, event);
 };
 
+jigna.Client.prototype.handle_events = function(events) {
+    /* Handle a batch of events from the server.
+     *
+     * Listeners of the 'object_changed' event are notified only once for the
+     * whole batch (with all the changed objects) instead of once per event.
+     */
+    var changed_objects = [];
+
+    this._changed_objects = changed_objects;
+    try {
+        for (var index=0; index < events.length; index++) {
+            jigna.fire_event(events[index].obj, events[index]);
+        }
+    }
+    finally {
+        this._changed_objects = undefined;
+    }
+
+    if (changed_objects.length > 0) {
+        jigna.fire_event('jigna', {
+            name    : 'object_changed',
+            object  : changed_objects[changed_objects.length - 1],
+            objects : changed_objects
+        });
+    }
+};
+
+jigna.Client.prototype.handle_message = function(message) {
+    /* Handle an 'event' or 'events' (a batch of events) message. */
+
+    if (message.kind === 'events') {
+        this.handle_events(message.payload);
+    }
+    else {
+        this.handle_event(message.payload);
+    }
+};
+
 jigna.Client.prototype.on_object_changed = function(event){
     if (jigna.debug) {
         this.print_JS_message('------------on_object_changed--------------');
@@ -73,29 +112,48 @@ jigna.Client.prototype.on_object_changed = function(event){
             proxy.__cache__[event.name] = this._create_proxy(
                 event.data.type, event.data.value, event.data.info
             );
+            this._retain_data(event.data);
 
         } else {
+            this._retain_data(event.data);
             this._proxy_factory.update_proxy(
                 collection_proxy, event.data.type, event.data.info
             );
         }
 
     } else {
-        proxy.__cache__[event.name] = this._unmarshal(event.data);
+        this._replace_cached_value(proxy, event.name, event.data);
     }
 
     // Angular listens to this event and forces a digest cycle which is how it
     // detects changes in its watchers.
-    jigna.fire_event('jigna', {name: 'object_changed', object: proxy});
+    this._fire_object_changed(proxy);
+};
+
+jigna.Client.prototype.parse_message = function(jsonized_message, buffers) {
+    /* Parse a message from the server.
+     *
+     * 'buffers' are the binary buffers (if any) received with the message.
+     * The values of any NumPy arrays in the message are the indices of the
+     * buffers that hold their data, so we replace them with the buffers.
+     */
+
+    if (buffers === undefined || buffers.length === 0) {
+        return JSON.parse(jsonized_message);
+    }
+
+    return JSON.parse(jsonized_message, function(key, value) {
+        if (value !== null && value.type === 'ndarray') {
+            value.value = buffers[value.value];
+        }
+        return value;
+    });
 };
 
 jigna.Client.prototype.send_request = function(request) {
     /* Send a request to the server and wait for (and return) the response. */
 
-    var jsonized_request  = JSON.stringify(request);
-    var jsonized_response = this.bridge.send_request(jsonized_request);
-
-    return JSON.parse(jsonized_response).result;
+    return this.bridge.send_request(request).result;
 };
 
 // Convenience methods for each kind of request //////////////////////////////
@@ -116,34 +174,45 @@ jigna.Client.prototype.call_instance_method = function(id, method_name, args) {
     return result;
 };
 
-jigna.Client.prototype.call_instance_method_thread = function(id, method_name, args) {
+jigna.Client.prototype.call_instance_method_thread = function(id, method_name, args, kind) {
     /* Call an instance method in a thread. Useful if the method takes long to
-    execute and you don't want to block the UI during that time.*/
+    execute and you don't want to block the UI during that time.
+
+    The progress callbacks of the returned promise are called with the
+    progress and info of the method's future (see 'Future.progress').*/
 
     var request = {
-        kind        : 'call_instance_method_thread',
+        kind        : kind || 'call_instance_method_thread',
         id          : id,
         method_name : method_name,
         args        : this._marshal_all(args),
     };
 
     // the response of a threaded request is a marshalled version of a python
-    // future object. We attach 'done' and 'error' handlers on that object to
-    // resolve/reject our own deferred.
+    // future object.
     var response = this.send_request(request);
-    var future_obj = this._unmarshal(response);
 
-    var deferred = new $.Deferred();
+    return this._create_future_promise(this._unmarshal(response));
+};
 
-    jigna.add_listener(future_obj, 'done', function(event){
-        deferred.resolve(event.data);
-    });
+jigna.Client.prototype.call_instance_method_process = function(id, method_name, args) {
+    /* Call an instance method in a worker process on the server. This is
+    the same as 'call_instance_method_thread' but for CPU bound methods. */
 
-    jigna.add_listener(future_obj, 'error', function(event){
-        deferred.reject(event.data);
-    });
+    return this.call_instance_method_thread(
+        id, method_name, args, 'call_instance_method_process'
+    );
+};
+
+jigna.Client.prototype.cancel_future = function(future_id) {
+    /* Cancel a method called in a thread. */
 
-    return deferred.promise();
+    var request = {
+        kind      : 'cancel_future',
+        future_id : future_id
+    };
+
+    return this._unmarshal(this.send_request(request));
 };
 
 jigna.Client.prototype.get_attribute = function(proxy, attribute) {
@@ -157,6 +226,31 @@ jigna.Client.prototype.get_attribute = function(proxy, attribute) {
     return result;
 };
 
+jigna.Client.prototype.get_items = function(proxy, items) {
+    /* Get several items of a list/dict proxy from the server.
+     *
+     * 'items' is either {keys: [...]} or (for a list) {start: n, stop: m},
+     * which is fetched as a slice.
+     */
+
+    var request;
+    if (items.keys !== undefined) {
+        request = {kind : 'get_items', id : proxy.__id__, keys : items.keys};
+    } else {
+        request = {
+            kind  : 'get_slice',
+            id    : proxy.__id__,
+            start : items.start,
+            stop  : items.stop
+        };
+    }
+
+    var response = this.send_request(request);
+
+    var client = this;
+    return response.map(function(value) {return client._unmarshal(value);});
+};
+
 jigna.Client.prototype.print_JS_message = function(message) {
     var request = {
         kind: 'print_JS_message',
@@ -218,6 +312,7 @@ jigna.Client.prototype._add_models = function(context) {
     $.each(context, function(model_name, model) {
         if (jigna.models[model_name] === undefined) {
             proxy = client._add_model(model_name, model.value, model.info);
+            client._retain_data(model);
             models[model_name] = proxy;
         }
     });
@@ -230,6 +325,45 @@ jigna.Client.prototype._add_models = function(context) {
     return models;
 };
 
+jigna.Client.prototype._create_future_promise = function(future_id, marshalled) {
+    /* Return a promise for the outcome of a future on the server.
+     *
+     * The server sends 'done', 'error', 'progress' and 'cancelled' events for
+     * the future, which resolve/reject/notify the promise. The promise can be
+     * cancelled (the deferred is rejected with 'cancelled' once the server has
+     * cancelled the call). If 'marshalled' is true then the result in the
+     * 'done' event is unmarshalled.
+     */
+
+    var client = this;
+    var deferred = new $.Deferred();
+
+    jigna.add_listener(future_id, 'done', function(event){
+        deferred.resolve(
+            marshalled ? client._unmarshal(event.data) : event.data
+        );
+    });
+
+    jigna.add_listener(future_id, 'error', function(event){
+        deferred.reject(event.data);
+    });
+
+    jigna.add_listener(future_id, 'progress', function(event){
+        deferred.notify(event.data.progress, event.data.info);
+    });
+
+    jigna.add_listener(future_id, 'cancelled', function(event){
+        deferred.reject('cancelled');
+    });
+
+    var promise = deferred.promise();
+    promise.cancel = function() {
+        return client.cancel_future(future_id);
+    };
+
+    return promise;
+};
+
 jigna.Client.prototype._create_proxy_factory = function() {
     return new jigna.ProxyFactory(this);
 };
@@ -266,6 +400,25 @@ jigna.Client.prototype._create_request = function(proxy, attribute) {
     return request;
 };
 
+jigna.Client.prototype._fire_object_changed = function(proxy) {
+    /* Fire the 'object_changed' event for the given proxy.
+     *
+     * While a batch of events is being handled, the proxy is just collected
+     * and the event is fired once the whole batch has been handled.
+     */
+
+    if (this._changed_objects !== undefined) {
+        if (this._changed_objects.indexOf(proxy) === -1) {
+            this._changed_objects.push(proxy);
+        }
+        return;
+    }
+
+    jigna.fire_event('jigna', {
+        name: 'object_changed', object: proxy, objects: [proxy]
+    });
+};
+
 jigna.Client.prototype._get_bridge = function() {
     var bridge, qt_bridge;
 
@@ -281,6 +434,19 @@ jigna.Client.prototype._get_bridge = function() {
     return bridge;
 };
 
+jigna.Client.prototype._create_ndarray = function(data, info) {
+    /* Create a typed array from the data (an ArrayBuffer or a flat Array)
+    of a NumPy array. */
+
+    var constructor = this._typed_array_constructors[info.dtype];
+    var array = new constructor(data);
+
+    // Typed arrays are always flat, so we keep the shape around.
+    Object.defineProperty(array, 'shape', {value : info.shape});
+
+    return array;
+};
+
 jigna.Client.prototype._marshal = function(obj) {
     var type, value;
 
@@ -288,6 +454,10 @@ jigna.Client.prototype._marshal = function(obj) {
         type  = obj.__type__;
         value = obj.__id__;
 
+    } else if (ArrayBuffer.isView(obj)) {
+        type  = 'primitive';
+        value = Array.prototype.slice.call(obj);
+
     } else {
         type  = 'primitive';
         value = obj;
@@ -307,6 +477,104 @@ jigna.Client.prototype._marshal_all = function(objs) {
     return objs;
 };
 
+jigna.Client.prototype._release = function(value) {
+    /* Release the server side object of a proxy that has been dropped.
+     *
+     * The server keeps (pins) an object alive for as long as a client may
+     * have a proxy for it. Each time the server sends an object it increments
+     * the object's pin count, so we tell it how many times we received the
+     * object. The releases are sent in a single request once the current
+     * event(s) have been handled.
+     */
+
+    if (value === null || typeof value !== 'object' || value.__id__ === undefined) {
+        return;
+    }
+
+    var id = value.__id__;
+    var count = this._id_to_count[id];
+    if (count === undefined) {
+        return;
+    }
+    delete this._id_to_count[id];
+
+    this._queue_release(id, count);
+};
+
+jigna.Client.prototype._release_data = function(data) {
+    /* Release the server side object of marshalled data that was received
+    but is dropped without ever being unmarshalled. */
+
+    if (data.pinned === false) {
+        return;
+    }
+
+    if (data.type === 'list' || data.type === 'dict' || data.type === 'instance') {
+        this._queue_release(data.value, 1);
+    }
+};
+
+jigna.Client.prototype._queue_release = function(id, count) {
+    /* Queue the release of an object received 'count' times. */
+
+    if (this._released === undefined) {
+        this._released = {};
+
+        var client = this;
+        setTimeout(function() {
+            var request = {
+                kind : 'release_objects', ids : client._released
+            };
+            client._released = undefined;
+            client.bridge.send_request_async(request);
+        }, 0);
+    }
+    this._released[id] = (this._released[id] || 0) + count;
+};
+
+jigna.Client.prototype._replace_cached_value = function(proxy, name, data) {
+    /* Replace the cached value of an attribute with the marshalled data from
+    the server, releasing the old value if it was a proxy. */
+
+    var old_value = proxy.__cache__[name];
+    var value = this._unmarshal(data);
+
+    proxy.__cache__[name] = value;
+    if (old_value !== value) {
+        this._release(old_value);
+    }
+};
+
+jigna.Client.prototype._retain = function(id) {
+    /* Count a proxy's object being received from the server. */
+
+    this._id_to_count[id] = (this._id_to_count[id] || 0) + 1;
+};
+
+jigna.Client.prototype._retain_data = function(data) {
+    /* Count the object of marshalled data being received from the server.
+     *
+     * The objects in events are sent to every client so the server doesn't
+     * pin them (they are marked with 'pinned: false'), and we must not
+     * release them.
+     */
+
+    if (data.pinned !== false) {
+        this._retain(data.value);
+    }
+};
+
+jigna.Client.prototype._typed_array_constructors = {
+    'float32' : Float32Array,
+    'float64' : Float64Array,
+    'int8'    : Int8Array,
+    'int16'   : Int16Array,
+    'int32'   : Int32Array,
+    'uint8'   : Uint8Array,
+    'uint16'  : Uint16Array,
+    'uint32'  : Uint32Array
+};
+
 jigna.Client.prototype._unmarshal = function(obj) {
 
     if (obj === null) {
@@ -316,13 +584,20 @@ jigna.Client.prototype._unmarshal = function(obj) {
     if (obj.type === 'primitive') {
         return obj.value;
 
+    } else if (obj.type === 'ndarray') {
+        return this._create_ndarray(obj.value, obj.info);
+
+    } else if (obj.type === 'future') {
+        // A coroutine method that is run as a future on the server, its
+        // result is marshalled.
+        return this._create_future_promise(obj.value, true);
+
     } else {
         value = this._id_to_proxy_map[obj.value];
         if (value === undefined) {
-            return this._create_proxy(obj.type, obj.value, obj.info);
-        }
-        else {
-            return value;
+            value = this._create_proxy(obj.type, obj.value, obj.info);
         }
+        this._retain_data(obj);
+        return value;
     }
 };
@@ -5,8 +5,11 @@
 // to get the observer and call its `dep.notify()`, this makes
 // everything work really well.
 jigna.add_listener('jigna', 'object_changed', function (event) {
-    var obj = event.object;
-    if (obj && obj.__ob__) {
-        obj.__ob__.dep.notify();
+    var objects = event.objects || [event.object];
+    for (var index=0; index < objects.length; index++) {
+        var obj = objects[index];
+        if (obj && obj.__ob__) {
+            obj.__ob__.dep.notify();
+        }
     }
 });
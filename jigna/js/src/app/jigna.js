@@ -17,6 +17,16 @@ jigna.initialize = function(options) {
 
 jigna.models = {};
 
+// The version of the message envelope used between the server and clients.
+jigna.PROTOCOL_VERSION = 1;
+
+jigna.jsonize_message = function(payload, id) {
+    /* Serialize a request in the message envelope expected by the server. */
+    return JSON.stringify(
+        {version: jigna.PROTOCOL_VERSION, id: id, payload: payload}
+    );
+};
+
 jigna.add_listener('jigna', 'model_added', function(event){
     var models = event.data;
     for (var model_name in models) {
@@ -30,3 +40,8 @@ jigna.threaded = function(obj, method_name, args) {
     args = Array.prototype.slice.call(arguments, 2);
     return this.client.call_instance_method_thread(obj.__id__, method_name, args);
 };
+
+jigna.in_process = function(obj, method_name, args) {
+    args = Array.prototype.slice.call(arguments, 2);
+    return this.client.call_instance_method_process(obj.__id__, method_name, args);
+};
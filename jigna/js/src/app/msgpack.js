@@ -0,0 +1,168 @@
+///////////////////////////////////////////////////////////////////////////////
+// MessagePack
+///////////////////////////////////////////////////////////////////////////////
+
+// A minimal MessagePack decoder for the messages sent by a server using the
+// 'msgpack' serializer. 'bin' values (the raw data of NumPy arrays) are
+// decoded as ArrayBuffers so that typed arrays can be created from them.
+
+jigna.msgpack = {};
+
+jigna.msgpack.decode = function(buffer) {
+    /* Decode the MessagePack encoded ArrayBuffer. */
+
+    var decoder = new jigna.msgpack.Decoder(buffer);
+    return decoder.decode();
+};
+
+jigna.msgpack.Decoder = function(buffer) {
+    this._bytes  = new Uint8Array(buffer);
+    this._view   = new DataView(buffer);
+    this._offset = 0;
+};
+
+jigna.msgpack.Decoder.prototype.decode = function() {
+    var type = this._bytes[this._offset++];
+
+    // positive fixint
+    if (type < 0x80) {
+        return type;
+    }
+    // fixmap
+    if (type < 0x90) {
+        return this._map(type & 0x0f);
+    }
+    // fixarray
+    if (type < 0xa0) {
+        return this._array(type & 0x0f);
+    }
+    // fixstr
+    if (type < 0xc0) {
+        return this._str(type & 0x1f);
+    }
+    // negative fixint
+    if (type > 0xdf) {
+        return type - 0x100;
+    }
+
+    var view = this._view;
+    var value;
+    switch (type) {
+        case 0xc0: return null;
+        case 0xc2: return false;
+        case 0xc3: return true;
+
+        case 0xc4: return this._bin(this._uint(1));
+        case 0xc5: return this._bin(this._uint(2));
+        case 0xc6: return this._bin(this._uint(4));
+
+        case 0xca:
+            value = view.getFloat32(this._offset);
+            this._offset += 4;
+            return value;
+        case 0xcb:
+            value = view.getFloat64(this._offset);
+            this._offset += 8;
+            return value;
+
+        case 0xcc: return this._uint(1);
+        case 0xcd: return this._uint(2);
+        case 0xce: return this._uint(4);
+        case 0xcf: return this._uint(4) * 0x100000000 + this._uint(4);
+
+        case 0xd0:
+            value = view.getInt8(this._offset);
+            this._offset += 1;
+            return value;
+        case 0xd1:
+            value = view.getInt16(this._offset);
+            this._offset += 2;
+            return value;
+        case 0xd2:
+            value = view.getInt32(this._offset);
+            this._offset += 4;
+            return value;
+        case 0xd3:
+            value = view.getInt32(this._offset) * 0x100000000
+                    + view.getUint32(this._offset + 4);
+            this._offset += 8;
+            return value;
+
+        case 0xd9: return this._str(this._uint(1));
+        case 0xda: return this._str(this._uint(2));
+        case 0xdb: return this._str(this._uint(4));
+
+        case 0xdc: return this._array(this._uint(2));
+        case 0xdd: return this._array(this._uint(4));
+
+        case 0xde: return this._map(this._uint(2));
+        case 0xdf: return this._map(this._uint(4));
+    }
+
+    throw 'cannot decode MessagePack type: 0x' + type.toString(16);
+};
+
+// Private protocol ////////////////////////////////////////////////////////////
+
+jigna.msgpack.Decoder.prototype._array = function(length) {
+    var array = new Array(length);
+    for (var index=0; index < length; index++) {
+        array[index] = this.decode();
+    }
+
+    return array;
+};
+
+jigna.msgpack.Decoder.prototype._bin = function(length) {
+    // Copy the data so that the ArrayBuffer is correctly aligned for any
+    // typed array.
+    var start = this._bytes.byteOffset + this._offset;
+    this._offset += length;
+
+    return this._bytes.buffer.slice(start, start + length);
+};
+
+jigna.msgpack.Decoder.prototype._map = function(length) {
+    var map = {};
+    for (var index=0; index < length; index++) {
+        var key = this.decode();
+        map[key] = this.decode();
+    }
+
+    return map;
+};
+
+jigna.msgpack.Decoder.prototype._str = function(length) {
+    var bytes = this._bytes.subarray(this._offset, this._offset + length);
+    this._offset += length;
+
+    if (window.TextDecoder !== undefined) {
+        return new TextDecoder('utf-8').decode(bytes);
+    }
+
+    // Fallback for browsers (and QtWebKit) without a TextDecoder.
+    var chars = [];
+    for (var index=0; index < bytes.length; index++) {
+        chars.push(String.fromCharCode(bytes[index]));
+    }
+
+    return decodeURIComponent(escape(chars.join('')));
+};
+
+jigna.msgpack.Decoder.prototype._uint = function(size) {
+    var view = this._view;
+    var value;
+
+    if (size === 1) {
+        value = view.getUint8(this._offset);
+    }
+    else if (size === 2) {
+        value = view.getUint16(this._offset);
+    }
+    else {
+        value = view.getUint32(this._offset);
+    }
+    this._offset += size;
+
+    return value;
+};
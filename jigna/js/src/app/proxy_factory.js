@@ -3,6 +3,12 @@
 ///////////////////////////////////////////////////////////////////////////////
 
 jigna.ProxyFactory = function(client) {
+    // jigna.ProxyFactory protocol.
+
+    // The number of list items fetched in a single request when an item that
+    // isn't cached is accessed.
+    this.prefetch_size = 1000;
+
     // Private protocol.
     this._client = client;
 
@@ -222,6 +228,11 @@ jigna.ProxyFactory.prototype._populate_dict_proxy = function(proxy, info) {
     for (index in info.keys) {
         this._add_item_attribute(proxy, info.keys[index]);
     }
+
+    // Keep the keys (with their original types) to prefetch the items.
+    Object.defineProperty(
+        proxy, '__keys__', {value : info.keys, configurable : true}
+    );
 };
 
 jigna.ProxyFactory.prototype._update_dict_proxy = function(proxy, info) {
@@ -275,13 +286,14 @@ jigna.ProxyFactory.prototype._update_list_proxy = function(proxy, info) {
 
 jigna.ProxyFactory.prototype._add_item_attribute = function(proxy, index){
     var descriptor, get, set;
+    var factory = this;
 
     get = function() {
         // In here, 'this' refers to the proxy!
         var value = this.__cache__[index];
         if (value === undefined) {
-            value = this.__client__.get_attribute(this, index);
-            this.__cache__[index] = value;
+            factory._prefetch_items(this, index);
+            value = this.__cache__[index];
         }
 
         return value;
@@ -296,3 +308,37 @@ jigna.ProxyFactory.prototype._add_item_attribute = function(proxy, index){
     descriptor = {enumerable:true, get:get, set:set, configurable:true};
     Object.defineProperty(proxy, index, descriptor);
 };
+
+jigna.ProxyFactory.prototype._prefetch_items = function(proxy, index) {
+    /* Fetch the item at the given index/key of a list/dict proxy along with
+     * the following items of a list (or all other items of a dict) that
+     * aren't cached yet in a single request.
+     */
+
+    var cache = proxy.__cache__;
+    var items, keys, values;
+
+    if (proxy.__type__ === 'list') {
+        items = {
+            start : index,
+            stop  : Math.min(index + this.prefetch_size, proxy.length)
+        };
+        keys = [];
+        for (var key=items.start; key < items.stop; key++) {
+            keys.push(key);
+        }
+    }
+    else {
+        keys = proxy.__keys__.filter(function(key) {
+            return (key == index) || (cache[key] === undefined);
+        });
+        items = {keys : keys};
+    }
+
+    values = this._client.get_items(proxy, items);
+    for (var i=0; i < values.length; i++) {
+        if (cache[keys[i]] === undefined) {
+            cache[keys[i]] = values[i];
+        }
+    }
+};
@@ -9,23 +9,34 @@ jigna.QtBridge = function(client, qt_bridge) {
     this._client    = client;
     this._qt_bridge = qt_bridge;
 
+    // The server pushes messages by emitting the 'message' signal (if it
+    // can), which avoids compiling a script for each message.
+    if (qt_bridge.message !== undefined) {
+        var bridge = this;
+        qt_bridge.message.connect(function(jsonized_message) {
+            bridge.handle_message(jsonized_message);
+        });
+    }
+
     this.ready.resolve();
 };
 
-jigna.QtBridge.prototype.handle_event = function(jsonized_event) {
-    /* Handle an event from the server. */
-    this._client.handle_event(jsonized_event);
+jigna.QtBridge.prototype.handle_message = function(jsonized_message) {
+    /* Handle a message from the server. */
+    this._client.handle_message(this._client.parse_message(jsonized_message));
 };
 
-jigna.QtBridge.prototype.send_request = function(jsonized_request) {
+jigna.QtBridge.prototype.send_request = function(request) {
     /* Send a request to the server and wait for the reply. */
 
-    result = this._qt_bridge.handle_request(jsonized_request);
+    var jsonized_response = this._qt_bridge.handle_request(
+        jigna.jsonize_message(request, null)
+    );
 
-    return result;
+    return this._client.parse_message(jsonized_response).payload;
 };
 
-jigna.QtBridge.prototype.send_request_async = function(jsonized_request) {
+jigna.QtBridge.prototype.send_request_async = function(request) {
     /* A dummy async version of the send_request method. Since QtBridge is
     single process, this method indeed waits for the reply but presents
     a deferred API so that the AsyncClient can use it. Mainly for testing
@@ -33,7 +44,7 @@ jigna.QtBridge.prototype.send_request_async = function(jsonized_request) {
 
     var deferred = new $.Deferred();
 
-    deferred.resolve(this._qt_bridge.handle_request(jsonized_request));
+    deferred.resolve(this.send_request(request));
 
     return deferred.promise();
 };
@@ -21,53 +21,67 @@ jigna.WebBridge = function(client) {
         this._request_ids.push(index);
     }
 
+    // Binary messages hold the data of NumPy arrays and are always sent just
+    // before the (text) message that uses them...
+    this._buffers = [];
+
+    // ... unless the server uses a binary wire format (it tells us which one
+    // as soon as we connect).
+    this._format = 'json';
+
     this._web_socket = new WebSocket(url);
+    this._web_socket.binaryType = 'arraybuffer';
     this.ready = new $.Deferred();
     var bridge = this;
     this._web_socket.onopen = function() {
         bridge.ready.resolve();
     };
     this._web_socket.onmessage = function(event) {
-        bridge.handle_event(event.data);
+        if (!(event.data instanceof ArrayBuffer)) {
+            bridge.handle_message(event.data);
+        }
+        else if (bridge._format === 'msgpack') {
+            bridge._dispatch_message(jigna.msgpack.decode(event.data));
+        }
+        else {
+            bridge._buffers.push(event.data);
+        }
     };
 };
 
-jigna.WebBridge.prototype.handle_event = function(jsonized_event) {
-    /* Handle an event from the server. */
-    var response = JSON.parse(jsonized_event);
-    var request_id = response[0];
-    var jsonized_response = response[1];
-    if (request_id === -1) {
-        this._client.handle_event(jsonized_response);
-    }
-    else {
-        var deferred = this._pop_deferred_request(request_id);
-        deferred.resolve(jsonized_response);
-    }
+jigna.WebBridge.prototype.handle_message = function(jsonized_message) {
+    /* Handle a message from the server. */
+    var buffers = this._buffers;
+    this._buffers = [];
+
+    this._dispatch_message(
+        this._client.parse_message(jsonized_message, buffers)
+    );
 };
 
-jigna.WebBridge.prototype.send_request = function(jsonized_request) {
+jigna.WebBridge.prototype.send_request = function(request) {
     /* Send a request to the server and wait for the reply. */
 
     var jsonized_response;
 
     $.ajax(
         {
-            url     : '/_jigna',
-            type    : 'GET',
-            data    : {'data': jsonized_request},
-            success : function(result) {jsonized_response = result;},
-            error   : function(status, error) {
-                          console.warning("Error: " + error);
-                      },
-            async   : false
+            url      : '/_jigna',
+            type     : 'GET',
+            data     : {'data': jigna.jsonize_message(request, null)},
+            dataType : 'text',
+            success  : function(result) {jsonized_response = result;},
+            error    : function(status, error) {
+                           console.warning("Error: " + error);
+                       },
+            async    : false
         }
     );
 
-    return jsonized_response;
+    return this._client.parse_message(jsonized_response).payload;
 };
 
-jigna.WebBridge.prototype.send_request_async = function(jsonized_request) {
+jigna.WebBridge.prototype.send_request_async = function(request) {
     /* Send a request to the server and do not wait and return a Promise
        which is resolved upon completion of the request.
     */
@@ -76,13 +90,29 @@ jigna.WebBridge.prototype.send_request_async = function(jsonized_request) {
     var request_id = this._push_deferred_request(deferred);
     var bridge = this;
     this.ready.done(function() {
-        bridge._web_socket.send(JSON.stringify([request_id, jsonized_request]));
+        bridge._web_socket.send(jigna.jsonize_message(request, request_id));
     });
     return deferred.promise();
 };
 
 //// Private protocol /////////////////////////////////////////////////////
 
+jigna.WebBridge.prototype._dispatch_message = function(message) {
+    /* Dispatch a (decoded) message from the server. */
+
+    if (message.kind === 'serializer') {
+        this._format = message.payload;
+    }
+    else if (message.kind === 'response') {
+        if (message.id in this._deferred_requests) {
+            this._pop_deferred_request(message.id).resolve(message.payload);
+        }
+    }
+    else {
+        this._client.handle_message(message);
+    }
+};
+
 jigna.WebBridge.prototype._pop_deferred_request = function(request_id) {
     var deferred = this._deferred_requests[request_id];
     delete this._deferred_requests[request_id];
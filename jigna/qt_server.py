@@ -9,9 +9,11 @@
 
 
 # Standard library.
-import json
+from functools import partial
+import logging
 import os
 from os.path import abspath, dirname, join
+import threading
 
 # Enthought library.
 from traits.api import Any, Bool, Str, Instance
@@ -22,7 +24,10 @@ from jigna.core.proxy_qwebview import ProxyQWebView
 from jigna.core.wsgi import FileLoader
 from jigna.server import Bridge, Server
 from jigna.qt import QtWebKit
-from jigna.utils.gui import ui_handler
+from jigna.utils.gui import do_after, invoke_later, ui_handler
+
+
+logger = logging.getLogger(__name__)
 
 #: Path to jigna.js file
 JIGNA_JS_FILE = join(abspath(dirname(__file__)), 'js', 'dist', 'jigna.js')
@@ -30,37 +35,104 @@ JIGNA_VUE_JS_FILE = join(
     abspath(dirname(__file__)), 'js', 'dist', 'jigna-vue.js'
 )
 
+#: The contents of the JS bundles that have been loaded by any page.
+#:
+#: { path : bytes }
+JS_BUNDLES = {}
+_JS_BUNDLES_LOCK = threading.Lock()
+
+
+def get_js_bundle(path):
+    """ Return the contents of a JS bundle.
+
+    Each bundle is only read (the first time that a page asks for it) once
+    per process.
+
+    """
+
+    with _JS_BUNDLES_LOCK:
+        bundle = JS_BUNDLES.get(path)
+        if bundle is None:
+            with open(path, 'rb') as f:
+                bundle = JS_BUNDLES[path] = f.read()
+
+    return bundle
+
 
 class QtBridge(Bridge):
     """ Qt (via QWebkit) bridge implementation. """
 
     #### 'Bridge' protocol ####################################################
 
-    def send_event(self, event):
-        """ Send an event. """
+    def send_events(self, events):
+        """ Send a batch of events. """
+
+        self._push_message(self._serialize_events(events))
+
+        return
+
+    #### 'QtBridge' protocol ##################################################
+
+    #: The 'WebViewContainer' that contains the QtWebKit malarky.
+    webview = Any
+
+    #: Should messages be pushed to the client by emitting the webview's
+    #: `message` signal (which the client connects to)? If False (or if the
+    #: webview has no such signal), the messages are passed by evaluating JS
+    #: which must then be compiled for every message.
+    use_signal = Bool(True)
+
+    #### Private protocol #####################################################
+
+    def _call_later(self, delay, callable):
+        """ Call the callable after `delay` seconds in the event loop. """
+
+        invoke_later(do_after, int(delay * 1000), callable)
+
+        return
+
+    def _execute_js(self, js):
+        """ Execute the given JS in the webview. """
+
+        if self.webview is None:
+            raise RuntimeError("WebView does not exist")
+
+        self.webview.execute_js(js)
+
+        return
+
+    def _send_event(self, event):
+        """ Send an event immediately. """
 
         try:
-            jsonized_event = json.dumps(event)
+            jsonized_event = self._serialize_event(event)
         except TypeError:
+            logger.warning('Dropping unserializable event: %r', event)
             return
 
+        self._push_message(jsonized_event)
+
+        return
+
+    def _push_message(self, message):
+        """ Push a (serialized) message to the client. """
+
         if self.webview is None:
             raise RuntimeError("WebView does not exist")
 
+        js_wrapper = getattr(self.webview, 'js_wrapper', None)
+        if self.use_signal and hasattr(js_wrapper, 'message'):
+            js_wrapper.message.emit(message)
+
         else:
             # This looks weird but this is how we fake an event being
             # 'received' on the client side when using the Qt bridge!
-            self.webview.execute_js(
-                'jigna.client.bridge.handle_event(%r);' % jsonized_event
+            self._execute_js(
+                'jigna.client.bridge.handle_message(%r);' % message
             )
 
         return
 
-    #### 'QtBridge' protocol ##################################################
-
-    #: The 'WebViewContainer' that contains the QtWebKit malarky.
-    webview = Any
-
 
 class QtServer(Server):
     """ Qt (via QWebkit) server implementation. """
@@ -114,15 +186,17 @@ class QtServer(Server):
         return ProxyQWebView(
             python_namespace = 'qt_bridge',
             callbacks        = [('handle_request', self.handle_request)],
+            signals          = ['message'],
             debug            = self.debug,
             hosts            = {
                 user_root: FileLoader(
                     root      = abspath(self.base_url),
                     overrides = {
                         index_file: self.html,
-                        join('jigna', 'jigna.js'): open(JIGNA_JS_FILE).read(),
+                        join('jigna', 'jigna.js'):
+                        partial(get_js_bundle, JIGNA_JS_FILE),
                         join('jigna', 'jigna-vue.js'):
-                        open(JIGNA_VUE_JS_FILE).read()
+                        partial(get_js_bundle, JIGNA_VUE_JS_FILE)
                     }
                 ),
                 'root.filesystem': FileLoader(root=abspath(os.sep))
@@ -133,10 +207,32 @@ class QtServer(Server):
 
     _bridge = Instance(QtBridge)
     def __bridge_default(self):
-        return QtBridge(webview=self.webview)
+        # The events are passed to the webview as (signal or JS) strings, so
+        # they must be text.
+        return QtBridge(
+            webview              = self.webview,
+            event_batch_interval = self.event_batch_interval,
+            serializer           = self._text_serializer
+        )
 
     _plugin_factory = Instance('QtWebPluginFactory')
 
+    def _call_coroutine(self, method, args):
+        """ Call a coroutine method without blocking the GUI thread.
+
+        The coroutine is run in a worker thread (as for a method called with
+        'call_instance_method_thread') and the client gets a promise of its
+        result. The result is marshalled, just as the response to a coroutine
+        method called on a web server.
+
+        """
+
+        future_id = self._start_future(
+            method, args, method.__name__, marshal_result=True
+        )
+
+        return dict(type='future', value=future_id['value'], info=None)
+
     def _enable_qwidget_embedding(self):
         """ Allow generic qwidgets to be embedded in the generated QWebView.
         """
@@ -6,28 +6,324 @@
 
 
 # Standard library.
+from functools import partial
 import inspect
-import json
 import logging
+import threading
+import time
 import traceback
+import weakref
+
+# 3rd party library.
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+try:
+    from concurrent.futures import (
+        Future as ConcurrentFuture, ProcessPoolExecutor
+    )
+except ImportError:
+    ConcurrentFuture = ProcessPoolExecutor = None
+try:
+    import numpy
+except ImportError:
+    numpy = None
+try:
+    from tornado.gen import is_coroutine_function as is_tornado_coroutine
+except ImportError:
+    is_tornado_coroutine = None
 
 # Enthought library.
 from traits.api import (
-    Any, Dict, Event, HasTraits, Instance, Property, Str, TraitDictEvent,
-    TraitListEvent
+    Any, cached_property, Dict, Either, Event, Float, HasTraits, Instance,
+    Property, Str, TraitDictEvent, TraitListEvent
 )
 
+# Jigna library.
+from jigna.core.concurrent import (
+    BoundedExecutor, Future, FutureCancelled, do_callback
+)
+from jigna.core.registry import ObjectRegistry
+from jigna.core.serializers import JSONSerializer, Serializer, get_serializer
+
 # Logging.
 logger = logging.getLogger(__name__)
 
+#: The serializer used for messages that must be text (JSON).
+JSON_SERIALIZER = JSONSerializer()
+
+#: The version of the message envelope used between the server and clients.
+PROTOCOL_VERSION = 1
+
+#: Mapping from the kind and size of a numeric NumPy dtype to the dtype that
+#: its arrays are sent as (i.e. one that has a matching JS typed array).
+#:
+#: 64-bit integers are sent as 'float64' (rather than as BigInt typed arrays,
+#: whose values can't be mixed with JS numbers), so integers bigger than
+#: `MAX_SAFE_INTEGER` lose precision. A warning is logged when that happens.
+NDARRAY_DTYPES = {
+    'b1': 'uint8', 'f2': 'float32', 'f4': 'float32', 'f8': 'float64',
+    'i1': 'int8', 'i2': 'int16', 'i4': 'int32', 'i8': 'float64',
+    'u1': 'uint8', 'u2': 'uint16', 'u4': 'uint32', 'u8': 'float64'
+}
+
+#: The largest integer that a 'float64' (i.e. a JS number) represents exactly.
+MAX_SAFE_INTEGER = 2**53
+
+#: The names of the attributes, events and methods of each class that has been
+#: sent to a client. This is shared by all servers (and survives clients
+#: reconnecting) as introspecting a class is relatively expensive.
+#:
+#: { class : dict(attribute_names, event_names, method_names) }
+TYPE_INFO_CACHE = weakref.WeakKeyDictionary()
+
+
+def call_method_in_process(obj, method_name, args):
+    """ Call a method on a (pickled) instance in a worker process.
+
+    Return a tuple '(result, updates)' where 'updates' is a dict of the traits
+    that the method changed.
+
+    """
+
+    changed = set()
+    def _on_trait_changed(obj, name, new):
+        if name.endswith('_items') and obj.trait(name[:-6]) is not None:
+            name = name[:-6]
+
+        changed.add(name)
+
+    obj.on_trait_change(_on_trait_changed)
+    result = getattr(obj, method_name)(*args)
+    obj.on_trait_change(_on_trait_changed, remove=True)
+
+    # Events (and 'trait_added') have no value to send back.
+    values = obj.trait_get()
+
+    return result, dict(
+        (name, values[name]) for name in changed if name in values
+    )
+
+
+def is_coroutine_function(func):
+    """ Return True if the given callable is a coroutine function.
+
+    That is an 'async def' function or one decorated with tornado's
+    `gen.coroutine`.
+
+    """
+
+    iscoroutinefunction = getattr(inspect, 'iscoroutinefunction', None)
+    if iscoroutinefunction is not None and iscoroutinefunction(func):
+        return True
+
+    return is_tornado_coroutine is not None and is_tornado_coroutine(func)
+
+
+def run_coroutine(func, *args, **kw):
+    """ Run a coroutine function to completion and return its result.
+
+    The coroutine is run in a new event loop in the calling thread (which must
+    not be running an event loop already).
+
+    """
+
+    if asyncio is None:
+        raise RuntimeError('Coroutine methods require asyncio')
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(func(*args, **kw))
+
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def serialize_message(kind, payload, id=None, buffers=None, default=None,
+                      serializer=None):
+    """ Serialize a message sent to the client(s).
+
+    Every message is wrapped in the same envelope::
+
+        {"version": 1, "kind": kind, "id": id, "payload": payload}
+
+    where `kind` is one of 'response', 'event', 'events' (a batch of events)
+    or 'serializer' (the wire format used by the server) and `id` is the id of
+    the request that a response is for. The payload is encoded as part of the
+    envelope so the client only has to parse a message once.
+
+    The message is serialized to JSON unless another `serializer` is given.
+    `buffers` and `default` are as for `Serializer.dumps`.
+
+    """
+
+    if serializer is None:
+        serializer = JSON_SERIALIZER
+
+    message = dict(
+        version=PROTOCOL_VERSION, kind=kind, id=id, payload=payload
+    )
+
+    return serializer.dumps(message, buffers, default)
+
 
 class Bridge(HasTraits):
     """ Bridge that handles the client-server communication. """
 
     #### 'Bridge' protocol ####################################################
 
+    #: The interval (in seconds) over which events are collected before they
+    #: are sent to the client(s) as a single batch.
+    #:
+    #: If None, every event is sent as soon as it happens. If 0, the events
+    #: are collected until the next iteration of the event loop. Repeated
+    #: changes to the same attribute of an object within a batch are
+    #: collapsed into the latest one.
+    event_batch_interval = Either(None, Float)
+
+    #: The serializer used for the messages sent to the client(s).
+    serializer = Instance(Serializer)
+    def _serializer_default(self):
+        return JSON_SERIALIZER
+
     def send_event(self, event):
-        """ Send an event. """
+        """ Send an event.
+
+        If events are being batched the event is queued and sent with the next
+        batch.
+
+        """
+
+        if self.event_batch_interval is None:
+            self._send_event(event)
+
+        else:
+            self._queue_event(event)
+
+        return
+
+    def send_events(self, events):
+        """ Send a batch of events. """
+
+        raise NotImplementedError
+
+    def flush_events(self):
+        """ Send all the queued events as a single batch. """
+
+        with self._pending_lock:
+            events = [
+                event for event in self._pending_events if event is not None
+            ]
+            self._pending_events = []
+            self._pending_keys = {}
+
+        if len(events) > 0:
+            self.send_events(events)
+
+        return
+
+    #### Private protocol #####################################################
+
+    #: The events waiting to be sent with the next batch (a collapsed event
+    #: is replaced with None).
+    _pending_events = Any
+    def __pending_events_default(self):
+        return []
+
+    #: The index in `_pending_events` of the latest attribute change event.
+    #:
+    #: { (str obj, str name) : int index }
+    _pending_keys = Any
+    def __pending_keys_default(self):
+        return {}
+
+    #: Lock guarding the pending events as events can be sent from any thread.
+    _pending_lock = Any
+    def __pending_lock_default(self):
+        return threading.Lock()
+
+    def _call_later(self, delay, callable):
+        """ Call the callable after `delay` seconds in the event loop. """
+
+        raise NotImplementedError
+
+    def _queue_event(self, event):
+        """ Queue an event to be sent with the next batch. """
+
+        with self._pending_lock:
+            schedule = len(self._pending_events) == 0
+
+            # Only plain attribute changes can be collapsed, items events
+            # describe incremental changes and other events (such as the
+            # 'new_type' event) must all be delivered. The objects in events
+            # aren't pinned, so dropping a change to an object is fine.
+            if event.get('items_event') is False:
+                key   = (event['obj'], event['name'])
+                index = self._pending_keys.pop(key, None)
+                if index is not None:
+                    self._pending_events[index] = None
+
+                self._pending_keys[key] = len(self._pending_events)
+
+            self._pending_events.append(event)
+
+        if schedule:
+            self._call_later(self.event_batch_interval, self.flush_events)
+
+        return
+
+    def _can_serialize(self, event):
+        """ Return True if the given event can be serialized. """
+
+        try:
+            self.serializer.dumps(event, [])
+
+        except TypeError:
+            logger.warning('Dropping unserializable event: %r', event)
+            return False
+
+        return True
+
+    def _serialize_event(self, event, buffers=None):
+        """ Serialize an event as a message.
+
+        Raise a `TypeError` if the event can't be serialized.
+
+        """
+
+        return serialize_message(
+            'event', event, buffers=buffers, serializer=self.serializer
+        )
+
+    def _serialize_events(self, events, buffers=None):
+        """ Serialize a batch of events as a single message.
+
+        Any event that can't be serialized is dropped.
+
+        """
+
+        try:
+            return serialize_message(
+                'events', events, buffers=buffers, serializer=self.serializer
+            )
+
+        except TypeError:
+            if buffers is not None:
+                del buffers[:]
+
+            events = [
+                event for event in events if self._can_serialize(event)
+            ]
+
+            return serialize_message(
+                'events', events, buffers=buffers, serializer=self.serializer
+            )
+
+    def _send_event(self, event):
+        """ Send an event immediately. """
 
         raise NotImplementedError
 
@@ -59,6 +355,48 @@ class Server(HasTraits):
     #: The trait change dispatch mechanism to use when traits change.
     trait_change_dispatch = Str('ui')
 
+    #: The interval (in seconds) over which events are collected before they
+    #: are sent to the client(s) as a single batch (see
+    #: `Bridge.event_batch_interval`).
+    event_batch_interval = Either(None, Float)
+
+    #: The serializer used for the messages sent to the client(s).
+    #:
+    #: By default this is the fastest installed JSON serializer (see
+    #: `jigna.core.serializers`). A binary serializer (such as 'msgpack') is
+    #: only used where binary messages are supported (i.e. web sockets).
+    serializer = Instance(Serializer)
+    def _serializer_default(self):
+        return get_serializer()
+
+    #: The executor that runs the methods called in a worker thread (see
+    #: `call_instance_method_thread`).
+    #:
+    #: Its `key_limits` are keyed by method name, e.g. to run at most one
+    #: 'save' at once use `BoundedExecutor(key_limits={'save': 1})`.
+    executor = Instance(BoundedExecutor)
+    def _executor_default(self):
+        return BoundedExecutor()
+
+    #: The pool of processes that runs the methods called in a worker process
+    #: (see `call_instance_method_process`). A `ProcessPoolExecutor` is
+    #: created when it is first needed.
+    process_executor = Any
+
+    #: The functions that are run in a worker process in place of a method.
+    #:
+    #: Each function is called with the method's arguments and the values of
+    #: the given traits of the instance (as keyword arguments) and returns a
+    #: dict of the traits to set on the instance.
+    #:
+    #: { str method name : (callable, [str trait name]) }
+    process_functions = Dict
+
+    #: The minimum interval (in seconds) between the 'progress' events sent
+    #: for a method called in a worker thread. The latest progress is always
+    #: sent.
+    progress_interval = Float(0.1)
+
     #: Context mapping from object name to obj.
     context = Dict
     def _context_changed(self):
@@ -82,14 +420,46 @@ class Server(HasTraits):
         return
 
     def handle_request(self, jsonized_request):
-        """ Handle a jsonized request from a client. """
+        """ Handle a jsonized request message from a client.
+
+        Return the jsonized response message.
 
-        request = json.loads(jsonized_request)
+        """
+
+        return self.handle_message(
+            self._text_serializer.loads(jsonized_request),
+            serializer=self._text_serializer
+        )
+
+    def handle_message(self, message, buffers=None, serializer=None):
+        """ Handle a (decoded) request message from a client.
+
+        A request message has the same envelope as the messages sent to the
+        client (see `serialize_message`) with the request as its payload.
+
+        Return the serialized response message. It is serialized with the
+        server's serializer unless another `serializer` is given. `buffers` is
+        as for `Serializer.dumps`.
+
+        """
 
-        # To dispatch the request we have a method named after each one!
-        method    = getattr(self, request['kind'])
+        return self._serialize_response(
+            message, self._dispatch_message(message), buffers, serializer
+        )
+
+    def dispatch_request(self, request):
+        """ Dispatch a (decoded) request and return the response.
+
+        The response is a dict with the 'result' and 'exception' keys.
+
+        """
+
+        # To dispatch the request we have a method named after each one! An
+        # unknown kind is reported like any other error, so that it doesn't
+        # fail the other requests of a batch.
         exception = None
         try:
+            method = getattr(self, request['kind'])
             result = method(request)
 
         except:
@@ -97,9 +467,7 @@ class Server(HasTraits):
             logger.exception(exception)
             result = None
 
-        response = dict(exception=exception, result=result)
-
-        return json.dumps(response, default=lambda obj: repr(type(obj)));
+        return dict(exception=exception, result=result)
 
     def shutdown(self):
         """ Shutdown the server.
@@ -109,14 +477,35 @@ class Server(HasTraits):
 
         """
 
-        for obj in self._id_to_object_map.values():
-            if isinstance(obj, HasTraits):
-                obj.on_trait_change(
-                    self._send_object_changed_event, remove=True
-                )
+        for obj_id in list(self._hooked_ids):
+            try:
+                obj = self._registry.get(obj_id)
+
+            except KeyError:
+                continue
+
+            self._unhook_object(obj)
+
+        self._hooked_ids.clear()
+
+        self.executor.shutdown()
+        if self.process_executor is not None:
+            self.process_executor.shutdown(wait=False)
 
     #### Handlers for each kind of request ####################################
 
+    def batch(self, request):
+        """ Handle a list of requests in order.
+
+        Return the list of their responses (see `dispatch_request`).
+
+        """
+
+        return [
+            self.dispatch_request(sub_request)
+            for sub_request in request['requests']
+        ]
+
     def update_context(self, request):
         """ Update the context on the JS side """
         # This method is called on a page reload or if a new client is used.
@@ -132,65 +521,172 @@ class Server(HasTraits):
 
         return
 
+    def release_objects(self, request):
+        """ Release the objects that a client no longer has proxies for.
+
+        The request maps the Id of each object to the number of times that
+        the client received it (see `ObjectRegistry.release`). Only the
+        objects in responses are pinned: each client releases the ones it
+        received, so any number of clients can share the registry. The
+        objects in events (which are sent to every client) are not pinned.
+
+        """
+
+        for obj_id, count in request['ids'].items():
+            self._registry.release(obj_id, count)
+
+        return
+
     #### Instances ####
 
     def call_instance_method(self, request):
-        """ Call a method on an instance. """
+        """ Call a method on an instance.
+
+        If the method is a coroutine function it is run by `_call_coroutine`.
 
-        obj         = self._id_to_object_map[request['id']]
+        """
+
+        obj         = self._registry.get(request['id'])
         method_name = request['method_name']
         args        = self._unmarshal_all(request['args'])
         method      = getattr(obj, method_name)
 
+        if is_coroutine_function(method):
+            return self._call_coroutine(method, args)
+
         return self._marshal(method(*args))
 
     def call_instance_method_thread(self, request):
-        """ Call a method on an instance *in a new thread*.
+        """ Call a method on an instance *in a worker thread*.
+
+        The method is run by the server's `executor`, which raises an
+        `ExecutorFull` exception if too many calls are already queued.
 
         Return the Id of a Future object which finishes when the method in
         thread finishes.
 
         """
 
-        obj         = self._id_to_object_map[request['id']]
+        obj         = self._registry.get(request['id'])
         method_name = request['method_name']
         args        = self._unmarshal_all(request['args'])
         method      = getattr(obj, method_name)
 
-        from jigna.core.concurrent import Future
-        future = Future(
-            method, args=tuple(args), dispatch=self.trait_change_dispatch
+        return self._start_future(
+            method, args, method_name, self._get_future_kw(method)
         )
 
-        def _on_done(result):
-            event = dict(
-                obj  = str(id(future)),
-                name = 'done',
-                data = result
-            )
-            self.send_event(event)
+    def call_instance_method_process(self, request):
+        """ Call a method on an instance *in a worker process*.
 
-        def _on_error(error):
-            error_msg = ''.join(traceback.format_exception(*error))
+        This is for CPU bound methods which would otherwise hold the GIL. The
+        instance is pickled and the method is called on the copy in one of
+        the processes of the server's `process_executor`. The traits that the
+        method changes are then set on the original instance (as dispatched
+        by `trait_change_dispatch`).
 
-            logger.error(error_msg)
+        Alternatively, a (picklable) function can be run in place of the
+        method (see `process_functions`).
 
-            event = dict(
-                obj  = str(id(future)),
-                name = 'error',
-                data = error_msg
+        No thread waits for the process, so the calls are limited by the size
+        of the process pool and not by the server's `executor`. Cancelling a
+        call only stops it if it hasn't started in a process yet.
+
+        Return the Id of a Future object (see `call_instance_method_thread`).
+
+        """
+
+        obj         = self._registry.get(request['id'])
+        method_name = request['method_name']
+        args        = self._unmarshal_all(request['args'])
+
+        if self.process_executor is None:
+            if ProcessPoolExecutor is None:
+                raise RuntimeError('Process pools require concurrent.futures')
+
+            self.process_executor = ProcessPoolExecutor()
+
+        function_info = self.process_functions.get(method_name)
+        if function_info is None:
+            process_future = self.process_executor.submit(
+                call_method_in_process, obj, method_name, args
             )
-            self.send_event(event)
 
-        future.on_done(_on_done)
-        future.on_error(_on_error)
+        else:
+            function, trait_names = function_info
+            process_future = self.process_executor.submit(
+                function, *args, **obj.trait_get(*trait_names)
+            )
 
-        return self._marshal(id(future))
+        # The outcome of the call once the traits have been set.
+        result_future = ConcurrentFuture()
+
+        def _on_cancelled(result_future):
+            if result_future.cancelled():
+                process_future.cancel()
+
+        def _complete(result, updates):
+            if not result_future.set_running_or_notify_cancel():
+                return
+
+            try:
+                obj.trait_set(**updates)
+
+            except Exception as exception:
+                result_future.set_exception(exception)
+
+            else:
+                result_future.set_result(result)
+
+        def _on_process_done(process_future):
+            if process_future.cancelled():
+                result_future.cancel()
+
+            elif process_future.exception() is not None:
+                if result_future.set_running_or_notify_cancel():
+                    result_future.set_exception(process_future.exception())
+
+            elif function_info is None:
+                result, updates = process_future.result()
+                do_callback(
+                    self.trait_change_dispatch, _complete, result, updates
+                )
+
+            else:
+                do_callback(
+                    self.trait_change_dispatch, _complete, None,
+                    process_future.result()
+                )
+
+        result_future.add_done_callback(_on_cancelled)
+        process_future.add_done_callback(_on_process_done)
+
+        return self._watch_future(
+            Future(result_future, dispatch=self.trait_change_dispatch)
+        )
+
+    def cancel_future(self, request):
+        """ Cancel a method called in a worker thread.
+
+        A method that hasn't started yet is not run at all and a 'cancelled'
+        event is sent. A running method is only asked to stop: if it takes
+        its future (see `takes_future`) it can poll its `cancelled` trait and
+        raise `FutureCancelled`, in which case a 'cancelled' event is sent,
+        otherwise it runs to completion and sends a 'done' or 'error' event.
+
+        Return True if the method was cancelled before it started.
+
+        """
+
+        future = self._futures.get(str(request['future_id']))
+        cancelled = future is not None and future.cancel()
+
+        return self._marshal(cancelled)
 
     def get_instance_attribute(self, request):
         """ Get the value of an instance attribute. """
 
-        obj            = self._id_to_object_map[request['id']]
+        obj            = self._registry.get(request['id'])
         attribute_name = request['attribute_name']
 
         return self._marshal(getattr(obj, attribute_name))
@@ -198,7 +694,7 @@ class Server(HasTraits):
     def set_instance_attribute(self, request):
         """ Set an attribute on an instance. """
 
-        obj            = self._id_to_object_map[request['id']]
+        obj            = self._registry.get(request['id'])
         attribute_name = request['attribute_name']
         value          = self._unmarshal(request['value']);
 
@@ -211,15 +707,37 @@ class Server(HasTraits):
     def get_item(self, request):
         """ Get the value of an item in a list or dict. """
 
-        obj   = self._id_to_object_map[request['id']]
+        obj   = self._registry.get(request['id'])
         index = request['index']
 
         return self._marshal(obj[index])
 
+    def get_items(self, request):
+        """ Get the values of several items in a list or dict.
+
+        The items are given by a list of 'keys' (indices for a list), for a
+        range of items in a list use `get_slice`.
+
+        """
+
+        obj  = self._registry.get(request['id'])
+        keys = request['keys']
+
+        return self._marshal_all([obj[key] for key in keys])
+
+    def get_slice(self, request):
+        """ Get the values of a slice of a list. """
+
+        obj   = self._registry.get(request['id'])
+        start = request['start']
+        stop  = request['stop']
+
+        return self._marshal_all(obj[start:stop])
+
     def set_item(self, request):
         """ Set the value of a an item in a list or dict. """
 
-        obj   = self._id_to_object_map[request['id']]
+        obj   = self._registry.get(request['id'])
         index = request['index']
         value = self._unmarshal(request['value'])
 
@@ -235,12 +753,36 @@ class Server(HasTraits):
     #: The bridge that provides the communication between Python and JS.
     _bridge = Instance(Bridge)
 
-    #: All instances, lists and dicts that have been accessed via the bridge.
+    #: The serializer used where messages must be text.
+    _text_serializer = Property(Instance(Serializer), depends_on='serializer')
+
+    @cached_property
+    def _get__text_serializer(self):
+        if self.serializer.binary:
+            return JSON_SERIALIZER
+
+        return self.serializer
+
+    #: The futures of the methods running in worker threads.
     #:
-    #: { str id : instance_list_or_dict obj }
-    _id_to_object_map = Any
-    def __id_to_object_map_default(self):
-        return {}
+    #: { str future id : Future }
+    _futures = Dict
+
+    #: The Ids of the instances whose trait changes we listen to.
+    #:
+    #: Each instance is hooked up only once no matter how many times it is
+    #: sent to the client(s).
+    _hooked_ids = Any
+    def __hooked_ids_default(self):
+        return set()
+
+    #: All instances, lists and dicts that have been accessed via the bridge.
+    _registry = Instance(ObjectRegistry)
+    def __registry_default(self):
+        registry = ObjectRegistry()
+        registry.on_trait_change(self._on_object_removed, 'removed')
+
+        return registry
 
     #: The typenames of the Python types that we have already visited.
     #:
@@ -250,16 +792,62 @@ class Server(HasTraits):
     def __visited_type_names_default(self):
         return set()
 
-    def _context_ids(self, context):
+    def _call_coroutine(self, method, args):
+        """ Call a coroutine method and return its marshalled result.
+
+        This blocks while the coroutine runs to completion in a private event
+        loop (in a thread of its own so that it doesn't disturb any event loop
+        of the calling thread). `WebServer` overrides this to run the
+        coroutine on its IOLoop and `QtServer` to run it as a Future (so that
+        neither blocks).
+
+        """
+
+        outcome = {}
+        def _run():
+            try:
+                outcome['result'] = run_coroutine(method, *args)
+
+            except BaseException as exception:
+                outcome['exception'] = exception
+
+        thread = threading.Thread(target=_run)
+        thread.start()
+        thread.join()
+
+        if 'exception' in outcome:
+            raise outcome['exception']
+
+        return self._marshal(outcome['result'])
+
+    def _context_ids(self, context, pin=True):
         """ Return a dictionary keyed with object ids of the objects in
         self._context and whose values are the object ids.
         """
         context_ids = {}
         for obj_name, obj in context.items():
-            context_ids[obj_name] = self._marshal(obj)
+            context_ids[obj_name] = self._marshal(obj, pin)
 
         return context_ids
 
+    def _dispatch_message(self, message):
+        """ Dispatch the request in a (decoded) request message and return the
+        response.
+
+        """
+
+        version = message.get('version')
+        if version != PROTOCOL_VERSION:
+            response = dict(
+                exception='Unsupported protocol version: %r' % version,
+                result=None
+            )
+
+        else:
+            response = self.dispatch_request(message['payload'])
+
+        return response
+
     def _get_attribute_names(self, obj):
         """ Get the names of all 'public' attributes on an object.
 
@@ -282,8 +870,8 @@ class Server(HasTraits):
 
         return attribute_names
 
-    def _get_dict_info(self, obj):
-        """ Get a description of a dict. """
+    def _get_dict_info(self, obj, pin=True):
+        """ Get a description of a dict (see `_marshal` for `pin`). """
 
         return dict(keys=list(obj.keys()))
 
@@ -307,6 +895,18 @@ class Server(HasTraits):
 
         return event_names
 
+    def _get_future_kw(self, method):
+        """ Return the name of the argument that a method called in a worker
+        thread takes its `Future` as (or None if it doesn't take one).
+
+        Only methods marked with the `takes_future` decorator take one, the
+        Future lets them report progress and poll whether they have been
+        cancelled.
+
+        """
+
+        return getattr(method, '_future_kw', None)
+
     def _get_instance_info(self, obj):
         """ Get a description of an instance. """
 
@@ -316,12 +916,7 @@ class Server(HasTraits):
         # need to include the full info for it (its attributes, events and
         # methods etc)...
         if type_name not in self._visited_type_names:
-            info = dict(
-                type_name       = type_name,
-                attribute_names = self._get_attribute_names(obj),
-                event_names     = self._get_event_names(obj),
-                method_names    = self._get_public_method_names(obj)
-            )
+            info = dict(type_name=type_name, **self._get_type_info(obj))
             self._visited_type_names.add(type_name)
 
         # ... for subsequent calls, we only need to send the type name as the
@@ -332,11 +927,16 @@ class Server(HasTraits):
 
         return info
 
-    def _get_list_info(self, obj):
-        """ Get a description of a list. """
+    def _get_list_info(self, obj, pin=True):
+        """ Get a description of a list (see `_marshal` for `pin`). """
 
         return dict(length=len(obj))
 
+    def _get_ndarray_info(self, obj):
+        """ Get a description of a NumPy array. """
+
+        return dict(dtype=obj.dtype.name, shape=list(obj.shape))
+
     def _get_public_method_names(self, obj):
         """ Get the names of all public methods on a class.
 
@@ -357,56 +957,115 @@ class Server(HasTraits):
 
         return public_method_names
 
+    def _get_type_info(self, obj):
+        """ Get the names of the attributes, events and methods of an
+        object's type.
+
+        The names are only computed for the first object of each type (see
+        `TYPE_INFO_CACHE`).
+
+        """
+
+        cls = type(obj)
+        type_info = TYPE_INFO_CACHE.get(cls)
+        if type_info is None:
+            type_info = dict(
+                attribute_names = self._get_attribute_names(obj),
+                event_names     = self._get_event_names(obj),
+                method_names    = self._get_public_method_names(obj)
+            )
+            TYPE_INFO_CACHE[cls] = type_info
+
+        return type_info
+
     def _get_type_name(self, obj):
         t = type(obj)
         return t.__module__ + '.' + t.__name__
 
-    def _marshal(self, obj):
-        """ Marshal a value. """
+    def _marshal(self, obj, pin=True):
+        """ Marshal a value.
+
+        If `pin` is True then the objects that the client gets a proxy for are
+        pinned until the client releases them (see `release_objects`).
+        Otherwise they are marked as not pinned (so that the client doesn't
+        release them), which is how the objects in events are sent as the
+        events go to every client.
 
-        if isinstance(obj, list):
-            obj_id = str(id(obj))
-            self._id_to_object_map[obj_id] = obj
+        """
+
+        if numpy is not None and isinstance(obj, numpy.ndarray):
+            kind  = obj.dtype.kind + str(obj.dtype.itemsize)
+            dtype = NDARRAY_DTYPES.get(kind)
+
+            # Arrays that don't map to a JS typed array (strings, objects,
+            # complex numbers etc) are sent as plain (nested) lists.
+            if dtype is None:
+                type  = 'primitive'
+                value = obj.tolist()
+                info  = None
+
+            # The client expects the raw data to be contiguous and
+            # little-endian.
+            else:
+                if kind in ('i8', 'u8') and obj.size > 0 and (
+                        obj.max() > MAX_SAFE_INTEGER
+                        or obj.min() < -MAX_SAFE_INTEGER):
+                    logger.warning(
+                        'Sending a %s array as float64 loses the precision '
+                        'of integers bigger than 2**53', obj.dtype
+                    )
+
+                dtype = numpy.dtype(dtype).newbyteorder('<')
+
+                type  = 'ndarray'
+                value = numpy.ascontiguousarray(obj, dtype=dtype)
+                info  = self._get_ndarray_info(value)
+
+        elif isinstance(obj, list):
+            obj_id = self._registry.register(obj, pin=pin)
 
             type  = 'list'
             value = obj_id
-            info  = self._get_list_info(obj)
+            info  = self._get_list_info(obj, pin)
 
         elif isinstance(obj, dict):
-            obj_id = str(id(obj))
-            self._id_to_object_map[obj_id] = obj
+            obj_id = self._registry.register(obj, pin=pin)
 
             type  = 'dict'
             value = obj_id
-            info  = self._get_dict_info(obj)
+            info  = self._get_dict_info(obj, pin)
 
         # fixme: Not quite right as this will be True for classes too ;^)
         # The intent is to get objects that are non-scalar eg. int, float
         # complex, str etc.
         elif hasattr(obj, '__dict__'):
-            obj_id = str(id(obj))
-            self._id_to_object_map[obj_id] = obj
+            obj_id = self._registry.register(obj, pin=pin)
 
             type  = 'instance'
             value = obj_id
             info  = self._get_instance_info(obj)
 
-            if isinstance(obj, HasTraits):
+            if isinstance(obj, HasTraits) and obj_id not in self._hooked_ids:
+                self._hooked_ids.add(obj_id)
                 obj.on_trait_change(
                     self._send_object_changed_event,
                     dispatch=self.trait_change_dispatch
                 )
+                obj.on_trait_change(self._on_trait_added, 'trait_added')
         else:
             type  = 'primitive'
             value = obj
             info  = None
 
+        if not pin and type in ('list', 'dict', 'instance'):
+            return dict(type=type, value=value, info=info, pinned=False)
+
         return dict(type=type, value=value, info=info)
 
-    def _marshal_all(self, iter):
+    def _marshal_all(self, iter, pin=True):
         """ Marshal all of the values in an iterable. """
 
-        return [self._marshal(obj) for obj in iter]
+        return [self._marshal(obj, pin) for obj in iter]
 
     def _unmarshal(self, obj):
         """ Unmarshal a value. """
@@ -415,7 +1074,7 @@ class Server(HasTraits):
             value = obj['value']
 
         else:
-            value = self._id_to_object_map[obj['value']]
+            value = self._registry.get(obj['value'])
 
         return value
 
@@ -424,13 +1083,35 @@ class Server(HasTraits):
 
         return [self._unmarshal(obj) for obj in iter]
 
-    def _register_object(self, obj):
-        """ Register the given object with the server. """
+    def _on_trait_added(self, obj, trait_name, old, new):
+        """ Called when a trait is added to an instance.
+
+        The (cached) type info no longer describes the instance, so it is
+        computed (and sent to the client) again.
 
-        self._id_to_object_map[str(id(obj))] = obj
+        """
+
+        TYPE_INFO_CACHE.pop(type(obj), None)
+        self._visited_type_names.discard(self._get_type_name(obj))
 
         return
 
+    def _on_object_removed(self, removed):
+        """ Called when an object is removed from the registry. """
+
+        obj_id, obj = removed
+        if obj_id in self._hooked_ids:
+            self._hooked_ids.discard(obj_id)
+            if obj is not None:
+                self._unhook_object(obj)
+
+        return
+
+    def _register_object(self, obj):
+        """ Register the given object with the server and return its Id. """
+
+        return self._registry.register(obj)
+
     def _register_objects(self, objs):
         """ Register more than one objects """
 
@@ -439,6 +1120,19 @@ class Server(HasTraits):
 
         return
 
+    def _serialize_response(self, message, response, buffers=None,
+                            serializer=None):
+        """ Serialize the response to a request message (see
+        `handle_message`).
+
+        """
+
+        return serialize_message(
+            'response', response, message.get('id'), buffers,
+            default=lambda obj: repr(type(obj)),
+            serializer=serializer or self.serializer
+        )
+
     def _send_object_changed_event(self, obj, trait_name, old, new):
         """ Send an object changed event. """
 
@@ -458,12 +1152,12 @@ class Server(HasTraits):
             items_event = False
 
         event = dict(
-            obj  = str(id(obj)),
+            obj  = self._registry.register(obj),
             name = trait_name,
             # fixme: This smells a bit, but marshalling the new value gives us
             # a type/value pair which we need on the client side to determine
             # what (if any) proxy we need to create.
-            data = self._marshal(new),
+            data = self._marshal(new, pin=False),
 
             # fixme: This is how we currently detect an 'xxx_items' event on
             # the JS side.
@@ -480,11 +1174,147 @@ class Server(HasTraits):
         event = dict(
             obj  = 'jigna',
             name = 'context_updated',
-            data = self._context_ids(context)
+            data = self._context_ids(context, pin=False)
         )
 
         self.send_event(event)
 
         return
 
+    def _send_progress_events(self, future, future_id):
+        """ Send 'progress' events when the progress (or info) of a future
+        changes.
+
+        The events are sent at most once every `progress_interval` seconds.
+        Return a function to call when the future finishes: it sends any
+        progress that is still waiting (so that it arrives before the
+        'done', 'error' or 'cancelled' event) and stops listening to the
+        future.
+
+        """
+
+        lock  = threading.Lock()
+        state = dict(data=None, scheduled=False, sent_at=0.0)
+
+        def _send():
+            with lock:
+                # The progress has already been flushed.
+                if not state['scheduled']:
+                    return
+
+                state['scheduled'] = False
+                state['sent_at']   = time.time()
+                data = state['data']
+
+            self.send_event(dict(obj=future_id, name='progress', data=data))
+
+        def _on_progress(*args):
+            with lock:
+                state['data'] = dict(
+                    progress=future.progress, info=future.info
+                )
+                if state['scheduled']:
+                    return
+
+                state['scheduled'] = True
+                delay = state['sent_at'] + self.progress_interval - time.time()
+
+            if delay > 0:
+                self._bridge._call_later(delay, _send)
+
+            else:
+                _send()
+
+        def _flush():
+            future.on_trait_change(_on_progress, 'info', remove=True)
+            _send()
+
+        future.on_progress(_on_progress)
+        future.on_trait_change(_on_progress, 'info')
+
+        return _flush
+
+    def _start_future(self, func, args, key, future_kw=None,
+                      marshal_result=False):
+        """ Start a Future that calls a function in a worker thread.
+
+        A coroutine function is run to completion in an event loop of the
+        worker thread. A 'done', 'error' or 'cancelled' event is sent when
+        the future finishes and 'progress' events are sent while it runs.
+        The result is sent in the 'done' event as is, or marshalled if
+        `marshal_result` is True.
+
+        Return the marshalled Id of the future.
+
+        """
+
+        if is_coroutine_function(func):
+            func = partial(run_coroutine, func)
+
+        future = Future(
+            func, args=tuple(args), dispatch=self.trait_change_dispatch,
+            executor=self.executor, key=key, future_kw=future_kw
+        )
+
+        return self._watch_future(future, marshal_result)
+
+    def _watch_future(self, future, marshal_result=False):
+        """ Send the events for a Future (see `_start_future`).
+
+        Return the marshalled Id of the future.
+
+        """
+
+        future_id = str(id(future))
+        self._futures[future_id] = future
+        flush_progress = self._send_progress_events(future, future_id)
+
+        def _on_done(result):
+            self._futures.pop(future_id, None)
+            flush_progress()
+
+            # Unlike the other events, the result is the response to one
+            # client's request so it is pinned as any other response.
+            if marshal_result:
+                result = self._marshal(result)
+
+            event = dict(
+                obj  = future_id,
+                name = 'done',
+                data = result
+            )
+            self.send_event(event)
+
+        def _on_error(error):
+            self._futures.pop(future_id, None)
+            flush_progress()
+
+            if issubclass(error[0], FutureCancelled):
+                self.send_event(dict(obj=future_id, name='cancelled'))
+                return
+
+            error_msg = ''.join(traceback.format_exception(*error))
+
+            logger.error(error_msg)
+
+            event = dict(
+                obj  = future_id,
+                name = 'error',
+                data = error_msg
+            )
+            self.send_event(event)
+
+        future.on_done(_on_done)
+        future.on_error(_on_error)
+
+        return self._marshal(id(future))
+
+    def _unhook_object(self, obj):
+        """ Stop listening to the trait changes of an instance. """
+
+        obj.on_trait_change(self._send_object_changed_event, remove=True)
+        obj.on_trait_change(self._on_trait_added, 'trait_added', remove=True)
+
+        return
+
 #### EOF ######################################################################
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from jigna.core.asset_cache import AssetCache
+
+
+class TestAssetCache(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache = AssetCache()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _make_file(self, name, data):
+        path = os.path.join(self.root, name)
+        with open(path, 'wb') as fp:
+            fp.write(data)
+
+        return path
+
+    def test_files_are_cached(self):
+        # Given
+        path = self._make_file('index.html', b'<html></html>')
+
+        # When
+        asset = self.cache.get(path)
+        cached = self.cache.get(path)
+
+        # Then
+        self.assertIs(cached, asset)
+        self.assertEqual(asset.data, b'<html></html>')
+        self.assertEqual(asset.mime_type, 'text/html')
+        self.assertTrue(asset.compressible)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_cache_is_bounded(self):
+        # Given
+        self.cache.max_size = 10
+        first = self._make_file('a.txt', b'123456')
+        second = self._make_file('b.txt', b'123456')
+
+        # When
+        self.cache.get(first)
+        self.cache.get(second)
+        self.cache.get(first)
+
+        # Then
+        self.assertEqual(self.cache.size, 6)
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_large_files_are_not_cached(self):
+        # Given
+        self.cache.max_file_size = 4
+        path = self._make_file('data.bin', b'123456')
+
+        # When
+        self.cache.get(path)
+        self.cache.get(path)
+
+        # Then
+        self.assertEqual(self.cache.size, 0)
+        self.assertEqual(self.cache.misses, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
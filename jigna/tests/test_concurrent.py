@@ -0,0 +1,240 @@
+from concurrent import futures
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import unittest
+
+from tornado import gen
+from tornado.ioloop import IOLoop
+from traits.api import Undefined
+
+from jigna.core.concurrent import (
+    BoundedExecutor, Deferred, ExecutorFull, Future, FutureCancelled,
+    threaded
+)
+
+
+class TestBoundedExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = BoundedExecutor(max_workers=2, max_queued=2)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.executor.shutdown()
+
+    def _block(self, started):
+        started.release()
+        self.release.wait(5)
+
+    def _submit_blocking(self, count, key=None):
+        started = threading.Semaphore(0)
+        for i in range(count):
+            self.executor.submit(lambda: self._block(started), key=key)
+
+        return started
+
+    def test_work_is_run(self):
+        # Given
+        done = threading.Event()
+
+        # When
+        self.executor.submit(done.set)
+
+        # Then
+        self.assertTrue(done.wait(5))
+
+    def test_max_workers(self):
+        # When
+        started = self._submit_blocking(2)
+        started.acquire(timeout=5)
+        started.acquire(timeout=5)
+        self.executor.submit(lambda: None)
+
+        # Then
+        self.assertEqual(self.executor.active, 2)
+        self.assertEqual(self.executor.queued, 1)
+
+    def test_full_queue_rejects_work(self):
+        # Given
+        started = self._submit_blocking(2)
+        started.acquire(timeout=5)
+        started.acquire(timeout=5)
+        self._submit_blocking(2)
+
+        # When/Then
+        with self.assertRaises(ExecutorFull):
+            self.executor.submit(lambda: None)
+        self.assertEqual(self.executor.rejected, 1)
+
+    def test_key_limits(self):
+        # Given
+        self.executor.key_limits = {'slow': 1}
+        done = threading.Event()
+
+        # When
+        started = self._submit_blocking(2, key='slow')
+        started.acquire(timeout=5)
+        self.executor.submit(done.set)
+
+        # Then
+        self.assertTrue(done.wait(5))
+        self.assertEqual(self.executor.queued, 1)
+
+    def test_future_on_executor(self):
+        # When
+        future = Future(lambda x: x * 2, args=(21,), executor=self.executor)
+
+        # Then
+        self.assertEqual(future.result, 42)
+
+
+    def test_cancel_queued_work(self):
+        # Given
+        started = self._submit_blocking(2)
+        started.acquire(timeout=5)
+        started.acquire(timeout=5)
+        future = Future(lambda: 42, executor=self.executor)
+
+        # When
+        cancelled = future.cancel()
+
+        # Then
+        self.assertTrue(cancelled)
+        self.assertEqual(self.executor.queued, 0)
+        self.assertEqual(future.status, 'error')
+        self.assertIs(future.error[0], FutureCancelled)
+
+
+class TestDeferred(unittest.TestCase):
+
+    def test_only_the_relevant_callbacks_are_called(self):
+        # Given
+        deferred = Deferred()
+        promise = deferred.promise
+        calls = []
+        promise.on_done(lambda result: calls.append(('done', result)))
+        promise.on_error(lambda error: calls.append(('error', error)))
+        promise.on_progress(lambda value: calls.append(('progress', value)))
+
+        # When
+        deferred.progress(0.5)
+        deferred.done(42)
+        deferred.done(43)
+        deferred.error('oops')
+
+        # Then
+        self.assertEqual(
+            calls, [('progress', 0.5), ('progress', 1.0), ('done', 42)]
+        )
+        self.assertEqual(promise.status, 'done')
+        self.assertEqual(promise.result, 42)
+
+    def test_callbacks_added_after_completion(self):
+        # Given
+        deferred = Deferred()
+        deferred.error('oops')
+        calls = []
+
+        # When
+        deferred.promise.on_done(calls.append)
+        deferred.promise.on_error(calls.append)
+
+        # Then
+        self.assertEqual(calls, ['oops'])
+
+    def test_pending_promise_has_no_result(self):
+        # Given
+        promise = Deferred().promise
+
+        # When/Then
+        self.assertEqual(promise.status, 'pending')
+        with self.assertRaises(ValueError):
+            promise.result
+
+
+class TestFuture(unittest.TestCase):
+
+    def test_cancel_running_future(self):
+        # Given
+        started = threading.Event()
+
+        def compute(future):
+            started.set()
+            while not future.cancelled:
+                time.sleep(0.01)
+            raise FutureCancelled()
+
+        future = Future(compute, future_kw='future')
+        started.wait(5)
+
+        # When
+        cancelled = future.cancel()
+
+        # Then
+        self.assertFalse(cancelled)
+        self.assertIs(future.result, Undefined)
+        self.assertIs(future.error[0], FutureCancelled)
+
+
+    def test_future_on_standard_executor(self):
+        # Given
+        executor = ThreadPoolExecutor(max_workers=2)
+
+        # When
+        future = Future(lambda x: x * 2, args=(21,), executor=executor)
+
+        # Then
+        self.assertEqual(future.result, 42)
+        self.assertEqual(future.concurrent_future.result(), 42)
+        self.assertEqual(future.status, 'done')
+        executor.shutdown()
+
+    def test_wrap_concurrent_future(self):
+        # Given
+        concurrent_future = futures.Future()
+        future = Future(concurrent_future)
+        self.assertEqual(future.status, 'pending')
+
+        # When
+        concurrent_future.set_running_or_notify_cancel()
+        concurrent_future.set_result(42)
+
+        # Then
+        self.assertEqual(future.result, 42)
+        self.assertEqual(future.status, 'done')
+
+    def test_threaded_passes_arguments(self):
+        # Given
+        @threaded(executor=ThreadPoolExecutor(max_workers=1))
+        def add(x, y=0):
+            return x + y
+
+        # When
+        future = add(1, y=2)
+
+        # Then
+        self.assertEqual(future.result, 3)
+
+    def test_await_futures(self):
+        # Given
+        def compute(x):
+            time.sleep(0.01)
+            return x * 2
+
+        @gen.coroutine
+        def gather():
+            futures = [Future(compute, args=(i,)) for i in range(5)]
+            results = yield futures
+            raise gen.Return(results)
+
+        # When
+        results = IOLoop().run_sync(gather)
+
+        # Then
+        self.assertEqual(results, [0, 2, 4, 6, 8])
+
+
+if __name__ == '__main__':
+    unittest.main()
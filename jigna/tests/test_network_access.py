@@ -0,0 +1,67 @@
+import threading
+import unittest
+
+from jigna.core.network_access import ProxyReplyPool
+from jigna.qt import QtCore
+
+
+class Worker(QtCore.QRunnable):
+    """ A worker that records the thread it runs in. """
+
+    def __init__(self, event=None):
+        super(Worker, self).__init__()
+        self.setAutoDelete(False)
+        self.event = event
+        self.started = threading.Event()
+        self.thread = None
+
+    def run(self):
+        self.pool._on_started(self)
+        self.thread = threading.current_thread()
+        self.started.set()
+        if self.event is not None:
+            self.event.wait(5)
+        self.pool._on_finished(self, 0.0)
+
+
+class TestProxyReplyPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ProxyReplyPool(max_workers=1)
+
+    def test_submitted_worker_runs_in_a_pool_thread(self):
+        # Given
+        worker = Worker()
+
+        # When
+        self.pool.submit(worker)
+        self.pool.wait_for_done()
+
+        # Then
+        self.assertIsNot(worker.thread, threading.current_thread())
+        self.assertEqual(self.pool.get_stats()['completed'], 1)
+
+    def test_run_does_not_wait_for_a_pool_thread(self):
+        # Given
+        event = threading.Event()
+        busy = Worker(event)
+        self.pool.submit(busy)
+        busy.started.wait(5)
+        worker = Worker()
+
+        # When
+        self.pool.run(worker)
+
+        # Then
+        self.assertIs(worker.thread, threading.current_thread())
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['active'], 1)
+        self.assertEqual(stats['completed'], 1)
+
+        event.set()
+        self.pool.wait_for_done()
+        self.assertEqual(self.pool.get_stats()['completed'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
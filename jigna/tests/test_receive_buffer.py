@@ -0,0 +1,63 @@
+import threading
+import unittest
+
+from jigna.core.receive_buffer import ReceiveBuffer
+
+
+class TestReceiveBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = ReceiveBuffer()
+
+    def test_empty_buffer(self):
+        # When/Then
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(self.buffer.read(10), b'')
+
+    def test_read_across_chunks(self):
+        # Given
+        self.buffer.append(b'hello ')
+        self.buffer.append(b'')
+        self.buffer.append(b'world')
+
+        # When
+        data = self.buffer.read(8)
+
+        # Then
+        self.assertEqual(data, b'hello wo')
+        self.assertEqual(len(self.buffer), 3)
+        self.assertEqual(self.buffer.read(100), b'rld')
+        self.assertEqual(len(self.buffer), 0)
+
+    def test_partial_reads_of_a_chunk(self):
+        # Given
+        self.buffer.append(b'abcdef')
+
+        # When
+        parts = [self.buffer.read(2) for i in range(4)]
+
+        # Then
+        self.assertEqual(parts, [b'ab', b'cd', b'ef', b''])
+
+    def test_append_and_read_in_threads(self):
+        # Given
+        chunks = [bytes(bytearray([i])) * 100 for i in range(100)]
+
+        def _append():
+            for chunk in chunks:
+                self.buffer.append(chunk)
+
+        # When
+        thread = threading.Thread(target=_append)
+        thread.start()
+        parts = []
+        while thread.is_alive() or len(self.buffer) > 0:
+            parts.append(self.buffer.read(64))
+        thread.join()
+
+        # Then
+        self.assertEqual(b''.join(parts), b''.join(chunks))
+
+
+if __name__ == '__main__':
+    unittest.main()
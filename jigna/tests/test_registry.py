@@ -0,0 +1,147 @@
+import gc
+import unittest
+
+from traits.api import HasTraits, Str
+
+from jigna.core.registry import ObjectRegistry
+
+
+class Model(HasTraits):
+    name = Str
+
+
+class TestObjectRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ObjectRegistry()
+
+    def test_register_and_get(self):
+        # Given
+        model = Model()
+
+        # When
+        obj_id = self.registry.register(model)
+
+        # Then
+        self.assertIs(self.registry.get(obj_id), model)
+        self.assertEqual(self.registry.get_id(model), obj_id)
+        self.assertEqual(self.registry.register(model), obj_id)
+        self.assertEqual(self.registry.size, 1)
+
+    def test_objects_are_weakly_referenced(self):
+        # Given
+        obj_id = self.registry.register(Model())
+        gc.collect()
+
+        # When/Then
+        with self.assertRaises(KeyError):
+            self.registry.get(obj_id)
+        self.assertEqual(self.registry.size, 0)
+        self.assertEqual(self.registry.collected, 1)
+
+    def test_ids_are_not_reused(self):
+        # Given
+        obj_id = self.registry.register(Model())
+        gc.collect()
+
+        # When
+        ids = set(self.registry.register(Model()) for i in range(10))
+
+        # Then
+        self.assertNotIn(obj_id, ids)
+
+    def test_pinned_objects_are_kept_alive_until_released(self):
+        # Given
+        obj_id = self.registry.register(Model(), pin=True)
+        self.registry.register(self.registry.get(obj_id), pin=True)
+        gc.collect()
+
+        # When
+        self.registry.release(obj_id)
+        gc.collect()
+
+        # Then
+        self.assertEqual(self.registry.get(obj_id).name, '')
+        self.assertEqual(self.registry.pinned, 1)
+
+        # When
+        self.registry.release(obj_id)
+        gc.collect()
+
+        # Then
+        with self.assertRaises(KeyError):
+            self.registry.get(obj_id)
+        self.assertEqual(self.registry.pinned, 0)
+
+    def test_objects_that_cant_be_weakly_referenced(self):
+        # Given
+        obj = [1, 2, 3]
+
+        # When
+        obj_id = self.registry.register(obj, pin=True)
+        self.registry.release(obj_id)
+
+        # Then
+        self.assertIs(self.registry.get(obj_id), obj)
+
+    def test_strong_references_are_bounded(self):
+        # Given
+        self.registry.max_size = 2
+        lists = [[index] for index in range(3)]
+        model = Model()
+        model_id = self.registry.register(model, pin=True)
+
+        # When
+        ids = [self.registry.register(obj) for obj in lists]
+
+        # Then
+        self.assertEqual(self.registry.evictions, 2)
+        self.assertEqual(self.registry.pinned, 1)
+        self.assertIs(self.registry.get(model_id), model)
+        with self.assertRaises(KeyError):
+            self.registry.get(ids[0])
+        self.assertIs(self.registry.get(ids[2]), lists[2])
+
+    def test_pinned_objects_are_not_evicted(self):
+        # Given
+        self.registry.max_size = 3
+        dicts = [dict(index=index) for index in range(5)]
+
+        # When
+        ids = [self.registry.register(obj, pin=True) for obj in dicts]
+
+        # Then
+        self.assertEqual(self.registry.evictions, 0)
+        for obj_id, obj in zip(ids, dicts):
+            self.assertIs(self.registry.get(obj_id), obj)
+
+        # When
+        for obj_id in ids[:3]:
+            self.registry.release(obj_id)
+
+        # Then
+        self.assertEqual(self.registry.evictions, 2)
+        self.assertEqual(self.registry.size, 3)
+        self.assertIs(self.registry.get(ids[2]), dicts[2])
+        self.assertIs(self.registry.get(ids[4]), dicts[4])
+        with self.assertRaises(KeyError):
+            self.registry.get(ids[0])
+
+    def test_release_all(self):
+        # Given
+        model_id = self.registry.register(Model(), pin=True)
+        list_id = self.registry.register([1], pin=True)
+
+        # When
+        self.registry.release_all()
+        gc.collect()
+
+        # Then
+        self.assertEqual(self.registry.pinned, 0)
+        self.assertEqual(self.registry.get(list_id), [1])
+        with self.assertRaises(KeyError):
+            self.registry.get(model_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
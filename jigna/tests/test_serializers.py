@@ -0,0 +1,134 @@
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from jigna.core.serializers import (
+    JSONSerializer, get_available_serializers, get_serializer
+)
+
+
+class TestSerializers(unittest.TestCase):
+
+    def test_all_available_serializers_roundtrip(self):
+        # Given
+        obj = dict(
+            type='instance', value='1234', info=dict(type_name='a.B'),
+            data=[1, 2.5, None, True, u'\u2713 /']
+        )
+
+        for name in get_available_serializers():
+            serializer = get_serializer(name)
+
+            # When
+            data = serializer.dumps(obj)
+
+            # Then
+            self.assertEqual(serializer.loads(data), obj, name)
+            self.assertEqual(isinstance(data, bytes), serializer.binary, name)
+
+    def test_unserializable_object(self):
+        for name in get_available_serializers():
+            serializer = get_serializer(name)
+
+            # When/Then
+            with self.assertRaises(TypeError):
+                serializer.dumps(dict(value=object()))
+
+            # When
+            data = serializer.dumps(
+                dict(value=object()), default=lambda obj: 'default'
+            )
+
+            # Then
+            self.assertEqual(serializer.loads(data), dict(value='default'))
+
+    def test_big_integers(self):
+        # Given
+        obj = dict(value=2**70, values=[1, -2**64])
+
+        for name in get_available_serializers():
+            serializer = get_serializer(name)
+            if serializer.format != 'json':
+                continue
+
+            # When
+            data = serializer.dumps(obj)
+
+            # Then
+            self.assertEqual(data, JSONSerializer().dumps(obj), name)
+
+    @unittest.skipIf(numpy is None, "NumPy not installed")
+    def test_numpy_scalars(self):
+        # Given
+        obj = dict(
+            float64=numpy.float64(2.5), float32=numpy.float32(0.5),
+            int64=numpy.int64(3), bool=numpy.bool_(True)
+        )
+
+        for name in get_available_serializers():
+            serializer = get_serializer(name)
+
+            # When
+            data = serializer.dumps(obj, default=lambda obj: 'default')
+
+            # Then
+            self.assertEqual(
+                serializer.loads(data),
+                dict(float64=2.5, float32=0.5, int64=3, bool=True), name
+            )
+
+    def test_auto_is_a_json_serializer(self):
+        # When
+        serializer = get_serializer()
+
+        # Then
+        self.assertEqual(serializer.format, 'json')
+        self.assertFalse(serializer.binary)
+
+    def test_unknown_serializer(self):
+        with self.assertRaises(ValueError):
+            get_serializer('xml')
+
+    @unittest.skipIf(numpy is None, "NumPy not installed")
+    def test_ndarray_buffers(self):
+        # Given
+        x = numpy.arange(3, dtype='float64')
+        serializer = JSONSerializer()
+
+        # When
+        buffers = []
+        data = serializer.dumps(dict(value=x), buffers)
+
+        # Then
+        self.assertEqual(serializer.loads(data), dict(value=0))
+        self.assertEqual(buffers, [x.tobytes()])
+
+        # When
+        data = serializer.dumps(dict(value=x))
+
+        # Then
+        self.assertEqual(serializer.loads(data), dict(value=[0.0, 1.0, 2.0]))
+
+    @unittest.skipIf(numpy is None, "NumPy not installed")
+    def test_msgpack_sends_ndarray_inline(self):
+        if 'msgpack' not in get_available_serializers():
+            self.skipTest("msgpack not installed")
+
+        # Given
+        x = numpy.arange(3, dtype='int32')
+        serializer = get_serializer('msgpack')
+
+        # When
+        buffers = []
+        data = serializer.dumps(dict(value=x), buffers)
+
+        # Then
+        self.assertEqual(buffers, [])
+        self.assertEqual(serializer.loads(data), dict(value=x.tobytes()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,778 @@
+import gc
+import json
+import threading
+import time
+import unittest
+import weakref
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from tornado import gen
+from traits.api import Any, Array, HasTraits, Str
+
+from jigna.core.concurrent import BoundedExecutor, takes_future
+from jigna.core.serializers import JSONSerializer
+from jigna.server import Bridge, PROTOCOL_VERSION, Server, TYPE_INFO_CACHE
+
+
+class DummyBridge(Bridge):
+    def __init__(self, **traits):
+        super(DummyBridge, self).__init__(**traits)
+        self.events = []
+        self.batches = []
+        self.callbacks = []
+
+    def send_events(self, events):
+        self.batches.append(events)
+        self.events.extend(events)
+
+    def _call_later(self, delay, callable):
+        self.callbacks.append(callable)
+
+    def _send_event(self, event):
+        self.events.append(event)
+
+
+class Model(HasTraits):
+    name = Str
+
+    def wait(self, event):
+        event.wait(5)
+
+    @takes_future
+    def report(self, future):
+        for i in range(1, 4):
+            future.progress = 0.25 * i
+
+    def echo(self, future):
+        return future
+
+    def repeat_name(self, count):
+        self.name = self.name * count
+        return len(self.name)
+
+    @gen.coroutine
+    def fetch(self):
+        yield gen.moment
+        raise gen.Return(self.name)
+
+
+def shout(suffix, name):
+    return dict(name=name.upper() + suffix)
+
+
+def make_server(**traits):
+    return Server(
+        _bridge=DummyBridge(), trait_change_dispatch='same', **traits
+    )
+
+
+def jsonize(obj, buffers=None):
+    return JSONSerializer().dumps(obj, buffers)
+
+
+@unittest.skipIf(numpy is None, "NumPy not installed")
+class TestNDArrayMarshal(unittest.TestCase):
+
+    def setUp(self):
+        self.server = make_server()
+
+    def test_marshal_float_array(self):
+        # Given
+        x = numpy.linspace(0, 1, 6).reshape(2, 3)
+
+        # When
+        marshalled = self.server._marshal(x)
+
+        # Then
+        self.assertEqual(marshalled['type'], 'ndarray')
+        self.assertEqual(
+            marshalled['info'], dict(dtype='float64', shape=[2, 3])
+        )
+
+    def test_marshal_casts_unsupported_dtypes(self):
+        # Given
+        x = numpy.arange(4, dtype='>i8')
+
+        # When
+        marshalled = self.server._marshal(x)
+
+        # Then
+        value = marshalled['value']
+        self.assertEqual(marshalled['info']['dtype'], 'float64')
+        self.assertIn(value.dtype.byteorder, ('<', '='))
+        self.assertEqual(value.tolist(), [0.0, 1.0, 2.0, 3.0])
+
+    def test_marshal_big_integers_warns(self):
+        # Given
+        x = numpy.array([1, 2**53 + 1], dtype='u8')
+
+        # When
+        with self.assertLogs('jigna.server', 'WARNING'):
+            marshalled = self.server._marshal(x)
+
+        # Then
+        self.assertEqual(marshalled['info']['dtype'], 'float64')
+
+    def test_marshal_non_numeric_array_as_primitive(self):
+        # Given
+        x = numpy.array(['a', 'b'])
+
+        # When
+        marshalled = self.server._marshal(x)
+
+        # Then
+        self.assertEqual(marshalled['type'], 'primitive')
+        self.assertEqual(marshalled['value'], ['a', 'b'])
+
+    def test_jsonize_with_buffers(self):
+        # Given
+        x = numpy.arange(3, dtype='int32')
+        event = dict(obj='1', name='x', data=self.server._marshal(x))
+
+        # When
+        buffers = []
+        data = json.loads(jsonize(event, buffers))
+
+        # Then
+        self.assertEqual(data['data']['value'], 0)
+        self.assertEqual(buffers, [x.tobytes()])
+
+    def test_jsonize_without_buffers(self):
+        # Given
+        x = numpy.arange(4, dtype='float32').reshape(2, 2)
+        event = dict(obj='1', name='x', data=self.server._marshal(x))
+
+        # When
+        data = json.loads(jsonize(event))
+
+        # Then
+        self.assertEqual(data['data']['value'], [0.0, 1.0, 2.0, 3.0])
+
+    def test_array_trait_change_event(self):
+        # Given
+        class ArrayModel(HasTraits):
+            x = Array
+
+        model = ArrayModel()
+        self.server.context = {'model': model}
+        self.server._marshal(model)
+
+        # When
+        model.x = numpy.ones(3)
+
+        # Then
+        event = self.server._bridge.events[-1]
+        self.assertEqual(event['name'], 'x')
+        self.assertEqual(event['data']['type'], 'ndarray')
+
+
+class TestEventBatching(unittest.TestCase):
+
+    def setUp(self):
+        self.model = Model()
+        self.bridge = DummyBridge(event_batch_interval=0.0)
+        self.server = Server(
+            _bridge=self.bridge, trait_change_dispatch='same',
+            context={'model': self.model}
+        )
+        self.server._marshal(self.model)
+
+    def test_events_are_sent_as_a_batch(self):
+        # When
+        self.model.name = 'Fred'
+        self.server.send_event(dict(obj='jigna', name='new_type', data={}))
+
+        # Then
+        self.assertEqual(self.bridge.events, [])
+        self.assertEqual(len(self.bridge.callbacks), 1)
+
+        # When
+        self.bridge.callbacks.pop()()
+
+        # Then
+        self.assertEqual(len(self.bridge.batches), 1)
+        names = [event['name'] for event in self.bridge.batches[0]]
+        self.assertEqual(names, ['name', 'new_type'])
+
+    def test_repeated_changes_are_collapsed(self):
+        # When
+        for name in ['a', 'b', 'c']:
+            self.model.name = name
+        self.bridge.callbacks.pop()()
+
+        # Then
+        self.assertEqual(len(self.bridge.events), 1)
+        self.assertEqual(self.bridge.events[0]['data']['value'], 'c')
+
+    def test_changes_to_objects_are_collapsed(self):
+        # Given
+        class Holder(HasTraits):
+            value = Any
+
+        holder = Holder()
+        self.server._marshal(holder)
+        pinned = self.server._registry.pinned
+
+        # When
+        holder.value = 'a'
+        holder.value = Model()
+        holder.value = Model()
+        self.bridge.callbacks.pop()()
+
+        # Then
+        self.assertEqual(len(self.bridge.events), 1)
+        data = self.bridge.events[0]['data']
+        self.assertEqual(data['type'], 'instance')
+        registry = self.server._registry
+        self.assertEqual(data['value'], registry.get_id(holder.value))
+        # The events are sent to every client so the objects aren't pinned.
+        self.assertFalse(data['pinned'])
+        self.assertEqual(registry.pinned, pinned)
+
+    def test_events_are_not_collapsed_across_batches(self):
+        # When
+        self.model.name = 'a'
+        self.bridge.callbacks.pop()()
+        self.model.name = 'b'
+        self.bridge.callbacks.pop()()
+
+        # Then
+        self.assertEqual(len(self.bridge.batches), 2)
+        values = [event['data']['value'] for event in self.bridge.events]
+        self.assertEqual(values, ['a', 'b'])
+
+
+class TestTraitListeners(unittest.TestCase):
+
+    def setUp(self):
+        self.model = Model()
+        self.server = make_server(context={'model': self.model})
+
+    def test_instance_is_hooked_once(self):
+        # Given
+        for i in range(10):
+            self.server._marshal(self.model)
+
+        # When
+        self.model.name = 'Fred'
+
+        # Then
+        self.assertEqual(len(self.server._bridge.events), 1)
+        self.assertEqual(len(self.server._hooked_ids), 1)
+
+    def test_collected_instance_is_unhooked(self):
+        # Given
+        model = Model()
+        ref = weakref.ref(model)
+        obj_id = self.server._marshal(model)['value']
+        self.server._registry.release(obj_id)
+
+        # When
+        del model
+        gc.collect()
+
+        # Then
+        # The server's listener doesn't keep the instance alive.
+        self.assertIsNone(ref())
+        self.assertEqual(self.server._registry.collected, 1)
+        self.assertNotIn(obj_id, self.server._hooked_ids)
+
+    def test_shutdown(self):
+        # Given
+        self.server._marshal(self.model)
+
+        # When
+        self.server.shutdown()
+        self.model.name = 'Fred'
+
+        # Then
+        self.assertEqual(self.server._bridge.events, [])
+
+
+class TestTypeInfo(unittest.TestCase):
+
+    def setUp(self):
+        TYPE_INFO_CACHE.pop(Model, None)
+
+    def tearDown(self):
+        TYPE_INFO_CACHE.pop(Model, None)
+
+    def test_type_info_is_shared_by_servers(self):
+        # Given
+        server = make_server()
+        info = server._marshal(Model())['info']
+
+        # When
+        other_info = make_server()._marshal(Model())['info']
+        server.update_context(dict(kind='update_context'))
+        reconnected_info = server._marshal(Model())['info']
+
+        # Then
+        self.assertIn('name', info['attribute_names'])
+        self.assertIs(
+            other_info['attribute_names'], info['attribute_names']
+        )
+        self.assertIs(
+            reconnected_info['attribute_names'], info['attribute_names']
+        )
+
+    def test_trait_added_invalidates_type_info(self):
+        # Given
+        server = make_server()
+        model = Model()
+        server._marshal(model)
+
+        # When
+        model.add_trait('age', Str)
+        info = server._marshal(model)['info']
+
+        # Then
+        self.assertIn('age', info['attribute_names'])
+
+
+class TestHandleRequest(unittest.TestCase):
+
+    def test_get_instance_attribute(self):
+        # Given
+        model = Model(name='Fred')
+        server = make_server(context={'model': model})
+        request = dict(
+            kind='get_instance_attribute', id=server._register_object(model),
+            attribute_name='name'
+        )
+        message = dict(version=PROTOCOL_VERSION, id=3, payload=request)
+
+        # When
+        response = json.loads(server.handle_request(json.dumps(message)))
+
+        # Then
+        self.assertEqual(response['version'], PROTOCOL_VERSION)
+        self.assertEqual(response['kind'], 'response')
+        self.assertEqual(response['id'], 3)
+        self.assertIsNone(response['payload']['exception'])
+        self.assertEqual(
+            response['payload']['result'],
+            dict(type='primitive', value='Fred', info=None)
+        )
+
+    def test_batch(self):
+        # Given
+        model = Model(name='Fred')
+        server = make_server(context={'model': model})
+        obj_id = server._register_object(model)
+        request = dict(kind='batch', requests=[
+            dict(
+                kind='set_instance_attribute', id=obj_id,
+                attribute_name='name',
+                value=dict(type='primitive', value='Wilma')
+            ),
+            dict(
+                kind='get_instance_attribute', id=obj_id,
+                attribute_name='name'
+            ),
+            dict(
+                kind='get_instance_attribute', id='unknown',
+                attribute_name='name'
+            )
+        ])
+
+        # When
+        response = server.dispatch_request(request)
+
+        # Then
+        self.assertIsNone(response['exception'])
+        responses = response['result']
+        self.assertEqual(len(responses), 3)
+        self.assertEqual(responses[1]['result']['value'], 'Wilma')
+        self.assertIsNone(responses[2]['result'])
+        self.assertIsNotNone(responses[2]['exception'])
+
+    def test_batch_with_bad_requests(self):
+        # Given
+        model = Model(name='Fred')
+        server = make_server(context={'model': model})
+        obj_id = server._register_object(model)
+        get_name = dict(
+            kind='get_instance_attribute', id=obj_id, attribute_name='name'
+        )
+        request = dict(kind='batch', requests=[
+            get_name, dict(kind='no_such_request'), dict(id=obj_id), get_name
+        ])
+
+        # When
+        response = server.dispatch_request(request)
+
+        # Then
+        self.assertIsNone(response['exception'])
+        responses = response['result']
+        self.assertEqual(
+            [sub_response['exception'] is None for sub_response in responses],
+            [True, False, False, True]
+        )
+        self.assertEqual(responses[0]['result']['value'], 'Fred')
+        self.assertEqual(responses[3]['result']['value'], 'Fred')
+
+    def test_get_items(self):
+        # Given
+        server = make_server()
+        values = [Model(name=str(index)) for index in range(5)]
+        items = dict(a=1, b=2, c=3)
+        list_id = server._marshal(values)['value']
+        dict_id = server._marshal(items)['value']
+
+        # When
+        sliced = server.dispatch_request(
+            dict(kind='get_slice', id=list_id, start=1, stop=3)
+        )
+        by_index = server.dispatch_request(
+            dict(kind='get_items', id=list_id, keys=[4, 0])
+        )
+        by_key = server.dispatch_request(
+            dict(kind='get_items', id=dict_id, keys=['c', 'a'])
+        )
+
+        # Then
+        names = [
+            server._unmarshal(value).name for value in sliced['result']
+        ]
+        self.assertEqual(names, ['1', '2'])
+        names = [
+            server._unmarshal(value).name for value in by_index['result']
+        ]
+        self.assertEqual(names, ['4', '0'])
+        self.assertEqual(
+            [value['value'] for value in by_key['result']], [3, 1]
+        )
+
+    def test_release_objects(self):
+        # Given
+        server = make_server()
+        model = Model()
+        obj_id = server._marshal(model)['value']
+        server._marshal(model)
+        request = dict(kind='release_objects', ids={obj_id: 2})
+        message = dict(version=PROTOCOL_VERSION, id=1, payload=request)
+
+        # When
+        response = json.loads(server.handle_request(json.dumps(message)))
+
+        # Then
+        self.assertIsNone(response['payload']['exception'])
+        self.assertEqual(server._registry.pinned, 0)
+        self.assertIs(server._registry.get(obj_id), model)
+
+    def test_call_instance_method_thread_queue_full(self):
+        # Given
+        model = Model()
+        executor = BoundedExecutor(max_workers=1, max_queued=1)
+        server = make_server(context={'model': model}, executor=executor)
+        event = threading.Event()
+        request = dict(
+            kind='call_instance_method_thread', method_name='wait',
+            id=server._register_object(model), args=[server._marshal(event)]
+        )
+
+        # When
+        responses = [server.dispatch_request(request) for i in range(3)]
+        event.set()
+        server.shutdown()
+
+        # Then
+        self.assertIsNone(responses[0]['exception'])
+        self.assertIsNone(responses[1]['exception'])
+        self.assertIn('ExecutorFull', responses[2]['exception'])
+        self.assertEqual(executor.rejected, 1)
+
+    def test_cancel_future(self):
+        # Given
+        model = Model()
+        executor = BoundedExecutor(max_workers=1)
+        server = make_server(context={'model': model}, executor=executor)
+        event = threading.Event()
+        request = dict(
+            kind='call_instance_method_thread', method_name='wait',
+            id=server._register_object(model), args=[server._marshal(event)]
+        )
+        running_id = server.dispatch_request(request)['result']['value']
+        future_id = server.dispatch_request(request)['result']['value']
+        running = server._futures[str(running_id)].concurrent_future
+        for i in range(500):
+            if running.running():
+                break
+            time.sleep(0.01)
+
+        # When
+        response = server.dispatch_request(
+            dict(kind='cancel_future', future_id=future_id)
+        )
+        running_response = server.dispatch_request(
+            dict(kind='cancel_future', future_id=running_id)
+        )
+        event.set()
+        server.shutdown()
+
+        # Then
+        self.assertTrue(response['result']['value'])
+        self.assertFalse(running_response['result']['value'])
+        self.assertIn(
+            dict(obj=str(future_id), name='cancelled'),
+            server._bridge.events
+        )
+
+    def test_future_is_only_passed_to_marked_methods(self):
+        # Given
+        model = Model()
+        server = make_server(context={'model': model})
+        request = dict(
+            kind='call_instance_method_thread', method_name='echo',
+            id=server._register_object(model), args=[server._marshal('Fred')]
+        )
+
+        # When
+        response = server.dispatch_request(request)
+        event = self._wait_for_event(server, 'done')
+        server.shutdown()
+
+        # Then
+        self.assertIsNone(response['exception'])
+        self.assertEqual(event['data'], 'Fred')
+
+    def test_progress_events_are_throttled(self):
+        # Given
+        model = Model()
+        server = make_server(context={'model': model}, progress_interval=10.0)
+        request = dict(
+            kind='call_instance_method_thread', method_name='report',
+            id=server._register_object(model), args=[]
+        )
+        bridge = server._bridge
+
+        # When
+        server.dispatch_request(request)
+        for i in range(500):
+            if any(event['name'] == 'done' for event in bridge.events):
+                break
+            time.sleep(0.01)
+        server.shutdown()
+
+        # Then
+        progress = [
+            event['data']['progress'] for event in bridge.events
+            if event['name'] == 'progress'
+        ]
+        # The latest progress is sent just before the 'done' event.
+        self.assertEqual(progress, [0.25, 1.0])
+        self.assertEqual(bridge.events[-1]['name'], 'done')
+        self.assertEqual(len(bridge.callbacks), 1)
+
+        # When
+        count = len(bridge.events)
+        bridge.callbacks[0]()
+
+        # Then
+        self.assertEqual(len(bridge.events), count)
+
+    def test_call_coroutine_method(self):
+        # Given
+        model = Model(name='Fred')
+        server = make_server(context={'model': model})
+        request = dict(
+            kind='call_instance_method', method_name='fetch',
+            id=server._register_object(model), args=[]
+        )
+
+        # When
+        response = server.dispatch_request(request)
+
+        # Then
+        self.assertIsNone(response['exception'])
+        self.assertEqual(response['result']['value'], 'Fred')
+
+    def test_call_coroutine_method_in_thread(self):
+        # Given
+        model = Model(name='Fred')
+        server = make_server(context={'model': model})
+        request = dict(
+            kind='call_instance_method_thread', method_name='fetch',
+            id=server._register_object(model), args=[]
+        )
+
+        # When
+        response = server.dispatch_request(request)
+        event = self._wait_for_event(server, 'done')
+        server.shutdown()
+
+        # Then
+        self.assertIsNone(response['exception'])
+        self.assertEqual(event['data'], 'Fred')
+
+    def test_marshalled_future_result(self):
+        # Given
+        model = Model(name='Fred')
+        server = make_server(context={'model': model})
+
+        # When
+        server._start_future(model.fetch, [], 'fetch', marshal_result=True)
+        event = self._wait_for_event(server, 'done')
+        server.shutdown()
+
+        # Then
+        self.assertEqual(event['data'], server._marshal('Fred'))
+
+    def _wait_for_event(self, server, name):
+        for i in range(1000):
+            for event in server._bridge.events:
+                if event['name'] == name:
+                    return event
+
+            time.sleep(0.01)
+
+    def test_call_instance_method_process(self):
+        # Given
+        model = Model(name='ab')
+        server = make_server(context={'model': model})
+        request = dict(
+            kind='call_instance_method_process', method_name='repeat_name',
+            id=server._register_object(model), args=[server._marshal(3)]
+        )
+
+        # When
+        response = server.dispatch_request(request)
+        event = self._wait_for_event(server, 'done')
+        server.shutdown()
+
+        # Then
+        self.assertIsNone(response['exception'])
+        self.assertEqual(event['data'], 6)
+        self.assertEqual(model.name, 'ababab')
+
+    def test_process_call_does_not_use_a_worker_thread(self):
+        # Given
+        model = Model(name='ab')
+        executor = BoundedExecutor(max_workers=1, max_queued=0)
+        server = make_server(context={'model': model}, executor=executor)
+        event = threading.Event()
+        obj_id = server._register_object(model)
+        server.dispatch_request(dict(
+            kind='call_instance_method_thread', method_name='wait',
+            id=obj_id, args=[server._marshal(event)]
+        ))
+
+        # When
+        response = server.dispatch_request(dict(
+            kind='call_instance_method_process', method_name='repeat_name',
+            id=obj_id, args=[server._marshal(2)]
+        ))
+        done = self._wait_for_event(server, 'done')
+        event.set()
+        server.shutdown()
+
+        # Then
+        self.assertIsNone(response['exception'])
+        self.assertEqual(done['data'], 4)
+        self.assertEqual(model.name, 'abab')
+
+    def test_call_process_function(self):
+        # Given
+        model = Model(name='fred')
+        server = make_server(
+            context={'model': model},
+            process_functions={'repeat_name': (shout, ['name'])}
+        )
+        request = dict(
+            kind='call_instance_method_process', method_name='repeat_name',
+            id=server._register_object(model), args=[server._marshal('!')]
+        )
+
+        # When
+        server.dispatch_request(request)
+        self._wait_for_event(server, 'done')
+        server.shutdown()
+
+        # Then
+        self.assertEqual(model.name, 'FRED!')
+
+    @unittest.skipIf(numpy is None, "NumPy not installed")
+    def test_numpy_scalars_and_big_integers(self):
+        # Given
+        class Stats(HasTraits):
+            value = Any
+
+            def mean(self):
+                return numpy.float64(3.0)
+
+            def count(self):
+                return 2**70
+
+        stats = Stats(value=numpy.float64(2.5))
+        server = make_server(context={'stats': stats})
+        obj_id = server._register_object(stats)
+        requests = [
+            dict(
+                kind='get_instance_attribute', id=obj_id,
+                attribute_name='value'
+            ),
+            dict(
+                kind='call_instance_method', id=obj_id, method_name='mean',
+                args=[]
+            ),
+            dict(
+                kind='call_instance_method', id=obj_id, method_name='count',
+                args=[]
+            ),
+        ]
+
+        for request in requests:
+            message = dict(version=PROTOCOL_VERSION, id=1, payload=request)
+
+            # When
+            response = json.loads(server.handle_request(json.dumps(message)))
+
+            # Then
+            self.assertIsNone(response['payload']['exception'])
+            self.assertIn(
+                response['payload']['result']['value'], [2.5, 3.0, 2**70]
+            )
+
+    @unittest.skipIf(numpy is None, "NumPy not installed")
+    def test_numpy_scalar_events(self):
+        # Given
+        class Stats(HasTraits):
+            value = Any
+
+        stats = Stats()
+        server = make_server(context={'stats': stats})
+        bridge = server._bridge
+        bridge.serializer = server.serializer
+        server._marshal(stats)
+
+        # When
+        stats.value = numpy.float64(2.5)
+        stats.value = 2**70
+        events = server.serializer.loads(
+            bridge._serialize_events(bridge.events)
+        )['payload']
+
+        # Then
+        values = [event['data']['value'] for event in events]
+        self.assertEqual(values, [2.5, 2**70])
+
+    def test_unsupported_protocol_version(self):
+        # Given
+        server = make_server()
+        message = dict(version=0, id=1, payload=dict(kind='update_context'))
+
+        # When
+        response = json.loads(server.handle_request(json.dumps(message)))
+
+        # Then
+        self.assertIsNotNone(response['payload']['exception'])
+        self.assertIsNone(response['payload']['result'])
+
+
+if __name__ == '__main__':
+    unittest.main()
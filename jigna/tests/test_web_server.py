@@ -1,3 +1,4 @@
+import gzip
 import os
 import sys
 import tempfile
@@ -5,10 +6,19 @@ import unittest
 
 import mock
 
+from tornado import gen
+from tornado.ioloop import IOLoop
+from tornado.testing import AsyncHTTPTestCase, AsyncTestCase, gen_test
 from tornado.web import Application
-from tornado.httputil import HTTPServerRequest
+from tornado.httputil import HTTPHeaders, HTTPServerRequest
 
-from jigna.web_server import MainHandler, normalize_slice
+from traits.api import HasTraits, Int, List
+
+from jigna.core.asset_cache import AssetCache
+from jigna.server import PROTOCOL_VERSION
+from jigna.web_server import (
+    AsyncWebServer, MainHandler, WebServer, normalize_slice
+)
 
 # A dummy image to write and test with.
 DATA = b"""\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x05\x00\x00\x00\x05\x08\x06\x00\x00\x00\x8do&\xe5\x00\x00\x00\x04gAMA\x00\x00\xb1\x8f\x0b\xfca\x05\x00\x00\x00 cHRM\x00\x00z&\x00\x00\x80\x84\x00\x00\xfa\x00\x00\x00\x80\xe8\x00\x00u0\x00\x00\xea`\x00\x00:\x98\x00\x00\x17p\x9c\xbaQ<\x00\x00\x00\tpHYs\x00\x00\x0b\x13\x00\x00\x0b\x13\x01\x00\x9a\x9c\x18\x00\x00\x01YiTXtXML:com.adobe.xmp\x00\x00\x00\x00\x00<x:xmpmeta xmlns:x="adobe:ns:meta/" x:xmptk="XMP Core 5.4.0">\n   <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">\n      <rdf:Description rdf:about=""\n            xmlns:tiff="http://ns.adobe.com/tiff/1.0/">\n         <tiff:Orientation>1</tiff:Orientation>\n      </rdf:Description>\n   </rdf:RDF>\n</x:xmpmeta>\nL\xc2\'Y\x00\x00\x00tIDAT\x08\x1d\x01i\x00\x96\xff\x01\x00\x1cj\xff}e0\x00;8*\x00\xcb\xcd\xd9\x00\xa2\xad\xd3\x00\x04gP!\x00<9)\x00\x03\x03\x03\x00YVC\x00\xd7\xd9\xe5\x00\x04\x08\x08\x01\x00\xb0\xb4\xc3\x00\n\x08\r\x00\x0f\x0e\x08\x00\xf7\xf8\xfd\x00\x04\xe1\xe3\xf1\x0030\x18\x00\xfc\xfb\x03\x00>>0\x00\x04\x05\x03\x00\x03\xef\xff0\x80\xef\xed\xf3\x00>:$\x00\xdc\xdc\xe5\x00y\x88\xc9\x00\x9a\xa5"\x98\x19\x929\xa9\x00\x00\x00\x00IEND\xaeB`\x82"""
@@ -46,14 +56,23 @@ class TestMainHandler(unittest.TestCase):
         with open(self.tmpfile, 'wb') as fp:
             fp.write(DATA)
 
-    def _make_request(self, path):
+    def _make_request(self, path, **headers):
         request = mock.MagicMock(spec=HTTPServerRequest)()
         if sys.platform.startswith('win'):
             request.path = '/' + path
         else:
             request.path = path
+        request.headers = HTTPHeaders(headers)
         return request
 
+    def _get(self, handler):
+        # Files are looked up in a thread, so run the handler on an IOLoop.
+        io_loop = IOLoop()
+        try:
+            io_loop.run_sync(handler.get)
+        finally:
+            io_loop.close()
+
     def test_get_root(self):
         # Given
         request = self._make_request('')
@@ -62,7 +81,7 @@ class TestMainHandler(unittest.TestCase):
 
         # When
         h = TestableMainHandler(app, request, server=server)
-        h.get()
+        self._get(h)
 
         # Then
         self.assertEqual(h.test_data, b'html')
@@ -76,7 +95,7 @@ class TestMainHandler(unittest.TestCase):
 
         # When
         h = TestableMainHandler(app, request, server=server)
-        h.get()
+        self._get(h)
 
         # Then
         self.assertEqual(h.test_data, b'hello')
@@ -90,11 +109,215 @@ class TestMainHandler(unittest.TestCase):
 
         # When
         h = TestableMainHandler(app, request, server=server)
-        h.get()
+        self._get(h)
+
+        # Then
+        self.assertEqual(h.test_data, DATA)
+
+    def test_get_not_modified(self):
+        # Given
+        self._make_text_data()
+        app = Application()
+        server = DummyServer()
+        h = TestableMainHandler(
+            app, self._make_request(self.tmpfile), server=server
+        )
+        self._get(h)
+        etag = h._headers['Etag']
+        request = self._make_request(self.tmpfile, **{'If-None-Match': etag})
+
+        # When
+        h = TestableMainHandler(app, request, server=server)
+        self._get(h)
+
+        # Then
+        self.assertEqual(h.get_status(), 304)
+        self.assertFalse(hasattr(h, 'test_data'))
+        self.assertEqual(h._headers['Cache-Control'], 'no-cache')
+        self.assertEqual(h._headers['Vary'], 'Accept-Encoding')
+
+    def test_reversed_range_of_cached_file(self):
+        # Given
+        self._make_text_data()
+        request = self._make_request(self.tmpfile, Range='bytes=3-1')
+        app = Application()
+        server = DummyServer()
+
+        # When
+        h = TestableMainHandler(app, request, server=server)
+        self._get(h)
+
+        # Then
+        self.assertEqual(h.get_status(), 200)
+        self.assertNotIn('Content-Range', h._headers)
+        self.assertEqual(h.test_data, b'hello')
+
+    def test_range_of_text_data_varies_on_encoding(self):
+        # Given
+        self._make_text_data()
+        request = self._make_request(
+            self.tmpfile, Range='bytes=1-2', **{'Accept-Encoding': 'gzip'}
+        )
+        app = Application()
+        server = DummyServer()
+
+        # When
+        h = TestableMainHandler(app, request, server=server)
+        self._get(h)
+
+        # Then
+        self.assertEqual(h.get_status(), 206)
+        self.assertEqual(h.test_data, b'el')
+        self.assertNotIn('Content-Encoding', h._headers)
+        self.assertEqual(h._headers['Vary'], 'Accept-Encoding')
+
+    def test_get_gzipped_text_data(self):
+        # Given
+        self._make_text_data()
+        request = self._make_request(
+            self.tmpfile, **{'Accept-Encoding': 'gzip, deflate'}
+        )
+        app = Application()
+        server = DummyServer()
+
+        # When
+        h = TestableMainHandler(app, request, server=server)
+        self._get(h)
 
         # Then
+        self.assertEqual(h._headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(h.test_data), b'hello')
+
+    def test_binary_data_is_not_gzipped(self):
+        # Given
+        self._make_binary_data()
+        request = self._make_request(
+            self.tmpfile, **{'Accept-Encoding': 'gzip'}
+        )
+        app = Application()
+        server = DummyServer()
+
+        # When
+        h = TestableMainHandler(app, request, server=server)
+        self._get(h)
+
+        # Then
+        self.assertNotIn('Content-Encoding', h._headers)
         self.assertEqual(h.test_data, DATA)
 
+    def test_modified_file_is_read_again(self):
+        # Given
+        self._make_text_data()
+        app = Application()
+        server = DummyServer()
+        h = TestableMainHandler(
+            app, self._make_request(self.tmpfile), server=server
+        )
+        self._get(h)
+        with open(self.tmpfile, 'w') as fp:
+            fp.write('goodbye')
+
+        # When
+        h = TestableMainHandler(
+            app, self._make_request(self.tmpfile), server=server
+        )
+        self._get(h)
+
+        # Then
+        self.assertEqual(h.test_data, b'goodbye')
+
+
+class StreamingMainHandler(MainHandler):
+    asset_cache = AssetCache(max_file_size=16)
+    chunk_size = 10
+
+
+class TestFileStreaming(AsyncHTTPTestCase):
+
+    def setUp(self):
+        self.fd, self.tmpfile = tempfile.mkstemp('.bin')
+        self.data = bytes(bytearray(range(256))) * 4
+        with open(self.tmpfile, 'wb') as fp:
+            fp.write(self.data)
+
+        super(TestFileStreaming, self).setUp()
+
+    def tearDown(self):
+        super(TestFileStreaming, self).tearDown()
+        os.close(self.fd)
+        os.remove(self.tmpfile)
+
+    def get_app(self):
+        return Application(
+            [(r".*", StreamingMainHandler, dict(server=DummyServer()))]
+        )
+
+    def _fetch(self, **headers):
+        path = self.tmpfile.replace(os.sep, '/').lstrip('/')
+        return self.fetch('/' + path, headers=headers)
+
+    def test_stream_big_file(self):
+        # When
+        response = self._fetch()
+
+        # Then
+        self.assertEqual(response.code, 200)
+        self.assertEqual(response.body, self.data)
+        self.assertEqual(response.headers['Accept-Ranges'], 'bytes')
+
+    def test_range(self):
+        # When
+        response = self._fetch(Range='bytes=100-199')
+
+        # Then
+        self.assertEqual(response.code, 206)
+        self.assertEqual(response.body, self.data[100:200])
+        self.assertEqual(
+            response.headers['Content-Range'], 'bytes 100-199/1024'
+        )
+
+    def test_suffix_range(self):
+        # When
+        response = self._fetch(Range='bytes=-24')
+
+        # Then
+        self.assertEqual(response.code, 206)
+        self.assertEqual(response.body, self.data[-24:])
+
+    def test_reversed_range_is_ignored(self):
+        # When
+        response = self._fetch(Range='bytes=500-100')
+
+        # Then
+        self.assertEqual(response.code, 200)
+        self.assertEqual(response.body, self.data)
+        self.assertNotIn('Content-Range', response.headers)
+
+    def test_missing_file(self):
+        # When
+        response = self.fetch('/no/such/file.bin')
+
+        # Then
+        self.assertEqual(response.code, 404)
+
+    def test_unsatisfiable_range(self):
+        # When
+        response = self._fetch(Range='bytes=2000-')
+
+        # Then
+        self.assertEqual(response.code, 416)
+        self.assertEqual(response.headers['Content-Range'], 'bytes */1024')
+
+    def test_not_modified(self):
+        # Given
+        etag = self._fetch().headers['Etag']
+
+        # When
+        response = self._fetch(**{'If-None-Match': etag})
+
+        # Then
+        self.assertEqual(response.code, 304)
+
 
 class TestNormalizeSlice(unittest.TestCase):
     def test_simple_slice(self):
@@ -191,5 +414,128 @@ class TestNormalizeSlice(unittest.TestCase):
         self.assertEqual(data[s], data[s1][::-1])
 
 
+class Numbers(HasTraits):
+    values = List(Int)
+
+
+class TestListPaging(unittest.TestCase):
+
+    def setUp(self):
+        self.numbers = Numbers(values=list(range(25)))
+        self.server = AsyncWebServer(
+            context={'numbers': self.numbers}, list_page_size=10
+        )
+
+    def test_long_list_is_sent_in_pages(self):
+        # When
+        marshalled = self.server._marshal(self.numbers.values)
+
+        # Then
+        info = marshalled['info']
+        self.assertEqual(info['length'], 25)
+        self.assertEqual(info['page_size'], 10)
+        self.assertEqual(
+            [item['value'] for item in info['data']], list(range(10))
+        )
+
+    def test_short_list_is_sent_in_full(self):
+        # Given
+        self.server.list_page_size = 0
+
+        # When
+        info = self.server._marshal(self.numbers.values)['info']
+
+        # Then
+        self.assertEqual(len(info['data']), 25)
+        self.assertNotIn('page_size', info)
+
+    def test_get_slice(self):
+        # Given
+        obj_id = self.server._marshal(self.numbers.values)['value']
+        request = dict(kind='get_slice', id=obj_id, start=20, stop=30)
+
+        # When
+        response = self.server.dispatch_request(request)
+
+        # Then
+        self.assertIsNone(response['exception'])
+        self.assertEqual(
+            [item['value'] for item in response['result']],
+            list(range(20, 25))
+        )
+
+
+    def test_items_event_does_not_pin_objects(self):
+        # Given
+        self.server._marshal(self.numbers)
+        pinned = self.server._registry.pinned
+
+        # When
+        with mock.patch.object(self.server, 'send_event') as send_event:
+            self.numbers.values.append(25)
+
+        # Then
+        data = send_event.call_args[0][0]['data']
+        self.assertEqual(data['type'], 'list')
+        self.assertFalse(data['pinned'])
+        self.assertEqual(self.server._registry.pinned, pinned)
+
+
+class Fetcher(HasTraits):
+    @gen.coroutine
+    def fetch(self, value, delay):
+        yield gen.sleep(delay)
+        raise gen.Return(value * 2)
+
+
+class TestCoroutineMethods(AsyncTestCase):
+
+    def setUp(self):
+        super(TestCoroutineMethods, self).setUp()
+        self.fetcher = Fetcher()
+        self.server = WebServer(context={'fetcher': self.fetcher})
+        self.obj_id = self.server._register_object(self.fetcher)
+
+    def _make_message(self, value, delay=0.01):
+        request = dict(
+            kind='call_instance_method', id=self.obj_id, method_name='fetch',
+            args=[self.server._marshal(value), self.server._marshal(delay)]
+        )
+        return dict(version=PROTOCOL_VERSION, id=1, payload=request)
+
+    @gen_test
+    def test_coroutine_method_runs_on_ioloop(self):
+        # When
+        responses = yield [
+            self.server.handle_message_async(self._make_message(i, 0.1))
+            for i in range(100)
+        ]
+
+        # Then
+        results = [
+            self.server.serializer.loads(response)['payload']['result']
+            for response in responses
+        ]
+        self.assertEqual(
+            [result['value'] for result in results],
+            [i * 2 for i in range(100)]
+        )
+
+    @gen_test
+    def test_coroutine_method_in_batch(self):
+        # Given
+        message = self._make_message(21)
+        message['payload'] = dict(
+            kind='batch', requests=[message['payload']]
+        )
+
+        # When
+        response = yield self.server.handle_message_async(message)
+
+        # Then
+        payload = self.server.serializer.loads(response)['payload']
+        self.assertEqual(payload['result'][0]['result']['value'], 42)
+
+
 if __name__ == '__main__':
     unittest.main()
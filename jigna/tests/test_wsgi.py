@@ -0,0 +1,143 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from jigna.core.wsgi import FileLoader, get_range
+
+
+class TestGetRange(unittest.TestCase):
+
+    def test_ranges(self):
+        self.assertEqual(get_range(None, 10), None)
+        self.assertEqual(get_range('bytes=2-4', 10), (2, 5))
+        self.assertEqual(get_range(b'bytes=2-', 10), (2, 10))
+        self.assertEqual(get_range('bytes=-3', 10), (7, 10))
+        self.assertEqual(get_range('bytes=5-100', 10), (5, 10))
+
+    def test_unsupported_ranges(self):
+        self.assertEqual(get_range('bytes=0-1,4-5', 10), None)
+        self.assertEqual(get_range('bytes=a-b', 10), None)
+        self.assertEqual(get_range('bytes=4-2', 10), None)
+        self.assertEqual(get_range('items=1-2', 10), None)
+
+    def test_unsatisfiable_ranges(self):
+        start, end = get_range('bytes=10-', 10)
+        self.assertGreaterEqual(start, 10)
+        start, end = get_range('bytes=-0', 10)
+        self.assertGreaterEqual(start, 10)
+
+
+class TestFileLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.data = bytes(bytearray(range(256))) * 4
+        with open(os.path.join(self.root, 'data.bin'), 'wb') as fp:
+            fp.write(self.data)
+
+        self.loader = FileLoader(root=self.root, chunk_size=100)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _get(self, **env):
+        env.setdefault('PATH_INFO', '/data.bin')
+        response = {}
+
+        def start_response(status, headers):
+            response['status'] = status
+            response['headers'] = dict(headers)
+
+        chunks = list(self.loader(env, start_response))
+        return response['status'], response['headers'], chunks
+
+    def test_cached_file(self):
+        # When
+        status, headers, chunks = self._get()
+        self._get()
+
+        # Then
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(b''.join(chunks), self.data)
+        self.assertEqual(headers['Content-Length'], '1024')
+        self.assertEqual(self.loader.asset_cache.hits, 1)
+
+    def test_streamed_file(self):
+        # Given
+        self.loader.asset_cache.max_file_size = 512
+
+        # When
+        status, headers, chunks = self._get()
+
+        # Then
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(len(chunks), 11)
+        self.assertEqual(b''.join(chunks), self.data)
+
+    def test_memory_mapped_range(self):
+        # Given
+        self.loader.asset_cache.max_file_size = 512
+        self.loader.mmap_threshold = 0
+
+        # When
+        status, headers, chunks = self._get(HTTP_RANGE='bytes=100-349')
+
+        # Then
+        self.assertEqual(status, '206 Partial Content')
+        self.assertEqual(headers['Content-Range'], 'bytes 100-349/1024')
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(b''.join(chunks), self.data[100:350])
+
+    def test_file_wrapper(self):
+        # Given
+        self.loader.asset_cache.max_file_size = 512
+
+        def file_wrapper(f, block_size):
+            self.addCleanup(f.close)
+            return [f.read()]
+
+        # When
+        status, headers, chunks = self._get(
+            **{'wsgi.file_wrapper': file_wrapper}
+        )
+
+        # Then
+        self.assertEqual(chunks, [self.data])
+
+    def test_unsatisfiable_range(self):
+        # When
+        status, headers, chunks = self._get(HTTP_RANGE='bytes=2000-')
+
+        # Then
+        self.assertTrue(status.startswith('416'))
+        self.assertEqual(headers['Content-Range'], 'bytes */1024')
+
+    def test_callable_override(self):
+        # Given
+        calls = []
+
+        def bundle():
+            calls.append(1)
+            return b'jigna'
+
+        self.loader.overrides = {'jigna.js': bundle}
+
+        # When
+        status, headers, chunks = self._get(PATH_INFO='/jigna.js')
+
+        # Then
+        self.assertEqual(chunks, [b'jigna'])
+        self.assertEqual(len(calls), 1)
+        self.assertIn('javascript', headers['Content-Type'])
+
+    def test_missing_file(self):
+        # When
+        status, headers, chunks = self._get(PATH_INFO='/missing.txt')
+
+        # Then
+        self.assertTrue(status.startswith('404'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,15 @@
 # Standard library imports
+from collections import deque
+import logging
 import sys
+import threading
 
 # Local imports
 from ..qt import QtGui, QtCore
 
+# Logger.
+logger = logging.getLogger(__name__)
+
 def ui_handler(handler, *args, **kw):
     """ Handles UI notification handler requests that occur on a thread other
     than the UI thread.
@@ -18,7 +24,7 @@ def set_trait_later(obj, trait_name, value):
 def invoke_later(callable, *args, **kw):
     """ Invoke the callable in the GUI thread.
     """
-    _FutureCall(0, callable, *args, **kw)
+    _Dispatcher.instance().post(callable, *args, **kw)
 
 def do_after(ms, callable, *args, **kw):
     """ Invoke the callable after the given number of milliseconds.
@@ -33,67 +39,83 @@ def process_events():
 
 #### Private protocol #########################################################
 
-class _FutureCall(QtCore.QObject):
-    """ This is a helper class to facilitate execution of a function in the
-    future (after all events are finished processing) in the GUI thread.
-    """
+class _Dispatcher(QtCore.QObject):
+    """ Calls the callables queued from any thread in the GUI thread.
 
-    # Keep a list of references so that they don't get garbage collected.
-    _calls = []
+    A single event is posted for all the callables queued between two
+    wakeups of the GUI event loop and they are called in order.
 
-    # Manage access to the list of instances.
-    _calls_mutex = QtCore.QMutex()
+    """
 
-    # A new Qt event type for _FutureCalls
+    # A new Qt event type for the dispatcher.
     _gui_event = QtCore.QEvent.Type(QtCore.QEvent.registerEventType())
 
-    def __init__(self, ms, callable, *args, **kw):
-        super(_FutureCall, self).__init__()
+    # The dispatcher (created the first time that it is needed).
+    _instance = None
+
+    # Guards the creation of the dispatcher.
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        """ Return the dispatcher.
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                dispatcher = cls()
+                # Move to the main GUI thread.
+                dispatcher.moveToThread(QtGui.QApplication.instance().thread())
+                cls._instance = dispatcher
+
+        return cls._instance
+
+    def __init__(self):
+        super(_Dispatcher, self).__init__()
+
+        # The queued (callable, args, kw), oldest first.
+        self._pending = deque()
 
-        # Save the arguments.
-        self._ms = ms
-        self._callable = callable
-        self._args = args
-        self._kw = kw
+        # Has an event been posted that hasn't been handled yet?
+        self._posted = False
+        self._posted_lock = threading.Lock()
 
-        # Save the instance.
-        self._calls_mutex.lock()
-        self._calls.append(self)
-        self._calls_mutex.unlock()
+    def post(self, callable, *args, **kw):
+        """ Queue a callable to be called in the GUI thread.
+        """
+        self._pending.append((callable, args, kw))
 
-        # Move to the main GUI thread.
-        self.moveToThread(QtGui.QApplication.instance().thread())
+        with self._posted_lock:
+            if self._posted:
+                return
+            self._posted = True
 
-        # Post an event to be dispatched on the main GUI thread. Note that
-        # we do not call QTimer.singleShot here, which would be simpler, because
-        # that only works on QThreads. We want regular Python threads to work.
-        event = QtCore.QEvent(self._gui_event)
-        QtGui.QApplication.postEvent(self, event)
-        QtGui.QApplication.sendPostedEvents()
+        # Note that we do not call QTimer.singleShot here, which would be
+        # simpler, because that only works on QThreads. We want regular Python
+        # threads to work.
+        QtGui.QApplication.postEvent(self, QtCore.QEvent(self._gui_event))
 
     def event(self, event):
         """ QObject event handler.
         """
         if event.type() == self._gui_event:
-            # Invoke the callable (puts it at the end of the event queue)
-            QtCore.QTimer.singleShot(self._ms, self._dispatch)
+            self._dispatch()
             return True
 
-        return super(_FutureCall, self).event(event)
+        return super(_Dispatcher, self).event(event)
 
     def _dispatch(self):
-        """ Invoke the callable.
-        """
-        try:
-            self._callable(*self._args, **self._kw)
-        finally:
-            self._finished()
-
-    def _finished(self):
-        """ Remove the call from the list, so it can be garbage collected.
+        """ Call all the queued callables.
         """
-        self._calls_mutex.lock()
-        try:
-            self._calls.remove(self)
-        finally:
-            self._calls_mutex.unlock()
\ No newline at end of file
+        # Anything queued from now on needs another event.
+        with self._posted_lock:
+            self._posted = False
+
+        # Callables queued by these ones wait for the next event (so that a
+        # callable that queues itself can't starve the event loop).
+        pending = self._pending
+        for i in range(len(pending)):
+            callable, args, kw = pending.popleft()
+            try:
+                callable(*args, **kw)
+            except Exception:
+                logger.exception('Error in GUI thread call to %r', callable)
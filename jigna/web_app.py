@@ -13,6 +13,7 @@ from os.path import join
 from tornado import web
 
 # Local Library
+from .core.serializers import Serializer, get_serializer
 from .web_server import WebServer, AsyncWebServer
 
 
@@ -22,7 +23,8 @@ class WebApp(web.Application):
 
     def __init__(self, handlers=None, default_host="", transforms=None,
                  context=None, template=None, trait_change_dispatch="same",
-                 async=False, **kw):
+                 async=False, event_batch_interval=None, serializer='auto',
+                 **kw):
 
         if template is not None:
             template.async = async
@@ -30,6 +32,10 @@ class WebApp(web.Application):
         self.template = template
         self.trait_change_dispatch = trait_change_dispatch
         self.async = async
+        self.event_batch_interval = event_batch_interval
+        if not isinstance(serializer, Serializer):
+            serializer = get_serializer(serializer)
+        self.serializer = serializer
 
         if handlers is None:
             handlers = []
@@ -51,7 +57,9 @@ class WebApp(web.Application):
             base_url              = join(os.getcwd(), self.template.base_url),
             html                  = self.template.html,
             context               = self.context,
-            trait_change_dispatch = self.trait_change_dispatch
+            trait_change_dispatch = self.trait_change_dispatch,
+            event_batch_interval  = self.event_batch_interval,
+            serializer            = self.serializer
         )
 
         return server.handlers
@@ -8,7 +8,9 @@
 
 # Standard library.
 import json
+import logging
 import mimetypes
+import os
 from os.path import abspath, dirname, join
 import threading
 import traceback
@@ -19,18 +21,30 @@ except ImportError:
     from urllib.parse import unquote
 
 # 3rd party library.
-from tornado.websocket import WebSocketHandler
-from tornado.web import Application, RequestHandler, StaticFileHandler
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from tornado import gen
+from tornado.concurrent import is_future
+from tornado.websocket import WebSocketClosedError, WebSocketHandler
+from tornado.web import (
+    Application, HTTPError, RequestHandler, StaticFileHandler
+)
 from tornado.ioloop import IOLoop
 
 # Enthought library.
 from traits.api import (
-    Bool, List, Str, Instance, TraitDictEvent, TraitListEvent
+    Bool, Int, List, Str, Instance, TraitDictEvent, TraitListEvent
 )
 
 # Jigna library.
-from jigna.server import Bridge, Server
-from jigna.core.wsgi import guess_type
+from jigna.server import Bridge, Server, serialize_message
+from jigna.core.asset_cache import AssetCache
+from jigna.core.wsgi import get_range, guess_type
+
+# Logging.
+logger = logging.getLogger(__name__)
 
 #: Path to jigna.js file
 JIGNA_JS_FILE = join(abspath(dirname(__file__)), 'js', 'dist', 'jigna.js')
@@ -68,31 +82,16 @@ class WebBridge(Bridge):
 
     #### 'Bridge' protocol ####################################################
 
-    def send_event(self, event):
-        """ Send an event. """
+    def send_events(self, events):
+        """ Send a batch of events. """
 
-        # Tornado does not support multiple threads calling send_message.
-        # Instead one should add a callback on the IOLoop instance as done
-        # below.  See:
-        # http://www.tornadoweb.org/en/stable/web.html?highlight=thread#thread-safety-notes
-
-        main_thread = isinstance(
-            threading.current_thread(), threading._MainThread
+        # The raw data of any NumPy arrays in the events is sent as binary
+        # messages just before the events themselves.
+        buffers = []
+        self._write_messages(
+            buffers, self._serialize_events(events, buffers)
         )
 
-        try:
-            jsonized_event = json.dumps(event)
-        except TypeError:
-            return
-
-        message_id = -1
-        data = json.dumps([message_id, jsonized_event])
-        for socket in self._active_sockets:
-            if main_thread:
-                socket.write_message(data)
-            else:
-                IOLoop.instance().add_callback(socket.write_message, data)
-
         return
 
     #### 'WebBridge' protocol #################################################
@@ -116,6 +115,54 @@ class WebBridge(Bridge):
     #: All active client sockets.
     _active_sockets = List
 
+    def _call_later(self, delay, callable):
+        """ Call the callable after `delay` seconds in the event loop. """
+
+        # 'call_later' is not thread-safe but 'add_callback' is.
+        ioloop = IOLoop.instance()
+        ioloop.add_callback(ioloop.call_later, delay, callable)
+
+        return
+
+    def _send_event(self, event):
+        """ Send an event immediately. """
+
+        # The raw data of any NumPy arrays in the event is sent as binary
+        # messages just before the event itself.
+        buffers = []
+        try:
+            message = self._serialize_event(event, buffers)
+        except TypeError:
+            logger.warning('Dropping unserializable event: %r', event)
+            return
+
+        self._write_messages(buffers, message)
+
+        return
+
+    def _write_messages(self, buffers, data):
+        """ Write the binary buffers and the message data to all active
+        sockets. """
+
+        # Tornado does not support multiple threads calling send_message.
+        # Instead one should add a callback on the IOLoop instance as done
+        # below.  See:
+        # http://www.tornadoweb.org/en/stable/web.html?highlight=thread#thread-safety-notes
+
+        main_thread = isinstance(
+            threading.current_thread(), threading._MainThread
+        )
+
+        for socket in self._active_sockets:
+            if main_thread:
+                socket.write_messages(buffers, data)
+            else:
+                IOLoop.instance().add_callback(
+                    socket.write_messages, buffers, data
+                )
+
+        return
+
 
 class WebServer(Server):
     """ Web-based server implementation.
@@ -156,11 +203,70 @@ class WebServer(Server):
     #: The trait change dispatch mechanism to use when traits change.
     trait_change_dispatch = Str('same')
 
+    @gen.coroutine
+    def handle_message_async(self, message, buffers=None, serializer=None):
+        """ Handle a (decoded) request message from a client on the IOLoop.
+
+        This is the same as `handle_message` except that a coroutine method
+        (see `call_instance_method`) runs on the IOLoop and the response is
+        only sent when it finishes, so other requests are handled meanwhile.
+
+        Return a future for the serialized response message.
+
+        """
+
+        response = self._dispatch_message(message)
+
+        # The responses to the requests in a batch may also be futures.
+        request = message.get('payload') or {}
+        if request.get('kind') == 'batch' and response['exception'] is None:
+            responses = response['result']
+
+        else:
+            responses = [response]
+
+        for response_ in responses:
+            yield self._resolve_response(response_)
+
+        raise gen.Return(
+            self._serialize_response(message, response, buffers, serializer)
+        )
+
     #### Private protocol #####################################################
 
     _bridge = Instance(WebBridge)
     def __bridge_default(self):
-        return WebBridge()
+        return WebBridge(
+            event_batch_interval = self.event_batch_interval,
+            serializer           = self.serializer
+        )
+
+    @gen.coroutine
+    def _call_coroutine(self, method, args):
+        """ Call a coroutine method on the IOLoop.
+
+        Return a future for its marshalled result.
+
+        """
+
+        result = yield method(*args)
+
+        raise gen.Return(self._marshal(result))
+
+    @gen.coroutine
+    def _resolve_response(self, response):
+        """ Wait for the result of a response if it is a future. """
+
+        if is_future(response['result']):
+            try:
+                response['result'] = yield response['result']
+
+            except Exception:
+                response['exception'] = traceback.format_exc()
+                response['result']    = None
+                logger.error(response['exception'])
+
+        return
 
 
 class AsyncWebServer(WebServer):
@@ -172,6 +278,15 @@ class AsyncWebServer(WebServer):
 
     """
 
+    #### 'AsyncWebServer' protocol ############################################
+
+    #: Lists with more items than this are sent in pages of this many items
+    #: (the first page is sent with the list and the client fetches the others
+    #: when they are accessed). If zero, lists are always sent in full.
+    list_page_size = Int(1000)
+
+    #### Private protocol #####################################################
+
     def _get_attribute_values(self, obj, attribute_names):
         """ Get the values of all 'public' attributes on an object.
 
@@ -179,12 +294,15 @@ class AsyncWebServer(WebServer):
 
         """
 
-        return [self._marshal(self._get_attribute_default(obj, name))
+        # The values are sent in a 'new_type' event, so they aren't pinned.
+        return [self._marshal(self._get_attribute_default(obj, name), False)
                 for name in attribute_names]
 
     def _get_attribute_default(self, obj, name):
         value = getattr(obj, name, None)
-        if isinstance(value, list):
+        if numpy is not None and isinstance(value, numpy.ndarray):
+            value = value[:0]
+        elif isinstance(value, list):
             value = []
         elif isinstance(value, dict):
             value = {}
@@ -196,9 +314,11 @@ class AsyncWebServer(WebServer):
             value = type(value)()
         return value
 
-    def _get_dict_info(self, obj):
-        """ Get a description of a dict. """
-        values = self._get_list_info(list(obj.values()))
+    def _get_dict_info(self, obj, pin=True):
+        """ Get a description of a dict (see `_marshal` for `pin`). """
+        values = dict(
+            length=len(obj), data=self._marshal_all(obj.values(), pin)
+        )
         return dict(keys=list(obj.keys()), values=values)
 
     def _get_instance_info(self, obj):
@@ -219,9 +339,15 @@ class AsyncWebServer(WebServer):
 
         return info
 
-    def _get_list_info(self, obj):
-        """ Get a description of a list. """
-        data = self._marshal_all(obj)
+    def _get_list_info(self, obj, pin=True):
+        """ Get a description of a list (see `_marshal` for `pin`). """
+
+        page_size = self.list_page_size
+        if 0 < page_size < len(obj):
+            data = self._marshal_all(obj[:page_size], pin)
+            return dict(length=len(obj), data=data, page_size=page_size)
+
+        data = self._marshal_all(obj, pin)
         return dict(length=len(obj), data=data)
 
     def _send_object_changed_event(self, obj, trait_name, old, new):
@@ -230,10 +356,13 @@ class AsyncWebServer(WebServer):
         if trait_name.startswith('_'):
             return
 
+        # The event is sent to every client, so none of the objects in it are
+        # pinned (see `release_objects`).
+
         if isinstance(new, TraitListEvent):
             trait_name  = trait_name[:-len('_items')]
             trait = getattr(obj, trait_name)
-            value = id(trait)
+            value = self._registry.register(trait)
             if isinstance(new.index, slice):
                 # Handle an extended slice.  Note that one cannot increase the
                 # size of the list here.  So one is either deleting elements
@@ -250,27 +379,29 @@ class AsyncWebServer(WebServer):
                 info = dict(
                     start=s.start, stop=s.stop, step=s.step,
                     removed=len(removed),
-                    added=self._get_list_info(added)
+                    added=self._get_list_info(added, pin=False)
                 )
             else:
                 # This information can be used by the Array.splice method.
                 info = dict(
                     index=new.index, removed=len(new.removed),
-                    added=self._get_list_info(new.added)
+                    added=self._get_list_info(new.added, pin=False)
                 )
 
-            data = dict(type='list', value=value, info=info)
+            data = dict(type='list', value=value, info=info, pinned=False)
             items_event = True
 
         elif isinstance(new, TraitDictEvent):
             trait_name  = trait_name[:-len('_items')]
             trait = getattr(obj, trait_name)
-            value = id(trait)
+            value = self._registry.register(trait)
             added, removed = new.added, list(new.removed.keys())
             for key in new.changed:
                 added[key] = trait[key]
-            info = dict(removed=removed, added=self._get_dict_info(added))
-            data = dict(type='dict', value=value, info=info)
+            info = dict(
+                removed=removed, added=self._get_dict_info(added, pin=False)
+            )
+            data = dict(type='dict', value=value, info=info, pinned=False)
             items_event = True
 
         else:
@@ -278,11 +409,11 @@ class AsyncWebServer(WebServer):
             if hasattr(new, '__dict__') or isinstance(new, (dict, list)):
                 self._register_object(new)
 
-            data = self._marshal(new)
+            data = self._marshal(new, pin=False)
             items_event = False
 
         event = dict(
-            obj  = str(id(obj)),
+            obj  = self._registry.register(obj),
             name = trait_name,
             # fixme: This smells a bit, but marshalling the new value gives us
             # a type/value pair which we need on the client side to determine
@@ -315,19 +446,185 @@ class AsyncWebServer(WebServer):
 
 class MainHandler(RequestHandler):
 
+    #: The files served by all handlers (see `jigna.core.asset_cache`).
+    #:
+    #: Files that are too big to be cached are streamed from disk instead.
+    asset_cache = AssetCache()
+
+    #: The 'Cache-Control' header sent with each file. By default browsers
+    #: may keep the files but must check that they are current (which costs a
+    #: '304 Not Modified' response if they are).
+    cache_control = 'no-cache'
+
+    #: The size (in bytes) of the chunks that streamed files are sent in.
+    chunk_size = 64 * 1024
+
     def initialize(self, server):
         self.server = server
 
         return
 
+    @gen.coroutine
     def get(self):
         path = unquote(self.request.path[1:])
         if not len(path):
             self.write(self.server.html)
         else:
-            mime_type, _ = guess_type(path)
-            self.set_header('Content-Type', mime_type)
-            self.write(open(join(self.server.base_url, path), 'rb').read())
+            # Even a cache hit needs a 'stat', so the file is looked up in a
+            # thread rather than blocking the IOLoop.
+            path = join(self.server.base_url, path)
+            try:
+                stat, asset = yield IOLoop.current().run_in_executor(
+                    None, self._load_file, path
+                )
+
+            except (IOError, OSError):
+                raise HTTPError(404)
+
+            if asset is None:
+                yield self._stream_file(path, stat)
+
+            else:
+                self._write_asset(asset)
+
+        return
+
+    #### Private protocol #####################################################
+
+    def _get_range(self, size):
+        """ Get the (start, end) of the range of a file requested by the
+        client (if any).
+
+        If the client asked for a valid range then the status and headers of
+        a '206 Partial Content' response are set and the range is returned.
+        If the range can't be satisfied a '416' response is set and None is
+        returned. Without a (valid) 'Range' header the whole file is returned.
+
+        """
+
+        file_range = get_range(self.request.headers.get('Range'), size)
+        if file_range is None:
+            return 0, size
+
+        start, end = file_range
+        if start >= size:
+            self.set_status(416)
+            self.set_header('Content-Range', 'bytes */%d' % size)
+            return None
+
+        self.set_status(206)
+        self.set_header(
+            'Content-Range', 'bytes %d-%d/%d' % (start, end - 1, size)
+        )
+
+        return start, end
+
+    def _load_file(self, path):
+        """ Return the 'stat' of a file and its (cached) asset.
+
+        The asset is None if the file is too big to be cached (and so must be
+        streamed). Raise an `IOError` (or `OSError`) if the file can't be read.
+
+        """
+
+        stat = os.stat(path)
+        if stat.st_size > self.asset_cache.max_file_size:
+            return stat, None
+
+        return stat, self.asset_cache.get(path)
+
+    def _set_file_headers(self, mime_type, etag):
+        """ Set the headers common to all files.
+
+        Return True if the client already has the current version of the
+        file (in which case a '304 Not Modified' response has been set).
+
+        """
+
+        self.set_header('Content-Type', mime_type)
+        self.set_header('Cache-Control', self.cache_control)
+        self.set_header('Accept-Ranges', 'bytes')
+        self.set_header('Etag', etag)
+        if self.check_etag_header():
+            self.set_status(304)
+            return True
+
+        return False
+
+    @gen.coroutine
+    def _stream_file(self, path, stat):
+        """ Stream a (big) file in chunks.
+
+        The chunks are read in a thread so that other requests (and web socket
+        messages) are handled while the file is sent.
+
+        """
+
+        mime_type, _ = guess_type(path)
+        etag = '"%x-%x"' % (int(stat.st_mtime * 1e6), stat.st_size)
+        if self._set_file_headers(mime_type, etag):
+            return
+
+        file_range = self._get_range(stat.st_size)
+        if file_range is None:
+            return
+
+        start, end = file_range
+        self.set_header('Content-Length', end - start)
+
+        io_loop = IOLoop.current()
+        try:
+            f = yield io_loop.run_in_executor(None, open, path, 'rb')
+
+        except (IOError, OSError):
+            raise HTTPError(404)
+
+        try:
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = yield io_loop.run_in_executor(
+                    None, f.read, min(self.chunk_size, remaining)
+                )
+                if not chunk:
+                    break
+
+                remaining -= len(chunk)
+                self.write(chunk)
+                yield self.flush()
+
+        finally:
+            f.close()
+
+        return
+
+    def _write_asset(self, asset):
+        """ Write a (cached) asset. """
+
+        # The response depends on the 'Accept-Encoding' header whenever the
+        # asset may be gzipped, even if this one isn't (e.g. a range or a
+        # '304 Not Modified').
+        if asset.compressible:
+            self.set_header('Vary', 'Accept-Encoding')
+
+        if self._set_file_headers(asset.mime_type, asset.etag):
+            return
+
+        data = asset.data
+        if self.request.headers.get('Range'):
+            file_range = self._get_range(len(data))
+            if file_range is None:
+                return
+
+            start, end = file_range
+            data = data[start:end]
+
+        elif asset.compressible:
+            if 'gzip' in self.request.headers.get('Accept-Encoding', ''):
+                self.set_header('Content-Encoding', 'gzip')
+                data = asset.gzipped
+
+        self.write(data)
 
         return
 
@@ -341,10 +638,14 @@ class SyncGETHandler(RequestHandler):
         self.server = server
         return
 
+    @gen.coroutine
     def get(self):
         jsonized_request = self.get_argument("data")
 
-        jsonized_response = self.server.handle_request(jsonized_request)
+        serializer = self.server._text_serializer
+        jsonized_response = yield self.server.handle_message_async(
+            serializer.loads(jsonized_request), serializer=serializer
+        )
         self.write(jsonized_response)
         return
 
@@ -358,23 +659,70 @@ class AsyncWebSocketHandler(WebSocketHandler):
 
     def open(self):
         self.bridge.add_socket(self)
+
+        # Let the client know how to decode the messages that we send.
+        self.write_message(
+            serialize_message('serializer', self.bridge.serializer.format)
+        )
         return
 
     def on_message(self, message):
+        # Handle each message in its own coroutine so that a request for a
+        # coroutine method doesn't hold up the following ones.
+        IOLoop.current().spawn_callback(self._handle_message, message)
+        return
+
+    @gen.coroutine
+    def _handle_message(self, message):
+        request = {}
+        buffers = []
         try:
-            request_id, jsonized_request = json.loads(message)
-            jsonized_response = self.server.handle_request(jsonized_request)
-            self.write_message(json.dumps([request_id, jsonized_response]))
+            request = json.loads(message)
+            response = yield self.server.handle_message_async(
+                request, buffers
+            )
         except Exception:
             traceback.print_exc()
-            self.write_message(json.dumps([request_id, '{}']))
+            buffers = []
+            response = serialize_message(
+                'response', {}, request.get('id'),
+                serializer=self.bridge.serializer
+            )
+
+        try:
+            self.write_messages(buffers, response)
+
+        except WebSocketClosedError:
+            # The client went away while a coroutine method was running.
+            pass
+
         return
 
     def on_close(self):
         self.bridge.remove_socket(self)
+
+        # Nobody is left to release the objects sent to the clients.
+        if len(self.bridge._active_sockets) == 0:
+            self.server._registry.release_all()
+
         return
 
     def write_message(self, msg, binary=False):
         return super(AsyncWebSocketHandler, self).write_message(msg, binary)
 
+    def write_messages(self, buffers, msg):
+        """ Write the given binary buffers followed by the message.
+
+        The message is sent as a binary message if it is bytes (i.e. it was
+        created by a binary serializer).
+
+        """
+
+        for buffer in buffers:
+            self.write_message(buffer, binary=True)
+
+        self.write_message(msg, binary=isinstance(msg, bytes))
+
+        return
+
 #### EOF ######################################################################